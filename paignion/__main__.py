@@ -1,36 +1,41 @@
 #!/usr/bin/env python3
 
 import argparse
-import subprocess
+import contextlib
 import os
-import glob
-import json
-import http.server
-import socketserver
+import sys
+import time
 
 
 from paignion.definitions import (
-    FRONTEND_DIR,
+    BUDGETS,
     SIMPLE_ORIGIN_ROOM_TEMPLATE,
     SIMPLE_SECOND_ROOM_TEMPLATE,
-    INDEX_HTML_TEMPLATE,
+    GAME_DATA_FORMATS,
+    ENGINE_FEATURES,
+    EXPLORATION_STRATEGIES,
+    EXPLORER_MAX_STATES,
+    METRICS_REGRESSION_THRESHOLD,
+    PROGRESS_MODES,
+    ROOM_FILES_READ_AHEAD,
+    ROOM_INDEX_FILE,
+    ROOM_STATS_COLUMNS,
     __version__,
 )
-from paignion.parser import PaignionParser
-from paignion.tools import info
+from paignion.tools import info, color_message
 from paignion.exceptions import PaignionException
 
+# The modules needed by the subcommands are imported by the subcommands themselves, so
+# that every subcommand (and `--version`) only pays for the imports it needs
+
 
 def paignion_init(namespace):
     """Initialize a Paignion game project with the appropriate files & directories."""
     project_dir = namespace.project_dir
 
-    # Create the project directory if it does not exist
-    subprocess.run(["mkdir", "-p", project_dir], stdout=subprocess.PIPE)
-    # Create the rooms directory in the project dir, to contain the room files
-    subprocess.run(
-        ["mkdir", "-p", os.path.join(project_dir, "rooms")], stdout=subprocess.PIPE
-    )
+    # Create the project directory if it does not exist, along with the rooms
+    # directory in the project dir, to contain the room files
+    os.makedirs(os.path.join(project_dir, "rooms"), exist_ok=True)
 
     # Dump the origin room using the origin room template
     with open(os.path.join(project_dir, "rooms", "origin.md"), "w") as map_file:
@@ -43,78 +48,674 @@ def paignion_init(namespace):
     info(f"Initialized new Paignion game at `{project_dir}`")
 
 
-def paignion_build(namespace):
-    """Build a Paignion game project into a playable game."""
-    parser = PaignionParser()
+def collect_room_files(project_dir, use_index=False):
+    """Check the structure of a project directory and collect its room files.
+
+    The room files are collected recursively from the rooms directory.
+
+    :param project_dir: the directory containing the project files
+    :type project_dir: str
+    :param use_index: if True, the index of the rooms directory persisted in the
+        project dir is used to skip the directories that have not changed since the
+        last time, and is then updated
+    :type use_index: bool
+    :return: the sorted list of the paths to the room files
+    """
+    from paignion.parser import PaignionParser
+    from paignion.room_index import scan_rooms_dir, load_room_index, save_room_index
 
     # Check the structure of the project dir for errors
     try:
-        parser.verify_project_dir(namespace.project_dir)
+        PaignionParser().verify_project_dir(project_dir)
     except PaignionException:
-        raise PaignionException(f"Invalid project directory `{namespace.project_dir}`")
+        raise PaignionException(f"Invalid project directory `{project_dir}`")
 
     # Collect room files
-    room_files = sorted(
-        [f for f in glob.glob(os.path.join(namespace.project_dir, "rooms", "*.md"))]
+    rooms_dir = os.path.join(project_dir, "rooms")
+    if not use_index:
+        return scan_rooms_dir(rooms_dir)[0]
+
+    index_file = os.path.join(project_dir, ROOM_INDEX_FILE)
+    room_files, index = scan_rooms_dir(rooms_dir, load_room_index(index_file))
+    save_room_index(index_file, index)
+
+    return room_files
+
+
+def parse_project(project_dir, use_index=False, read_ahead=0, room_cache=None):
+    """Parse a Paignion game project into its GAME_DATA object.
+
+    :param project_dir: the directory containing the project files, or the path to a
+        packed project (see `paignion.packed`)
+    :type project_dir: str
+    :param use_index: if True, use the index of the rooms directory (see
+        `collect_room_files()`)
+    :type use_index: bool
+    :param read_ahead: the number of room files to read in advance (see
+        `PaignionParser.iter_room_files()`)
+    :type read_ahead: int
+    :param room_cache: a dict keeping the parsed rooms of the project between calls
+        (see `PaignionParser.iter_room_files()`); not used by packed projects
+    :type room_cache: dict
+    :return: the GAME_DATA object
+    """
+    from paignion import hooks
+    from paignion.parser import PaignionParser, sort_rooms
+    from paignion.packed import is_packed_project, read_packed_project
+
+    parser = PaignionParser()
+
+    if is_packed_project(project_dir):
+        game_data = sort_rooms(parser.iter_rooms(read_packed_project(project_dir)))
+        if "origin" not in game_data:
+            raise PaignionException(
+                f"Origin room not found in packed project `{project_dir}`"
+            )
+        return game_data
+
+    room_files = collect_room_files(project_dir, use_index=use_index)
+    hooks.emit("rooms_found", count=len(room_files))
+    return parser.parse_room_files(
+        room_files,
+        read_ahead=read_ahead,
+        rooms_dir=os.path.join(project_dir, "rooms"),
+        cache=room_cache,
     )
 
+
+def project_build_dir(project_dir):
+    """Get the directory into which a Paignion game project is built.
+
+    :param project_dir: the directory containing the project files, or the path to a
+        packed project
+    :type project_dir: str
+    :return: the build/ directory inside of the project dir, or the <name>-build/
+        directory next to the packed project (so that the packed projects stored in the
+        same directory do not overwrite each other's builds)
+    """
+    from paignion.packed import is_packed_project, packed_project_name
+
+    if is_packed_project(project_dir):
+        return os.path.join(
+            os.path.dirname(project_dir), f"{packed_project_name(project_dir)}-build"
+        )
+
+    return os.path.join(project_dir, "build")
+
+
+def report_map_problems(map_report):
+    """Print warnings about the problems found in the map of a game.
+
+    :param map_report: the analysis of the map (see `RoomGraph.analyze()`)
+    :type map_report: dict
+    """
+    for room_name, direction, exit in map_report["dangling_exits"]:
+        info(
+            f"Warning: room `{room_name}` leads to nonexistent room `{exit}` "
+            f"({direction})"
+        )
+    for trap in map_report["traps"]:
+        info(
+            "Warning: the player can never leave room(s) "
+            f"{', '.join(f'`{room_name}`' for room_name in trap)} once they enter them"
+        )
+
+
+def paignion_build(namespace):
+    """Build a Paignion game project into a playable game."""
+    from paignion import hooks
+    from paignion.daemon import default_socket_path, forward_build
+    from paignion.metrics import MemoryProfile
+    from paignion.progress import BuildProgress, PROGRESS_EVENTS
+
+    if getattr(namespace, "daemon", False):
+        socket_path = namespace.socket or default_socket_path()
+        if forward_build(socket_path, namespace):
+            return
+        info(f"No build daemon listening on `{socket_path}`, building in-process")
+
+    with contextlib.ExitStack() as stack:
+        # Memory allocations must not be traced anymore once the build is done, even
+        # if it failed (e.g. in a daemon, where they would slow the next builds down)
+        memory_profile = MemoryProfile(
+            enabled=getattr(namespace, "profile_memory", False)
+        )
+        stack.callback(memory_profile.stop)
+
+        progress_mode = getattr(namespace, "progress", PROGRESS_MODES[0])
+        if progress_mode == "always" or (
+            progress_mode == "auto" and sys.stdout.isatty()
+        ):
+            progress = BuildProgress()
+            stack.enter_context(hooks.listening(progress.listener, PROGRESS_EVENTS))
+            stack.callback(progress.close)
+
+        build_game(namespace, memory_profile)
+
+
+def build_game(namespace, memory_profile):
+    """Build a Paignion game project (see `paignion_build()`).
+
+    :param namespace: the arguments of the build command
+    :type namespace: Namespace
+    :param memory_profile: the memory profile of the build
+    :type memory_profile: MemoryProfile
+    """
+    import json
+    import shutil
+
+    from paignion.builder import (
+        render_build_files,
+        game_data_format_report,
+        detect_engine_features,
+        frontend_engine,
+        read_frontend_file,
+        dump_game_data,
+        encode_build_sections,
+        fill_build_templates,
+    )
+    from paignion import hooks
+    from paignion.budgets import load_project_budgets, enforce_budgets
+    from paignion.metrics import BuildMetrics
+    from paignion.room_graph import RoomGraph, tree_shake, compute_routes
+
+    data_format = getattr(namespace, "data_format", GAME_DATA_FORMATS[0])
+    split = getattr(namespace, "split", False)
+    # Split builds always write the game data to a separate JSON file
+    if split and data_format != GAME_DATA_FORMATS[0]:
+        raise PaignionException(
+            f"The `{data_format}` game data format can not be used in split builds"
+        )
+
+    info(f"Building game `{namespace.project_dir}`")
+    metrics = BuildMetrics()
+    hooks.emit("build_started", project=namespace.project_dir)
+
     # Generate final GAME_DATA object
-    GAME_DATA = parser.parse_room_files(room_files)
+    with metrics.phase("parse"), memory_profile.phase("parse"):
+        GAME_DATA = parse_project(
+            namespace.project_dir,
+            use_index=not getattr(namespace, "no_room_index", False),
+            read_ahead=ROOM_FILES_READ_AHEAD,
+            room_cache=getattr(namespace, "room_cache", None),
+        )
+
+    with metrics.phase("analyze"):
+        # Check the map of the game for problems
+        room_graph = RoomGraph(GAME_DATA)
+        report_map_problems(room_graph.analyze())
+
+        # Drop the rooms that can never be reached by the player
+        if not getattr(namespace, "keep_unreachable", False):
+            GAME_DATA, removed_rooms = tree_shake(GAME_DATA, room_graph=room_graph)
+            if removed_rooms:
+                info(
+                    f"Removed {len(removed_rooms)} unreachable room(s): "
+                    f"{', '.join(removed_rooms)}"
+                )
+
+    # Compute the routing table of the `go to <room>` command
+    if getattr(namespace, "fast_travel", False):
+        with metrics.phase("routes"):
+            start = time.perf_counter()
+            GAME_DATA, routing_kind, routing_size = compute_routes(GAME_DATA)
+            info(
+                f"Fast travel routing {routing_kind}: {routing_size} bytes, computed "
+                f"in {time.perf_counter() - start:.3f}s"
+            )
+
+    if getattr(namespace, "data_report", False):
+        for entry in game_data_format_report(GAME_DATA):
+            decode_time = (
+                f"{entry['decode_time']:.3f} ms"
+                if entry["decode_time"] is not None
+                else "n/a (parsed as JS)"
+            )
+            info(
+                f"Game data format `{entry['format']}`: {entry['size']} bytes, "
+                f"JSON decode time {decode_time}"
+            )
+
+    with metrics.phase("engine"):
+        # Leave the engine features that the game does not use out of the engine
+        if getattr(namespace, "full_engine", False):
+            engine_features = frozenset(ENGINE_FEATURES)
+        else:
+            engine_features = frozenset(detect_engine_features(GAME_DATA))
+        frontend_engine_data = frontend_engine(engine_features)
+
+        main_css_data = read_frontend_file("main.css")
+
+    # Collapse all frontend files & the game data into index.html (or into separate,
+    # content-hashed files for split builds)
+    minify = getattr(namespace, "minify", False)
+    with metrics.phase("render"):
+        with memory_profile.phase("dump"):
+            json_data = dump_game_data(GAME_DATA, minify)
+        with memory_profile.phase("encode"):
+            sections = encode_build_sections(
+                json_data,
+                main_css_data,
+                frontend_engine_data,
+                data_format,
+                minify,
+                split,
+            )
+        with memory_profile.phase("template"):
+            build_files = fill_build_templates(sections, minify, split)
+    memory_profile.stop()
+
+    # Build the game again from scratch, and check that it gives the same files
+    if getattr(namespace, "verify_reproducible", False):
+        from paignion.reproducible import rebuild_project, diff_build_files
+
+        with metrics.phase("verify"):
+            differences = diff_build_files(
+                build_files, rebuild_project(namespace.project_dir, vars(namespace))
+            )
+        if differences:
+            raise PaignionException(
+                "The build is not reproducible:\n" + "\n".join(differences)
+            )
+        info(f"Build verified as reproducible ({len(build_files)} identical file(s))")
+
+    # Check the size of the build before writing it (budgets given on the command line
+    # override the ones of the project configuration)
+    budgets = load_project_budgets(namespace.project_dir)
+    for budget in BUDGETS:
+        if getattr(namespace, f"budget_{budget}", None) is not None:
+            budgets[budget] = getattr(namespace, f"budget_{budget}")
+    if getattr(namespace, "budget_warn", False):
+        budgets["warn"] = True
+    if any(budgets.get(budget) is not None for budget in BUDGETS):
+        with metrics.phase("budgets"):
+            enforce_budgets(budgets, GAME_DATA, build_files, sections, minify=minify)
 
     # Final game will be dumped into the build/ directory (inside of the project dir)
-    build_dir = os.path.join(namespace.project_dir, "build")
-    info(f"Building game `{namespace.project_dir}`")
+    build_dir = project_build_dir(namespace.project_dir)
 
-    # Remove the build dir if it exists
-    subprocess.run(["rm", "-rf", build_dir], stdout=subprocess.PIPE)
-    # Make the build dir
-    subprocess.run(["mkdir", "-p", build_dir], stdout=subprocess.PIPE)
-    # Copy the frontend files over
-    subprocess.run(
-        [
-            "cp",
-            os.path.join(FRONTEND_DIR, "main.css"),
-            os.path.join(FRONTEND_DIR, "paignion.js"),
-            build_dir,
-        ],
-        stdout=subprocess.PIPE,
-    )
-
-    # Put game data into the generated paignion.js file
-    with open(os.path.join(build_dir, "paignion.js"), "r") as f:
-        frontend_engine_data = f.read()
-
-    # The game data object needs to be written on the top of the file, because
-    # its declaration must come before any references to it
-    paignion_js_data = (
-        f"// Automatically generated game data object\n"
-        f"let GAME_DATA = {json.dumps(GAME_DATA)};\n\n\n"
-        f"{frontend_engine_data}"
-    )
-
-    # Read main.css
-    with open(os.path.join(build_dir, "main.css"), "r") as f:
-        main_css_data = f.read()
-
-    # Collapse all frontend files into index.html
-    with open(os.path.join(build_dir, "index.html"), "w") as f:
-        f.write(INDEX_HTML_TEMPLATE.format(main_css_data, paignion_js_data))
-
-    # Remove main.css and paignion.js
-    subprocess.run(
-        [
-            "rm",
-            os.path.join(build_dir, "main.css"),
-            os.path.join(build_dir, "paignion.js"),
-        ]
-    )
+    with metrics.phase("write"):
+        # Remove the build dir if it exists, and make it again
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+
+        for file_name, file_data in build_files.items():
+            start = time.perf_counter()
+            with open(os.path.join(build_dir, file_name), "w") as f:
+                f.write(file_data)
+            if hooks.listeners["file_written"]:
+                hooks.emit(
+                    "file_written",
+                    file=file_name,
+                    size=os.path.getsize(os.path.join(build_dir, file_name)),
+                    duration=time.perf_counter() - start,
+                )
+
+    # Measuring the savings of the minification means rendering the whole build again,
+    # so it is only done on request
+    if minify and getattr(namespace, "data_report", False):
+        original_size = sum(
+            len(file_data.encode("utf-8"))
+            for file_data in render_build_files(
+                game_data=GAME_DATA,
+                main_css=main_css_data,
+                paignion_js=frontend_engine_data,
+                data_format=data_format,
+                split=split,
+            ).values()
+        )
+        minified_size = sum(
+            len(file_data.encode("utf-8")) for file_data in build_files.values()
+        )
+        info(
+            f"Minified build: {original_size} -> {minified_size} bytes "
+            f"({original_size - minified_size} bytes saved)"
+        )
+
+    for phase_name, phase in memory_profile.phases.items():
+        info(
+            f"Memory of phase `{phase_name}`: peak "
+            f"{'n/a' if phase['peak'] is None else phase['peak']} bytes, retained "
+            f"{phase['retained']} bytes"
+        )
+        for site, size, count in phase["top_sites"]:
+            print(f"    {site}: {size} bytes in {count} block(s)")
+
+    metrics_file = getattr(namespace, "metrics_json", None)
+    if metrics_file:
+        metrics_file = metrics_file.replace(
+            "{project}", os.path.basename(os.path.normpath(namespace.project_dir))
+        )
+        with open(metrics_file, "w") as f:
+            json.dump(
+                metrics.report(
+                    namespace.project_dir,
+                    GAME_DATA,
+                    build_files,
+                    None if split else sections,
+                ),
+                f,
+                indent=4,
+            )
+        info(f"Build metrics written to `{metrics_file}`")
+
+    if hooks.listeners["build_finished"]:
+        hooks.emit(
+            "build_finished",
+            project=namespace.project_dir,
+            size=sum(
+                len(file_data.encode("utf-8")) for file_data in build_files.values()
+            ),
+            duration=time.perf_counter() - metrics.start,
+        )
 
     info(f"Done! Your game can be found at `{build_dir}/index.html`")
 
 
+def paignion_build_projects(namespace):
+    """Build one or several Paignion game projects into playable games."""
+    import textwrap
+    from argparse import Namespace
+
+    from paignion.batch import expand_project_dirs, build_projects
+
+    project_dirs, unmatched_patterns = expand_project_dirs(namespace.project_dirs)
+    options = {
+        option: value
+        for option, value in vars(namespace).items()
+        if option not in ["func", "project_dirs", "jobs"]
+    }
+
+    # A single project is built as usual
+    if len(project_dirs) == 1 and not unmatched_patterns:
+        paignion_build(Namespace(project_dir=project_dirs[0], **options))
+        return
+
+    metrics_file = getattr(namespace, "metrics_json", None)
+    if metrics_file and "{project}" not in metrics_file:
+        raise PaignionException(
+            "The metrics file of several projects must contain `{project}` (replaced "
+            "by the name of each project)"
+        )
+
+    jobs = namespace.jobs or os.cpu_count()
+    info(f"Building {len(project_dirs)} game(s) with {jobs} process(es)")
+
+    start = time.perf_counter()
+    results = {}
+    for result in build_projects(project_dirs, options, jobs=jobs):
+        print(result["output"], end="")
+        if result["error"] is not None:
+            print(color_message(f"{result['project_dir']}:", "red"))
+            print(textwrap.indent(result["error"], "    "))
+        results[result["project_dir"]] = result
+    elapsed = time.perf_counter() - start
+
+    for pattern in unmatched_patterns:
+        print(color_message(f"{pattern}: no project matches this pattern", "red"))
+    for project_dir in project_dirs:
+        result = results[project_dir]
+        status = "failed" if result["error"] is not None else "built"
+        info(f"{project_dir}: {status} in {result['time']:.3f}s")
+
+    built = sum(result["error"] is None for result in results.values())
+    failures = len(project_dirs) - built + len(unmatched_patterns)
+    info(f"Built {built} game(s) in {elapsed:.3f}s, {failures} failure(s)")
+    if failures:
+        exit(1)
+
+
+def paignion_metrics_compare(namespace):
+    """Compare the metrics of two builds and report the regressions."""
+    from paignion.metrics import load_metrics, compare_metrics
+
+    comparison = compare_metrics(
+        load_metrics(namespace.old_metrics),
+        load_metrics(namespace.new_metrics),
+        threshold=namespace.threshold,
+    )
+
+    for metric, old_value, new_value, change, regression in comparison:
+        change = f"{change:+.1%}" if change is not None else "n/a"
+        line = f"{metric}: {old_value:.6g} -> {new_value:.6g} ({change})"
+        print(color_message(f"{line} REGRESSION", "red") if regression else line)
+
+    regressions = sum(regression for *_, regression in comparison)
+    info(
+        f"Compared {len(comparison)} metric(s), {regressions} regression(s) above "
+        f"{namespace.threshold:.0%}"
+    )
+    if regressions:
+        exit(1)
+
+
+def paignion_check(namespace):
+    """Check Paignion game projects or room files for errors, without building them."""
+    import textwrap
+
+    from paignion.checker import check_room_files
+
+    room_files = []
+    # The rooms of a project directory are named after their path in its rooms directory
+    rooms_dirs = {}
+    for path in namespace.paths:
+        if os.path.isdir(path):
+            project_room_files = collect_room_files(path)
+            room_files += project_room_files
+            rooms_dirs.update(
+                dict.fromkeys(project_room_files, os.path.join(path, "rooms"))
+            )
+        else:
+            room_files.append(path)
+    # The same file may be given more than once
+    room_files = list(dict.fromkeys(room_files))
+
+    start = time.perf_counter()
+    errors = check_room_files(room_files, jobs=namespace.jobs, rooms_dirs=rooms_dirs)
+    elapsed = time.perf_counter() - start
+
+    for room_file, messages in errors.items():
+        print(color_message(f"{room_file}:", "red"))
+        for message in messages:
+            print(textwrap.indent(message, "    "))
+
+    info(
+        f"Checked {len(room_files)} room file(s) in {elapsed:.3f}s, "
+        f"{len(errors)} file(s) with errors"
+    )
+    if errors:
+        exit(1)
+
+
+def paignion_play(namespace):
+    """Play a Paignion game project in the terminal, or run a walkthrough script."""
+    from paignion.engine import PaignionEngine, html_to_text
+
+    engine = PaignionEngine(parse_project(namespace.project_dir))
+
+    if namespace.script:
+        with open(namespace.script, "r") as f:
+            lines = f.read().splitlines()
+
+        start = time.perf_counter()
+        command_count, failures = engine.run_walkthrough(lines)
+        elapsed = time.perf_counter() - start
+
+        for line_number, message in failures:
+            print(color_message(f"{namespace.script}:{line_number}: {message}", "red"))
+
+        info(
+            f"Ran {command_count} commands in {elapsed:.3f}s "
+            f"({command_count / max(elapsed, 1e-9):.0f} commands/s), "
+            f"{len(failures)} failure(s)"
+        )
+        if failures:
+            exit(1)
+        return
+
+    # Interactive mode, until EOF (Ctrl+D)
+    print(html_to_text(engine.description))
+    while True:
+        try:
+            command = input("> ")
+        except EOFError:
+            print()
+            break
+
+        description = engine.description
+        feedback = html_to_text(engine.run(command))
+        if engine.description != description:
+            print(html_to_text(engine.description))
+        if feedback:
+            print(feedback)
+
+
+def paignion_explore(namespace):
+    """Explore all the states of a Paignion game project to find problems in it."""
+    from paignion.explorer import PaignionExplorer
+
+    explorer = PaignionExplorer(
+        parse_project(namespace.project_dir),
+        strategy=namespace.strategy,
+        max_states=namespace.max_states,
+        jobs=namespace.jobs,
+    )
+
+    info(f"Exploring game `{namespace.project_dir}`")
+    start = time.perf_counter()
+    report = explorer.explore(goal=namespace.goal)
+    elapsed = time.perf_counter() - start
+
+    info(
+        f"Explored {report['states']} game state(s) and {report['transitions']} "
+        f"transition(s) in {elapsed:.3f}s"
+    )
+    if report["truncated"]:
+        info(
+            f"Warning: the exploration stopped after {namespace.max_states} states, "
+            "the results below are incomplete (see --max-states)"
+        )
+
+    if report["unreachable_rooms"]:
+        info(f"Unreachable room(s): {', '.join(report['unreachable_rooms'])}")
+    if report["unreachable_items"]:
+        info(
+            "Unreachable item(s): "
+            + ", ".join(
+                f"{item_name} ({room_name})"
+                for room_name, item_name in report["unreachable_items"]
+            )
+        )
+    if report["unused_interactions"]:
+        info(
+            "Interaction(s) that never happen: "
+            + ", ".join(
+                f"{used_with_name} with {item_name}"
+                for item_name, used_with_name in report["unused_interactions"]
+            )
+        )
+    if report["dead_ends"]:
+        info(
+            f"{len(report['dead_ends'])} dead end(s) found, for example after: "
+            + "; ".join(
+                ", ".join(path) or "(start of the game)"
+                for path in report["dead_ends"][:3]
+            )
+        )
+    for error in report["errors"]:
+        print(color_message(error, "red"))
+
+    failed = bool(report["errors"])
+    if namespace.goal:
+        if report["goal_path"] is None:
+            print(
+                color_message(
+                    f"The goal room `{namespace.goal}` is never reached", "red"
+                )
+            )
+            failed = True
+        else:
+            info(
+                f"The goal room `{namespace.goal}` can be reached in "
+                f"{len(report['goal_path'])} command(s): "
+                f"{', '.join(report['goal_path'])}"
+            )
+
+    if failed:
+        exit(1)
+
+
+def paignion_graph(namespace):
+    """Analyze the map of a Paignion game project."""
+    from paignion.room_graph import RoomGraph
+
+    game_data = parse_project(namespace.project_dir)
+
+    start = time.perf_counter()
+    map_report = RoomGraph(game_data).analyze()
+    elapsed = time.perf_counter() - start
+
+    info(
+        f"{map_report['rooms']} room(s), {map_report['exits']} exit(s), "
+        f"{map_report['reachable']} room(s) reachable from the origin room, "
+        f"{map_report['components']} strongly connected component(s) "
+        f"(analyzed in {elapsed:.3f}s)"
+    )
+    if map_report["unreachable_rooms"]:
+        info(f"Unreachable room(s): {', '.join(map_report['unreachable_rooms'])}")
+    report_map_problems(map_report)
+
+
+def paignion_stats(namespace):
+    """Report the costs (parse time, size...) of every room of a Paignion project."""
+    from paignion import hooks
+    from paignion.stats import (
+        RoomStats,
+        ROOM_STATS_EVENTS,
+        format_stats_table,
+        warm_up_parser,
+    )
+
+    warm_up_parser()
+    room_stats = RoomStats()
+    with hooks.listening(room_stats.listener, ROOM_STATS_EVENTS):
+        game_data = parse_project(namespace.project_dir)
+
+    rooms, totals = room_stats.report(
+        game_data, sort_by=namespace.sort, top=namespace.top
+    )
+    for line in format_stats_table(rooms, totals):
+        print(line)
+    info(f"{len(game_data)} room(s), {len(rooms)} shown (sorted by {namespace.sort})")
+
+
+def paignion_daemon(namespace):
+    """Run a build daemon, keeping the projects it builds in memory between builds."""
+    import signal
+
+    from paignion.daemon import PaignionDaemon, default_socket_path
+
+    socket_path = namespace.socket or default_socket_path()
+    info(f"Starting build daemon on `{socket_path}`")
+
+    def stop(signal_number, frame):
+        raise KeyboardInterrupt
+
+    # Stop cleanly when terminated too (e.g. at the end of a CI job)
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        PaignionDaemon(socket_path).serve_forever()
+    except KeyboardInterrupt:
+        info("Build daemon stopped")
+
+
 def paignion_serve(namespace):
     """Serve the game on an HTTP server."""
-    serve_dir = os.path.join(namespace.project_dir, "build")
+    import http.server
+    import socketserver
+
+    serve_dir = project_build_dir(namespace.project_dir)
     if not os.path.isdir(serve_dir):
         raise PaignionException(
             f"{serve_dir} does not exist, have you built your game?"
@@ -154,9 +755,275 @@ def paignion_main_function():
     parser_build = subparsers.add_parser(
         "build", help="Build an existing game project into a playable game"
     )
-    parser_build.set_defaults(func=paignion_build)
+    parser_build.set_defaults(func=paignion_build_projects)
+    parser_build.add_argument(
+        "project_dirs",
+        metavar="project_dir",
+        help="The directory containing the project files, or a packed project (a "
+        "single document with all of the rooms, or a .zip or .tar archive of the "
+        "rooms directory); several projects (or glob patterns matching them) can be "
+        "built at once",
+        nargs="+",
+    )
+    parser_build.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of processes building several projects in parallel (the "
+        "number of CPUs by default)",
+        type=int,
+    )
+    parser_build.add_argument(
+        "--data-format",
+        help="How to embed the game data in index.html: in a JSON <script> element "
+        "(default), in a JSON.parse() string literal or as a JavaScript object literal "
+        "(not available with --split, where the game data is a separate JSON file)",
+        choices=GAME_DATA_FORMATS,
+        default=GAME_DATA_FORMATS[0],
+    )
+    parser_build.add_argument(
+        "--minify",
+        help="Strip comments & whitespace from the engine, the CSS and the game data",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--split",
+        help="Write the engine, the CSS and the game data to separate content-hashed "
+        "files (which can be cached forever) instead of a single index.html",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--keep-unreachable",
+        help="Keep the rooms that can not be reached from the origin room in the game",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--fast-travel",
+        help="Let the player go back to the rooms they have been to with `go to "
+        "<room>`, using a routing table computed when building the game",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--full-engine",
+        help="Keep the code of all the engine features, even those the game does not "
+        "use",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--no-room-index",
+        help="Do not use (nor write) the index of the rooms directory kept in "
+        "`.paignion/room_index.json`, and list the whole rooms directory instead",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--data-report",
+        help="Report the size & decoding time of the game data in every format (and "
+        "the number of bytes saved by --minify)",
+        action="store_true",
+    )
+
+    parser_build.add_argument(
+        "--daemon",
+        help="Forward the build to a running build daemon (see `paignion daemon`), or "
+        "build in-process if there is none",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--socket",
+        help="The Unix socket of the build daemon (in $XDG_RUNTIME_DIR, or in a "
+        "private directory of the temporary directory, by default)",
+    )
+
+    for budget, description in BUDGETS.items():
+        parser_build.add_argument(
+            f"--budget-{budget.replace('_', '-')}",
+            help=f"Fail the build if {description} exceeds BYTES bytes",
+            type=int,
+            metavar="BYTES",
+        )
+    parser_build.add_argument(
+        "--budget-warn",
+        help="Only warn when the build exceeds a budget, instead of failing it",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--verify-reproducible",
+        help="Build the game a second time from scratch (with empty caches, reading "
+        "the rooms in reverse order) and fail if the two builds differ",
+        action="store_true",
+    )
+    parser_build.add_argument(
+        "--progress",
+        help="When to report the progress of the build, with the number of rooms "
+        "parsed per second & the estimated time left (by default, only when the "
+        "output is a terminal; outside of a terminal, progress is logged every few "
+        "seconds)",
+        choices=PROGRESS_MODES,
+        default=PROGRESS_MODES[0],
+    )
+    parser_build.add_argument(
+        "--profile-memory",
+        help="Trace the memory allocated by the build, and report the peak & retained "
+        "memory of the parse, dump, encode & template phases along with their top "
+        "allocation sites (slows the build down)",
+        action="store_true",
+    )
     parser_build.add_argument(
-        "project_dir", help="The directory containing the project files"
+        "--metrics-json",
+        help="Write the metrics of the build (counts, time per phase, output sizes, "
+        "cache hit rates & peak memory) to a JSON file; with several projects, "
+        "`{project}` is replaced by the name of each project",
+    )
+
+    parser_metrics = subparsers.add_parser(
+        "metrics", help="Work with the metrics written by `build --metrics-json`"
+    )
+    metrics_subparsers = parser_metrics.add_subparsers()
+    parser_metrics_compare = metrics_subparsers.add_parser(
+        "compare",
+        help="Compare the metrics of two builds, and exit with an error if the cost "
+        "of the new build regressed",
+    )
+    parser_metrics_compare.set_defaults(func=paignion_metrics_compare)
+    parser_metrics_compare.add_argument(
+        "old_metrics", help="The metrics file of the reference build"
+    )
+    parser_metrics_compare.add_argument(
+        "new_metrics", help="The metrics file of the new build"
+    )
+    parser_metrics_compare.add_argument(
+        "-t",
+        "--threshold",
+        help="The relative increase of a metric considered a regression (0.1 by "
+        "default, for 10%%)",
+        type=float,
+        default=METRICS_REGRESSION_THRESHOLD,
+    )
+
+    parser_check = subparsers.add_parser(
+        "check",
+        help="Check the room files of the game for errors, without building it",
+    )
+    parser_check.set_defaults(func=paignion_check)
+    parser_check.add_argument(
+        "paths",
+        help="Project directories (to check all of their room files) or room files",
+        nargs="+",
+    )
+    parser_check.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of processes checking the files in parallel",
+        type=int,
+        default=1,
+    )
+
+    parser_play = subparsers.add_parser(
+        "play", help="Play the game in the terminal, or run a walkthrough script"
+    )
+    parser_play.set_defaults(func=paignion_play)
+    parser_play.add_argument(
+        "project_dir",
+        help="The directory containing the project files, or a packed project (a "
+        "single document with all of the rooms, or a .zip or .tar archive of the "
+        "rooms directory)",
+    )
+    parser_play.add_argument(
+        "-s",
+        "--script",
+        help="A walkthrough script: one command per line, `? <text>` lines to check "
+        "the feedback of the last command and `@ <room>` lines to check the current "
+        "room",
+    )
+
+    parser_explore = subparsers.add_parser(
+        "explore",
+        help="Explore all the states of the game to find unreachable rooms & items, "
+        "interactions that never happen and dead ends",
+    )
+    parser_explore.set_defaults(func=paignion_explore)
+    parser_explore.add_argument(
+        "project_dir",
+        help="The directory containing the project files, or a packed project (a "
+        "single document with all of the rooms, or a .zip or .tar archive of the "
+        "rooms directory)",
+    )
+    parser_explore.add_argument(
+        "-g",
+        "--goal",
+        help="The room the player must be able to reach to complete the game; dead "
+        "ends are then the states from which it can not be reached anymore",
+    )
+    parser_explore.add_argument(
+        "--strategy",
+        help="Explore the game states breadth-first (default) or depth-first",
+        choices=EXPLORATION_STRATEGIES,
+        default=EXPLORATION_STRATEGIES[0],
+    )
+    parser_explore.add_argument(
+        "--max-states",
+        help=f"The maximum number of game states to visit (default: "
+        f"{EXPLORER_MAX_STATES})",
+        type=int,
+        default=EXPLORER_MAX_STATES,
+    )
+    parser_explore.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of processes exploring the game in parallel (breadth-first "
+        "only)",
+        type=int,
+        default=1,
+    )
+
+    parser_graph = subparsers.add_parser(
+        "graph",
+        help="Analyze the map of the game to find unreachable rooms, rooms that can "
+        "not be left and exits to nonexistent rooms",
+    )
+    parser_graph.set_defaults(func=paignion_graph)
+    parser_graph.add_argument(
+        "project_dir",
+        help="The directory containing the project files, or a packed project (a "
+        "single document with all of the rooms, or a .zip or .tar archive of the "
+        "rooms directory)",
+    )
+
+    parser_stats = subparsers.add_parser(
+        "stats",
+        help="Report the parse & Markdown rendering time, the actions, the `used_with` "
+        "items and the size (raw & gzip-compressed) of every room of the game",
+    )
+    parser_stats.set_defaults(func=paignion_stats)
+    parser_stats.add_argument(
+        "project_dir",
+        help="The directory containing the project files, or a packed project (a "
+        "single document with all of the rooms, or a .zip or .tar archive of the "
+        "rooms directory)",
+    )
+    parser_stats.add_argument(
+        "-s",
+        "--sort",
+        help="The cost to sort the rooms by, from the highest to the lowest",
+        choices=list(ROOM_STATS_COLUMNS),
+        default=list(ROOM_STATS_COLUMNS)[0],
+    )
+    parser_stats.add_argument(
+        "-n",
+        "--top",
+        help="Only show the N costliest rooms",
+        type=int,
+        metavar="N",
+    )
+
+    parser_daemon = subparsers.add_parser(
+        "daemon",
+        help="Run a build daemon, to which `paignion build --daemon` forwards builds",
+    )
+    parser_daemon.set_defaults(func=paignion_daemon)
+    parser_daemon.add_argument(
+        "--socket",
+        help="The Unix socket to listen on (in $XDG_RUNTIME_DIR, or in a private "
+        "directory of the temporary directory, by default)",
     )
 
     parser_serve = subparsers.add_parser(
@@ -164,7 +1031,10 @@ def paignion_main_function():
     )
     parser_serve.set_defaults(func=paignion_serve)
     parser_serve.add_argument(
-        "project_dir", help="The directory containing the project files"
+        "project_dir",
+        help="The directory containing the project files, or a packed project (a "
+        "single document with all of the rooms, or a .zip or .tar archive of the "
+        "rooms directory)",
     )
     parser_serve.add_argument(
         "-a", "--address", help="The address to serve the game on", default="localhost"
@@ -1,5 +1,10 @@
 import re
+import json
+import functools
+import time
 
+from paignion import hooks
+from paignion.definitions import COMPILED_ACTIONS_CACHE_SIZE
 from paignion.exceptions import PaignionActionCompilerException
 from paignion.tools import markdownify
 
@@ -10,6 +15,8 @@ class ActionToken(object):
     This class is used to represent tokens as they are parsed from Paignion Actions.
     """
 
+    __slots__ = ("type", "value")
+
     def __init__(self, type, value):
         """Constructs a new instance of ActionToken.
 
@@ -32,6 +39,8 @@ class ActionToken(object):
 class ActionNode(object):
     """Describe a generic ActionNode."""
 
+    __slots__ = ("key", "value", "element")
+
     def __init__(self, key, value, element):
         """Construct a new instance of ActionNode."""
         self.key = key
@@ -48,6 +57,8 @@ class ActionNode(object):
 class ActionSetNode(ActionNode):
     """Describe an ActionNode for the Set action."""
 
+    __slots__ = ()
+
     def action(self):
         """Return the action performed by the node.
 
@@ -59,6 +70,8 @@ class ActionSetNode(ActionNode):
 class ActionAddNode(ActionNode):
     """Describe an ActionNode for the Add (or append) action."""
 
+    __slots__ = ()
+
     def action(self):
         """Return the action performed by the node.
 
@@ -70,6 +83,8 @@ class ActionAddNode(ActionNode):
 class ActionSubNode(ActionNode):
     """Describe an ActionNode for the Sub (subtraction) action."""
 
+    __slots__ = ()
+
     def action(self):
         """Return the action performed by the node.
 
@@ -81,6 +96,8 @@ class ActionSubNode(ActionNode):
 class ActionMulNode(ActionNode):
     """Describe an ActionNode for the Mul (multiplication) action."""
 
+    __slots__ = ()
+
     def action(self):
         """Return the action performed by the node.
 
@@ -92,6 +109,8 @@ class ActionMulNode(ActionNode):
 class ActionDivNode(ActionNode):
     """Describe an ActionNode for the Div (division) action."""
 
+    __slots__ = ()
+
     def action(self):
         """Return the action performed by the node.
 
@@ -100,6 +119,25 @@ class ActionDivNode(ActionNode):
         return "div"
 
 
+# The shape of a compiled action: `getRoomOrItem("<element>")["<key>"] <op>= <value>;`.
+# Markdown strings are not escaped by the compiler, so the value can only be delimited
+# by the start of the next action (or the end of the string).
+COMPILED_ACTION_REGEX = re.compile(
+    r'getRoomOrItem\("(?P<element>[^"]*)"\)\["(?P<key>[^"]*)"\] '
+    r"(?P<operator>[-+*/]?=) (?P<value>.*?);(?=getRoomOrItem\(|$)",
+    flags=re.DOTALL,
+)
+
+# A mapping of compiled action operators to action names
+COMPILED_ACTION_OPERATORS = {
+    "=": "set",
+    "+=": "add",
+    "-=": "sub",
+    "*=": "mul",
+    "/=": "div",
+}
+
+
 class ActionCompiler(object):
     """Describe a Paignion action compiler.
 
@@ -107,23 +145,34 @@ class ActionCompiler(object):
     when it comes across invalid actions.
     """
 
-    # A list of all the tokens recognized by the compiler
+    # A list of all the tokens recognized by the compiler (compiled once, as they are
+    # matched against every action)
     TOKEN_TYPES = [
-        ("set_func", r"set"),
-        ("add_func", r"add"),
-        ("sub_func", r"sub"),
-        ("mul_func", r"mul"),
-        ("div_func", r"div"),
-        ("md_string", r'm"(([^"\\])|(\\"))*"'),
-        ("string", r'"(([^"\\])|(\\"))*"'),
-        ("integer", r"([+-]|\b)[0-9]+\b"),
-        ("identifier", r"\b[a-zA-Z][a-zA-Z0-9_]*\b"),
-        ("oparen", r"\("),
-        ("cparen", r"\)"),
-        ("comma", r","),
-        ("whitespace", r"[ \t\r]"),
+        ("set_func", re.compile(r"set")),
+        ("add_func", re.compile(r"add")),
+        ("sub_func", re.compile(r"sub")),
+        ("mul_func", re.compile(r"mul")),
+        ("div_func", re.compile(r"div")),
+        ("md_string", re.compile(r'm"(([^"\\])|(\\"))*"')),
+        ("string", re.compile(r'"(([^"\\])|(\\"))*"')),
+        ("integer", re.compile(r"([+-]|\b)[0-9]+\b")),
+        ("identifier", re.compile(r"\b[a-zA-Z][a-zA-Z0-9_]*\b")),
+        ("oparen", re.compile(r"\(")),
+        ("cparen", re.compile(r"\)")),
+        ("comma", re.compile(r",")),
+        ("whitespace", re.compile(r"[ \t\r]")),
     ]
 
+    def __init__(self, render_markdown=True):
+        """Construct a new instance of ActionCompiler.
+
+        :param render_markdown: True if Markdown strings should be rendered to HTML,
+            False otherwise (in which case they are left as they are)
+        :type render_markdown: bool
+        :return: an instance of ActionCompiler
+        """
+        self.render_markdown = render_markdown
+
     def consume_token(self, action):
         """Consume a token given an action string.
 
@@ -138,7 +187,7 @@ class ActionCompiler(object):
         """
         for token in self.TOKEN_TYPES:
             # Attempt to match token with action
-            match = re.match(token[1], action)
+            match = token[1].match(action)
             if match:
                 # Consume token
                 action = action[match.end(0) :]
@@ -221,10 +270,20 @@ class ActionCompiler(object):
         Paignion engine. The element the function will run upon will be determined by
         the function `getRoomOrItem()` implemented in the frontend engine.
 
+        The compiled actions are cached (see `compile_cached_action()`), as the same
+        actions often appear in many rooms and games.
+
         :param action: an action string
         :type action: str
         :return: JavaScript code (in the form of a string)
         """
+        return compile_cached_action(action, self.render_markdown)
+
+    def compile_uncached_action(self, action):
+        """Compile an action string, without looking it up in the cache.
+
+        See `compile_action()` for the parameters.
+        """
         action_node = self.parse_action(action)
 
         if action_node == None:
@@ -264,6 +323,41 @@ class ActionCompiler(object):
         # If we reach this line, we have come across an unrecognized ActionNode
         raise PaignionActionCompilerException(f"Undefined node: `{action_node}`")
 
+    def decompile_actions(self, compiled_actions):
+        """Split a string of compiled actions back into its individual actions.
+
+        This is used by build passes that need to know what the actions of a game do
+        (for example, which room exits they open) without running them.
+
+        :param compiled_actions: JavaScript code produced by `compile_action()`
+        :type compiled_actions: str
+        :return: a list of (action, element, key, value) tuples, where action is the
+            name of the action (`set`, `add` etc) and value is either an int or a str
+        """
+        actions = []
+
+        for match in COMPILED_ACTION_REGEX.finditer(compiled_actions):
+            value = match.group("value")
+            if value.startswith('"'):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    # Not a valid JSON string (e.g. unescaped quotes in Markdown)
+                    value = value[1:-1]
+            else:
+                value = int(value)
+
+            actions.append(
+                (
+                    COMPILED_ACTION_OPERATORS[match.group("operator")],
+                    match.group("element"),
+                    match.group("key"),
+                    value,
+                )
+            )
+
+        return actions
+
     def parse_set_func(self, token_list):
         """Parse a call to the Paignion set() function from a list of tokens.
 
@@ -508,8 +602,12 @@ class ActionCompiler(object):
         :type token_list: list
         :return: a markdownified (HTML) string with quotes around it
         """
+        md_string = self.consume("md_string", token_list).value[2:-1]
+        if self.render_markdown:
+            md_string = markdownify(md_string)
+
         # Keep the quotes!
-        return f'"{markdownify(self.consume("md_string", token_list).value[2:-1])}"'
+        return f'"{md_string}"'
 
     def parse_string(self, token_list):
         """Parse a (normal) string.
@@ -600,3 +698,32 @@ class ActionCompiler(object):
             return string[1:-1]
 
         return string
+
+
+@functools.lru_cache(maxsize=COMPILED_ACTIONS_CACHE_SIZE)
+def compile_cached_action(action, render_markdown):
+    """Compile an action string, reusing the result if it was already compiled.
+
+    The cache is shared by all the action compilers of the process (the compiled actions
+    only depend on the action strings and on whether Markdown is rendered).
+
+    :param action: an action string
+    :type action: str
+    :param render_markdown: True if Markdown strings should be rendered to HTML
+    :type render_markdown: bool
+    :return: JavaScript code (in the form of a string)
+    """
+    start = time.perf_counter()
+    compiled_action = ActionCompiler(
+        render_markdown=render_markdown
+    ).compile_uncached_action(action)
+
+    if hooks.listeners["action_compiled"]:
+        hooks.emit(
+            "action_compiled",
+            action=action,
+            size=len(compiled_action),
+            duration=time.perf_counter() - start,
+        )
+
+    return compiled_action
@@ -0,0 +1,104 @@
+from paignion.definitions import ENGINE_FEATURES, GAME_DATA_FORMATS
+from paignion.builder import (
+    detect_engine_features,
+    frontend_engine,
+    read_frontend_file,
+    render_index_html,
+)
+from paignion.exceptions import PaignionException
+from paignion.parser import PaignionParser, sort_rooms
+from paignion.room_graph import tree_shake, compute_routes
+
+# The parser shared by all the builds (it holds no state between rooms, and the
+# Markdown converters it uses are kept per thread, so it can be used by several threads
+# at once)
+shared_parser = PaignionParser()
+
+
+def read_room_sources(rooms):
+    """Read the sources of the rooms of a game.
+
+    :param rooms: a dict mapping the names of the rooms to their sources, or an
+        iterable of (room name, source) tuples; each source is the contents of a room
+        file, either as a string (or bytes), or as a file-like object
+    :type rooms: dict or iterable
+    :return: a generator of (room name, raw room data) tuples
+    """
+    if isinstance(rooms, dict):
+        rooms = rooms.items()
+
+    for room_name, source in rooms:
+        room_data = source.read() if hasattr(source, "read") else source
+        if isinstance(room_data, bytes):
+            room_data = room_data.decode("utf-8")
+        yield room_name, room_data
+
+
+def build_game_data(rooms, keep_unreachable=False, fast_travel=False):
+    """Build the GAME_DATA object of a game, without touching the disk.
+
+    :param rooms: the sources of the rooms of the game (see `read_room_sources()`)
+    :type rooms: dict or iterable
+    :param keep_unreachable: True if the rooms that the player can never reach should
+        be kept in the game
+    :type keep_unreachable: bool
+    :param fast_travel: True if the routing table of the `go to <room>` command should
+        be computed
+    :type fast_travel: bool
+    :return: the GAME_DATA object
+    """
+    game_data = sort_rooms(shared_parser.iter_rooms(read_room_sources(rooms)))
+    if "origin" not in game_data:
+        raise PaignionException("Origin room not found. Please create an origin room.")
+
+    if not keep_unreachable:
+        game_data, _ = tree_shake(game_data)
+    if fast_travel:
+        game_data, _, _ = compute_routes(game_data)
+
+    return game_data
+
+
+def build_index_html(
+    rooms,
+    data_format=GAME_DATA_FORMATS[0],
+    minify=False,
+    full_engine=False,
+    keep_unreachable=False,
+    fast_travel=False,
+):
+    """Build a game into its index.html file, without touching the disk.
+
+    This gives the same index.html file as `paignion build` with the same options.
+
+    :param rooms: the sources of the rooms of the game (see `read_room_sources()`)
+    :type rooms: dict or iterable
+    :param data_format: the format to embed the game data in (see GAME_DATA_FORMATS)
+    :type data_format: str
+    :param minify: True if the output should be minified
+    :type minify: bool
+    :param full_engine: True if the engine should be included in full, even if the
+        game does not use all of its features
+    :type full_engine: bool
+    :param keep_unreachable: True if the rooms that the player can never reach should
+        be kept in the game
+    :type keep_unreachable: bool
+    :param fast_travel: True if the routing table of the `go to <room>` command should
+        be computed
+    :type fast_travel: bool
+    :return: the contents of the index.html file, encoded in UTF-8
+    """
+    game_data = build_game_data(rooms, keep_unreachable, fast_travel)
+
+    if full_engine:
+        engine_features = frozenset(ENGINE_FEATURES)
+    else:
+        engine_features = frozenset(detect_engine_features(game_data))
+
+    return render_index_html(
+        game_data=game_data,
+        main_css=read_frontend_file("main.css"),
+        paignion_js=frontend_engine(engine_features),
+        data_format=data_format,
+        minify=minify,
+    ).encode("utf-8")
@@ -0,0 +1,116 @@
+import contextlib
+import glob
+import io
+import os
+import time
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def expand_project_dirs(patterns):
+    """Expand the glob patterns among a list of project directories.
+
+    :param patterns: project directories (or packed projects), or glob patterns
+        matching them
+    :type patterns: list
+    :return: the list of the projects, without duplicates, and the list of the patterns
+        that did not match anything
+    """
+    project_dirs = []
+    unmatched_patterns = []
+
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                unmatched_patterns.append(pattern)
+            project_dirs += matches
+        else:
+            project_dirs.append(pattern)
+
+    return list(dict.fromkeys(project_dirs)), unmatched_patterns
+
+
+def project_size(project_dir):
+    """Estimate the size of a project (to schedule the longest builds first).
+
+    :param project_dir: the directory containing the project files, or the path to a
+        packed project
+    :type project_dir: str
+    :return: the total size of the room files (or of the packed project) in bytes, 0 if
+        the project cannot be read
+    """
+    if os.path.isfile(project_dir):
+        return os.path.getsize(project_dir)
+
+    size = 0
+    for root, _, files in os.walk(os.path.join(project_dir, "rooms")):
+        for file_name in files:
+            if file_name.endswith(".md"):
+                size += os.path.getsize(os.path.join(root, file_name))
+
+    return size
+
+
+def build_project(project_dir, options):
+    """Build a project, capturing its output (the task run by the batch workers).
+
+    :param project_dir: the directory containing the project files, or the path to a
+        packed project
+    :type project_dir: str
+    :param options: the arguments of the build command
+    :type options: dict
+    :return: a dict with the `project_dir`, the `output` and the `error` (None if the
+        build succeeded) of the build, along with its duration (`time`) in seconds
+    """
+    from paignion.__main__ import paignion_build
+
+    output = io.StringIO()
+    error = None
+    start = time.perf_counter()
+
+    try:
+        with contextlib.redirect_stdout(output):
+            paignion_build(Namespace(project_dir=project_dir, **options))
+    except Exception as e:
+        # A failed build must not abort the other ones
+        error = str(e) or type(e).__name__
+
+    return {
+        "project_dir": project_dir,
+        "output": output.getvalue(),
+        "error": error,
+        "time": time.perf_counter() - start,
+    }
+
+
+def build_projects(project_dirs, options, jobs=1):
+    """Build several projects in parallel.
+
+    The builds run on a shared pool of processes (in which the Markdown & compiled
+    action caches are shared by all the projects built by the same process), the
+    largest projects first so that the longest builds do not start last.
+
+    :param project_dirs: the projects to build
+    :type project_dirs: list
+    :param options: the arguments of the build command (except for the project)
+    :type options: dict
+    :param jobs: the number of processes building the projects in parallel
+    :type jobs: int
+    :return: a generator of the results of the builds (see `build_project()`), in the
+        order in which they finish
+    """
+    project_dirs = sorted(project_dirs, key=project_size, reverse=True)
+
+    if jobs <= 1 or len(project_dirs) <= 1:
+        for project_dir in project_dirs:
+            yield build_project(project_dir, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(build_project, project_dir, options)
+            for project_dir in project_dirs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,259 @@
+import gzip
+import json
+import os
+
+from paignion.builder import minify_game_data
+from paignion.definitions import BUDGETS, BUDGET_REPORT_TOP_ROOMS, PROJECT_CONFIG_FILE
+from paignion.exceptions import PaignionException
+from paignion.tools import info
+
+
+def load_project_budgets(project_dir):
+    """Load the size budgets set in the configuration file of a project.
+
+    The budgets are set in the `budgets` section of the configuration file, e.g.:
+
+        budgets:
+          total_gzip_size: 200000
+          room_size: 20000
+          warn: true  # only warn when a budget is exceeded
+
+    :param project_dir: the directory containing the project files (packed projects
+        have no configuration file)
+    :type project_dir: str
+    :return: a dict mapping the names of the budgets (see BUDGETS) to their sizes in
+        bytes, along with `warn` if it is set
+    """
+    config_file = os.path.join(project_dir, PROJECT_CONFIG_FILE)
+    if not os.path.isfile(config_file):
+        return {}
+
+    # Imported here, as it takes a while and is not needed by every command
+    import yaml
+
+    try:
+        with open(config_file, "r") as f:
+            config = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise PaignionException(f"Invalid configuration file `{config_file}`") from e
+
+    budgets = config.get("budgets") if isinstance(config, dict) else None
+    if budgets is None:
+        return {}
+    if not isinstance(budgets, dict):
+        raise PaignionException(
+            f"The `budgets` of `{config_file}` must be a mapping of budget names to "
+            "sizes in bytes"
+        )
+
+    for name, size in budgets.items():
+        if name == "warn":
+            if not isinstance(size, bool):
+                raise PaignionException(
+                    f"The `warn` budget option of `{config_file}` must be true or false"
+                )
+        elif name not in BUDGETS:
+            raise PaignionException(
+                f"Unknown budget `{name}` in `{config_file}` (expected one of "
+                f"{', '.join(BUDGETS)})"
+            )
+        elif not isinstance(size, int) or isinstance(size, bool) or size < 0:
+            raise PaignionException(
+                f"The `{name}` budget of `{config_file}` must be a size in bytes"
+            )
+
+    return budgets
+
+
+def iter_descriptions(game_data):
+    """Iterate over the descriptions of the rooms & items of a game.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :return: a generator of (description, owner) tuples, the owner describing the room
+        or the item the description belongs to
+    """
+    for room_name, room in game_data.items():
+        yield room["description"], f"room `{room_name}`"
+        for item_type in ("tangible", "intangible"):
+            for item in room["items"][item_type]:
+                yield item[
+                    "description"
+                ], f"item `{item['name']}` of room `{room_name}`"
+
+
+def room_sizes(game_data, compact=False):
+    """Measure the size of every room of a game in the game data.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param compact: True if the rooms are measured as compact JSON (as emitted by
+        minified builds)
+    :type compact: bool
+    :return: a list of (room name, size in bytes) tuples, the largest room first
+    """
+    separators = (",", ":") if compact else None
+    return sorted(
+        (
+            (room_name, len(json.dumps(room, separators=separators).encode("utf-8")))
+            for room_name, room in game_data.items()
+        ),
+        key=lambda room_size: room_size[1],
+        reverse=True,
+    )
+
+
+def measure_budgets(game_data, build_files, sections, names=None, compact=False):
+    """Measure the sizes that budgets apply to.
+
+    :param game_data: the GAME_DATA object, as emitted in the build (minified by
+        `minify_game_data()` in minified builds)
+    :type game_data: dict
+    :param build_files: a dict mapping the names of the built files to their contents
+    :type build_files: dict
+    :param sections: the sections of the build (see `encode_build_sections()`)
+    :type sections: dict
+    :param names: the names of the budgets to measure (all of them by default), as
+        compressing the whole build takes a while for large games
+    :type names: list
+    :param compact: True if the GAME_DATA is emitted as compact JSON (in minified
+        builds)
+    :type compact: bool
+    :return: a dict mapping the names of the budgets (see BUDGETS) to (size, culprit)
+        tuples, the culprit being the largest room or description (None for the other
+        budgets)
+    """
+    names = BUDGETS if names is None else names
+    measurements = {}
+
+    if "total_gzip_size" in names:
+        measurements["total_gzip_size"] = (
+            sum(
+                len(gzip.compress(file_data.encode("utf-8")))
+                for file_data in build_files.values()
+            ),
+            None,
+        )
+    if "room_size" in names:
+        largest_room, room_size = (room_sizes(game_data, compact) or [(None, 0)])[0]
+        measurements["room_size"] = (room_size, f"room `{largest_room}`")
+    if "description_size" in names:
+        description_size, owner = 0, None
+        for description, description_owner in iter_descriptions(game_data):
+            size = len((description or "").encode("utf-8"))
+            if size > description_size:
+                description_size, owner = size, description_owner
+        measurements["description_size"] = (description_size, owner)
+    if "engine_size" in names:
+        measurements["engine_size"] = (
+            len(sections["paignion_js"].encode("utf-8")),
+            None,
+        )
+
+    return measurements
+
+
+def check_budgets(budgets, measurements):
+    """Find the budgets that are exceeded.
+
+    :param budgets: a dict mapping the names of the budgets to their sizes in bytes
+        (budgets set to None are ignored)
+    :type budgets: dict
+    :param measurements: the measured sizes (see `measure_budgets()`)
+    :type measurements: dict
+    :return: a list of (budget name, size, budget, culprit) tuples
+    """
+    return [
+        (name, measurements[name][0], budgets[name], measurements[name][1])
+        for name in BUDGETS
+        if budgets.get(name) is not None and measurements[name][0] > budgets[name]
+    ]
+
+
+def budget_breakdown(
+    game_data, build_files, sections, top_rooms=BUDGET_REPORT_TOP_ROOMS, compact=False
+):
+    """Break the size of a build down, to see what to cut when a budget is exceeded.
+
+    :param game_data: the GAME_DATA object, as emitted in the build (minified by
+        `minify_game_data()` in minified builds)
+    :type game_data: dict
+    :param build_files: a dict mapping the names of the built files to their contents
+    :type build_files: dict
+    :param sections: the sections of the build (see `encode_build_sections()`)
+    :type sections: dict
+    :param top_rooms: the number of largest rooms to list
+    :type top_rooms: int
+    :param compact: True if the GAME_DATA is emitted as compact JSON (in minified
+        builds)
+    :type compact: bool
+    :return: the lines of the breakdown
+    """
+    game_data_section = sections.get("game_data_json") or (
+        sections["game_data_html"] + sections["game_data_js"]
+    )
+    section_data = {
+        "engine": sections["paignion_js"],
+        "CSS": sections["main_css"],
+        "GAME_DATA": game_data_section,
+    }
+    total_size = sum(
+        len(file_data.encode("utf-8")) for file_data in build_files.values()
+    )
+
+    lines = []
+    for section, data in section_data.items():
+        data = data.encode("utf-8")
+        lines.append(
+            f"{section}: {len(data)} bytes ({len(gzip.compress(data))} bytes gzipped)"
+        )
+        total_size -= len(data)
+    lines.append(f"HTML templates: {total_size} bytes")
+
+    for room_name, size in room_sizes(game_data, compact)[:top_rooms]:
+        lines.append(f"room `{room_name}`: {size} bytes")
+
+    return lines
+
+
+def enforce_budgets(budgets, game_data, build_files, sections, minify=False):
+    """Check a build against its budgets, and report the budgets it exceeds.
+
+    :param budgets: a dict mapping the names of the budgets to their sizes in bytes,
+        along with `warn` (True if exceeding a budget should only be warned about)
+    :type budgets: dict
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param build_files: a dict mapping the names of the built files to their contents
+    :type build_files: dict
+    :param sections: the sections of the build (see `encode_build_sections()`)
+    :type sections: dict
+    :param minify: True if the build is minified (the rooms & descriptions are then
+        measured as they are emitted, minified)
+    :type minify: bool
+    """
+    names = [name for name in BUDGETS if budgets.get(name) is not None]
+    if not names:
+        return
+
+    if minify:
+        game_data = minify_game_data(game_data)
+    exceeded = check_budgets(
+        budgets,
+        measure_budgets(game_data, build_files, sections, names, compact=minify),
+    )
+    if not exceeded:
+        return
+
+    warn = budgets.get("warn", False)
+    for name, size, budget, culprit in exceeded:
+        info(
+            f"{'Warning: b' if warn else 'B'}udget `{name}` exceeded: {size} bytes "
+            f"(budget: {budget} bytes){f', by {culprit}' if culprit else ''}"
+        )
+    info("Size of the build:")
+    for line in budget_breakdown(game_data, build_files, sections, compact=minify):
+        print(f"    {line}")
+
+    if not warn:
+        raise PaignionException(f"The build exceeds {len(exceeded)} budget(s)")
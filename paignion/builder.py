@@ -0,0 +1,427 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import time
+
+from paignion.definitions import (
+    FRONTEND_DIR,
+    GAME_DATA_FORMATS,
+    GAME_DATA_SCRIPT_ID,
+    GAME_DATA_SCRIPT_TEMPLATE,
+    INDEX_HTML_TEMPLATE,
+    SPLIT_BUILD_HASH_LENGTH,
+    SPLIT_INDEX_HTML_TEMPLATE,
+)
+from paignion.exceptions import PaignionException
+from paignion.minifier import minify_js, minify_css, minify_html
+
+# A region of the frontend engine implementing an optional feature
+ENGINE_FEATURE_REGEX = re.compile(
+    r"^[ \t]*// @feature-begin (?P<feature>\w+)\n"
+    r"(?P<code>.*?)"
+    r"^[ \t]*// @feature-end (?P=feature)\n",
+    flags=re.MULTILINE | re.DOTALL,
+)
+
+
+def detect_engine_features(game_data):
+    """Detect which optional features of the frontend engine a game uses.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :return: the set of the features used (see ENGINE_FEATURES)
+    """
+    features = set()
+
+    for room in game_data.values():
+        if "route_id" in room:
+            # The routing table of the `go to <room>` command was computed
+            features.add("travel")
+        for item in room["items"]["tangible"] + room["items"]["intangible"]:
+            features.add("items")
+            for used_with_item in item["used_with"]:
+                features.add("used_with")
+                if used_with_item["actions"]:
+                    features.add("actions")
+
+    return features
+
+
+def strip_engine_features(paignion_js, features):
+    """Remove the code of unused features from the frontend engine.
+
+    :param paignion_js: the contents of the frontend engine (paignion.js)
+    :type paignion_js: str
+    :param features: the features to keep (see ENGINE_FEATURES)
+    :type features: set
+    :return: the trimmed frontend engine
+    """
+
+    def strip_feature_region(match):
+        if match.group("feature") not in features:
+            return ""
+        # Regions of other features may be nested in this one
+        return ENGINE_FEATURE_REGEX.sub(strip_feature_region, match.group("code"))
+
+    return ENGINE_FEATURE_REGEX.sub(strip_feature_region, paignion_js)
+
+
+@functools.lru_cache(maxsize=None)
+def read_frontend_file(file_name):
+    """Read one of the files of the frontend (read from disk only once).
+
+    :param file_name: the name of the file (e.g. `main.css`)
+    :type file_name: str
+    :return: the contents of the file
+    """
+    with open(os.path.join(FRONTEND_DIR, file_name), "r") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def frontend_engine(features):
+    """Get the frontend engine, trimmed down to a set of features.
+
+    The result is cached, since few games use different sets of features.
+
+    :param features: the features to keep (see ENGINE_FEATURES)
+    :type features: frozenset
+    :return: the trimmed frontend engine (see `strip_engine_features()`)
+    """
+    return strip_engine_features(read_frontend_file("paignion.js"), features)
+
+
+def escape_script_data(json_data):
+    """Escape a JSON string so that it can be safely inlined in a <script> element.
+
+    The HTML parser ends a <script> element on the first `</` that starts a closing
+    tag, regardless of JavaScript/JSON string boundaries, and `<!--` switches it to a
+    different parsing state. Both sequences can only appear inside JSON strings, where
+    `\\/` and `\\u0021` are valid escapes, so the decoded data stays the same.
+
+    :param json_data: a JSON string
+    :type json_data: str
+    :return: the escaped JSON string
+    """
+    return json_data.replace("</", "<\\/").replace("<!--", "<\\u0021--")
+
+
+def escape_js_string(string):
+    """Escape a string so that it can be placed inside a single-quoted JS literal.
+
+    :param string: the string to escape
+    :type string: str
+    :return: the escaped string (without the surrounding quotes)
+    """
+    return (
+        string.replace("\\", "\\\\")
+        .replace("'", "\\'")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\u2028", "\\u2028")
+        .replace("\u2029", "\\u2029")
+    )
+
+
+def minify_game_data(game_data):
+    """Collapse the whitespace of all the HTML fragments of the GAME_DATA object.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :return: a minified copy of the GAME_DATA object
+    """
+    minified_game_data = {}
+
+    for room_name, room in game_data.items():
+        room = dict(room, description=minify_html(room["description"]))
+        room["items"] = {
+            item_type: [
+                dict(
+                    item,
+                    description=(
+                        minify_html(item["description"])
+                        if item["description"]
+                        else item["description"]
+                    ),
+                    used_with=[
+                        dict(
+                            used_with_item,
+                            effect_message=minify_html(
+                                used_with_item["effect_message"]
+                            ),
+                        )
+                        for used_with_item in item["used_with"]
+                    ],
+                )
+                for item in items
+            ]
+            for item_type, items in room["items"].items()
+        }
+        minified_game_data[room_name] = room
+
+    return minified_game_data
+
+
+def dump_game_data(game_data, minify=False):
+    """Dump the GAME_DATA object to JSON.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param minify: True if the JSON should be as compact as possible
+    :type minify: bool
+    :return: the JSON string of the game data
+    """
+    if minify:
+        return json.dumps(minify_game_data(game_data), separators=(",", ":"))
+
+    return json.dumps(game_data)
+
+
+def encode_json_data(json_data, data_format="script", minify=False):
+    """Encode the game data (dumped to JSON) for the generated index.html.
+
+    Three formats are supported:
+    - `script`: the data is placed in a `<script type="application/json">` element and
+      read back with `JSON.parse()` by a one-line prelude;
+    - `json-parse`: the data is placed in a `JSON.parse('...')` string literal;
+    - `literal`: the data is written as a JavaScript object literal.
+
+    JS engines parse JSON through `JSON.parse()` much faster than they parse the
+    equivalent object literal, so `script` is used by default.
+
+    :param json_data: the JSON string of the game data (see `dump_game_data()`)
+    :type json_data: str
+    :param data_format: the format to encode the data in (see GAME_DATA_FORMATS)
+    :type data_format: str
+    :param minify: True if the encoded data should be as compact as possible
+    :type minify: bool
+    :return: a tuple (str, str) containing the HTML to be placed before the engine's
+        <script> element, and the JavaScript prelude declaring GAME_DATA
+    """
+    script_template = (
+        minify_html(GAME_DATA_SCRIPT_TEMPLATE) if minify else GAME_DATA_SCRIPT_TEMPLATE
+    )
+    json_data = escape_script_data(json_data)
+
+    if data_format == "script":
+        return (
+            script_template.format(id=GAME_DATA_SCRIPT_ID, data=json_data),
+            f"let GAME_DATA = JSON.parse("
+            f'document.getElementById("{GAME_DATA_SCRIPT_ID}").textContent);',
+        )
+    elif data_format == "json-parse":
+        return "", f"let GAME_DATA = JSON.parse('{escape_js_string(json_data)}');"
+    elif data_format == "literal":
+        return "", f"let GAME_DATA = {json_data};"
+
+    raise PaignionException(
+        f"Unknown game data format `{data_format}` (expected one of "
+        f"{', '.join(GAME_DATA_FORMATS)})"
+    )
+
+
+def encode_build_sections(
+    json_data, main_css, paignion_js, data_format="script", minify=False, split=False
+):
+    """Encode the sections of the build of a game, before they fill the templates.
+
+    :param json_data: the JSON string of the game data (see `dump_game_data()`)
+    :type json_data: str
+    :param main_css: the contents of the main.css file
+    :type main_css: str
+    :param paignion_js: the contents of the frontend engine (paignion.js)
+    :type paignion_js: str
+    :param data_format: the format to encode the data in (single-file builds only)
+    :type data_format: str
+    :param minify: True if the output should be minified
+    :type minify: bool
+    :param split: True for a split build, False for a single index.html file
+    :type split: bool
+    :return: a dict containing the CSS (`main_css`), the engine (`paignion_js`) and the
+        game data, either as `game_data_json` for split builds, or as `game_data_html`
+        and `game_data_js` (see `encode_json_data()`) for single-file builds
+    """
+    sections = {
+        "main_css": minify_css(main_css) if minify else main_css,
+        "paignion_js": minify_js(paignion_js) if minify else paignion_js,
+    }
+
+    if split:
+        sections["game_data_json"] = json_data
+    else:
+        sections["game_data_html"], sections["game_data_js"] = encode_json_data(
+            json_data, data_format, minify
+        )
+
+    return sections
+
+
+def content_hash(data):
+    """Compute the content hash used in the file names of split builds.
+
+    :param data: the contents of a file
+    :type data: str
+    :return: the hex digest of the contents (truncated to SPLIT_BUILD_HASH_LENGTH)
+    """
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:SPLIT_BUILD_HASH_LENGTH]
+
+
+def fill_build_templates(sections, minify=False, split=False):
+    """Fill the HTML templates of the build of a game with its sections.
+
+    In a single-file build, the sections are inserted into index.html. In a split
+    build, they are written to separate files whose names contain a hash of their
+    contents, and a small index.html refers to them.
+
+    :param sections: the sections of the build (see `encode_build_sections()`)
+    :type sections: dict
+    :param minify: True if the output should be minified
+    :type minify: bool
+    :param split: True for a split build, False for a single index.html file
+    :type split: bool
+    :return: a dict mapping file names to file contents
+    """
+    if split:
+        files = {
+            f"main.{content_hash(sections['main_css'])}.css": sections["main_css"],
+            f"paignion.{content_hash(sections['paignion_js'])}.js": sections[
+                "paignion_js"
+            ],
+            f"game-data.{content_hash(sections['game_data_json'])}.json": sections[
+                "game_data_json"
+            ],
+        }
+        main_css_file, paignion_js_file, game_data_file = files
+
+        index_html_template = (
+            minify_html(SPLIT_INDEX_HTML_TEMPLATE)
+            if minify
+            else SPLIT_INDEX_HTML_TEMPLATE
+        )
+        files["index.html"] = index_html_template.format(
+            main_css=main_css_file,
+            paignion_js=paignion_js_file,
+            game_data=game_data_file,
+        )
+
+        return files
+
+    if minify:
+        index_html = minify_html(INDEX_HTML_TEMPLATE).format(
+            main_css=sections["main_css"],
+            game_data=sections["game_data_html"],
+            paignion_js=f"{sections['game_data_js']}\n{sections['paignion_js']}",
+        )
+    else:
+        # The game data object needs to be declared on the top of the engine, because
+        # its declaration must come before any references to it
+        index_html = INDEX_HTML_TEMPLATE.format(
+            main_css=sections["main_css"],
+            game_data=sections["game_data_html"],
+            paignion_js=(
+                f"// Automatically generated game data object\n"
+                f"{sections['game_data_js']}\n\n\n"
+                f"{sections['paignion_js']}"
+            ),
+        )
+
+    return {"index.html": index_html}
+
+
+def render_index_html(
+    game_data, main_css, paignion_js, data_format="script", minify=False
+):
+    """Render the final index.html file of a game.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param main_css: the contents of the main.css file
+    :type main_css: str
+    :param paignion_js: the contents of the frontend engine (paignion.js)
+    :type paignion_js: str
+    :param data_format: the format to encode the data in (see GAME_DATA_FORMATS)
+    :type data_format: str
+    :param minify: True if the output should be minified
+    :type minify: bool
+    :return: the contents of the index.html file
+    """
+    return render_build_files(game_data, main_css, paignion_js, data_format, minify)[
+        "index.html"
+    ]
+
+
+def render_build_files(
+    game_data, main_css, paignion_js, data_format="script", minify=False, split=False
+):
+    """Render all the files of the build of a game.
+
+    In a split build, the engine, the CSS and the game data are written to separate
+    files whose names contain a hash of their contents, and a small index.html refers
+    to them. Since the engine and the CSS are identical across games and across content
+    updates, they can be served with immutable cache headers and only the game data
+    file changes when the game does.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param main_css: the contents of the main.css file
+    :type main_css: str
+    :param paignion_js: the contents of the frontend engine (paignion.js)
+    :type paignion_js: str
+    :param data_format: the format to encode the data in (single-file builds only)
+    :type data_format: str
+    :param minify: True if the output should be minified
+    :type minify: bool
+    :param split: True for a split build, False for a single index.html file
+    :type split: bool
+    :return: a dict mapping file names to file contents
+    """
+    sections = encode_build_sections(
+        dump_game_data(game_data, minify),
+        main_css,
+        paignion_js,
+        data_format,
+        minify,
+        split,
+    )
+
+    return fill_build_templates(sections, minify, split)
+
+
+def game_data_format_report(game_data, repeat=5):
+    """Compare the size & decoding time of the game data in every supported format.
+
+    This report is browser-free: the decoding time is that of Python's `json.loads()`
+    on the exact string that `JSON.parse()` would receive in the browser, which is a
+    reasonable proxy for comparing payloads. Object literals are parsed by the JS
+    engine itself, so there is no decoding time to report for the `literal` format.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param repeat: the number of decoding runs to average over
+    :type repeat: int
+    :return: a list of dicts (one per format) containing the format name, the size in
+        bytes of the encoded data and the average decoding time in milliseconds (or
+        None if not applicable)
+    """
+    report = []
+    # This is exactly the string JSON.parse() receives in the browser
+    json_data = escape_script_data(json.dumps(game_data))
+
+    for data_format in GAME_DATA_FORMATS:
+        game_data_html, game_data_js = encode_json_data(
+            dump_game_data(game_data), data_format
+        )
+        size = len((game_data_html + game_data_js).encode("utf-8"))
+
+        decode_time = None
+        if data_format != "literal":
+            start = time.perf_counter()
+            for _ in range(repeat):
+                json.loads(json_data)
+            decode_time = (time.perf_counter() - start) * 1000 / repeat
+
+        report.append({"format": data_format, "size": size, "decode_time": decode_time})
+
+    return report
@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from paignion.exceptions import PaignionException
+from paignion.parser import PaignionParser, room_name_from_path
+
+
+def check_room_file(room_file, rooms_dir=None):
+    """Check a room file for errors, without rendering it.
+
+    The YAML header, the rooms, items & `used_with` items and the actions are all
+    validated, but the Markdown parts are not rendered to HTML.
+
+    :param room_file: the path to the room file
+    :type room_file: str
+    :param rooms_dir: the rooms directory containing the room file, from which the name
+        of the room is derived (see `room_name_from_path()`)
+    :type rooms_dir: str
+    :return: the list of the error messages found in the file (empty if there are
+        none), each along with the messages of the errors that caused it
+    """
+    parser = PaignionParser(render_markdown=False)
+
+    try:
+        with open(room_file, "r") as f:
+            parser.parse_room_data(
+                room_data=f.read(),
+                room_name=room_name_from_path(room_file, rooms_dir),
+            )
+    except PaignionException as e:
+        messages = [str(e)]
+        cause = e.__cause__
+        while cause is not None:
+            messages.append(str(cause))
+            cause = cause.__cause__
+        return messages
+    except Exception as e:
+        # Files with an unexpected structure can make the parser fail in any way
+        return [f"{type(e).__name__}: {e}"]
+
+    return []
+
+
+def check_room_files(room_files, jobs=1, rooms_dirs=None):
+    """Check a list of room files for errors.
+
+    Every file is checked, even if errors are found in the first ones.
+
+    :param room_files: a list of the paths to the room files
+    :type room_files: list
+    :param jobs: the number of processes checking the files in parallel
+    :type jobs: int
+    :param rooms_dirs: a dictionary mapping the paths of the room files to the rooms
+        directories containing them (see `check_room_file()`)
+    :type rooms_dirs: dict
+    :return: a dictionary mapping the paths of the files containing errors to the
+        list of their error messages (see `check_room_file()`)
+    """
+    rooms_dirs = rooms_dirs or {}
+    room_files_rooms_dirs = [rooms_dirs.get(room_file) for room_file in room_files]
+
+    if jobs > 1 and len(room_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(
+                executor.map(
+                    check_room_file,
+                    room_files,
+                    room_files_rooms_dirs,
+                    chunksize=max(1, len(room_files) // (jobs * 4)),
+                )
+            )
+    else:
+        results = [
+            check_room_file(room_file, rooms_dir)
+            for room_file, rooms_dir in zip(room_files, room_files_rooms_dirs)
+        ]
+
+    return {
+        room_file: messages
+        for room_file, messages in zip(room_files, results)
+        if messages
+    }
@@ -0,0 +1,267 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from argparse import Namespace
+
+from paignion.definitions import BUDGETS, DAEMON_MAX_PROJECTS
+from paignion.exceptions import PaignionException
+
+# The options of `paignion build` that are forwarded to the daemon, with the type of
+# their values (all of them can also be None)
+DAEMON_BUILD_OPTIONS = {
+    "project_dir": str,
+    "data_format": str,
+    "minify": bool,
+    "split": bool,
+    "keep_unreachable": bool,
+    "fast_travel": bool,
+    "full_engine": bool,
+    "no_room_index": bool,
+    "data_report": bool,
+    **{f"budget_{budget}": int for budget in BUDGETS},
+    "budget_warn": bool,
+    "verify_reproducible": bool,
+    "progress": str,
+    "profile_memory": bool,
+    "metrics_json": str,
+}
+
+
+def default_socket_path():
+    """Get the path of the Unix socket the daemon listens on by default.
+
+    The socket is in the runtime directory of the user (`$XDG_RUNTIME_DIR`) if there is
+    one, or else in a directory of the temporary directory that only the user can
+    access, so that other users can neither connect to the daemon nor replace its
+    socket.
+
+    :return: the path to the socket
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "paignion.sock")
+
+    private_dir = os.path.join(tempfile.gettempdir(), f"paignion-{os.getuid()}")
+    try:
+        os.mkdir(private_dir, 0o700)
+    except FileExistsError:
+        pass
+    # The directory may have been created by another user, to intercept the builds
+    private_dir_stat = os.lstat(private_dir)
+    if (
+        not stat.S_ISDIR(private_dir_stat.st_mode)
+        or private_dir_stat.st_uid != os.getuid()
+        or stat.S_IMODE(private_dir_stat.st_mode) & 0o077
+    ):
+        raise PaignionException(
+            f"The daemon directory `{private_dir}` is not private to the current user"
+        )
+
+    return os.path.join(private_dir, "daemon.sock")
+
+
+def send_request(socket_path, request):
+    """Send a request to a running daemon and wait for its response.
+
+    :param socket_path: the path to the Unix socket of the daemon
+    :type socket_path: str
+    :param request: the request (see `PaignionDaemon.handle_request()`)
+    :type request: dict
+    :return: the response of the daemon, or None if no daemon is listening on the
+        socket
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as response:
+                return json.loads(response.readline())
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+
+def forward_build(socket_path, namespace):
+    """Forward a `paignion build` command to a running daemon.
+
+    The output of the build is printed as if it was built in this process.
+
+    :param socket_path: the path to the Unix socket of the daemon
+    :type socket_path: str
+    :param namespace: the arguments of the build command
+    :type namespace: Namespace
+    :return: True if the build was handled by the daemon, False if no daemon is
+        listening on the socket
+    """
+    options = {
+        option: value
+        for option, value in vars(namespace).items()
+        if option in DAEMON_BUILD_OPTIONS
+    }
+    response = send_request(
+        socket_path, {"command": "build", "cwd": os.getcwd(), "options": options}
+    )
+    if response is None:
+        return False
+
+    print(response["output"], end="")
+    if response["error"] is not None:
+        raise PaignionException(response["error"])
+
+    return True
+
+
+def check_build_request(request):
+    """Check that a `build` request sent to the daemon is valid.
+
+    :param request: the request (see `PaignionDaemon.handle_request()`)
+    :type request: dict
+    :return: a tuple (str, dict) containing the working directory of the client and
+        the arguments of the build command
+    """
+    cwd = request.get("cwd")
+    if not isinstance(cwd, str) or not os.path.isabs(cwd) or not os.path.isdir(cwd):
+        raise PaignionException(f"Invalid working directory `{cwd}`")
+
+    options = request.get("options")
+    if not isinstance(options, dict) or not isinstance(options.get("project_dir"), str):
+        raise PaignionException("No project directory to build")
+    for option, value in options.items():
+        if option not in DAEMON_BUILD_OPTIONS:
+            raise PaignionException(f"Unknown build option `{option}`")
+        if value is not None and type(value) is not DAEMON_BUILD_OPTIONS[option]:
+            raise PaignionException(f"Invalid value for build option `{option}`")
+
+    return cwd, options
+
+
+class PaignionDaemon(object):
+    """Describe a Paignion build daemon.
+
+    The daemon listens on a Unix socket and builds the projects it is asked to build,
+    keeping the parsed rooms (with their rendered Markdown & compiled actions) of every
+    project between builds, along with the frontend files and the Markdown converter.
+    Only the rooms whose files have changed since the last build of a project are
+    parsed again.
+
+    The rooms of the DAEMON_MAX_PROJECTS most recently built projects are kept. Only
+    the user running the daemon can connect to its socket.
+    """
+
+    def __init__(self, socket_path):
+        """Construct a new instance of PaignionDaemon.
+
+        :param socket_path: the path to the Unix socket to listen on
+        :type socket_path: str
+        :return: an instance of PaignionDaemon
+        """
+        self.socket_path = socket_path
+        # The parsed rooms of the last built projects, by absolute project directory
+        # (from the least to the most recently built)
+        self.room_caches = {}
+        # Builds change the working directory & capture the standard output, so they
+        # run one at a time
+        self.build_lock = threading.Lock()
+        self.server = None
+
+    def build(self, cwd, options):
+        """Build a project.
+
+        :param cwd: the working directory of the client
+        :type cwd: str
+        :param options: the arguments of the build command
+        :type options: dict
+        :return: a tuple (str, str) containing the output of the build and its error
+            message (None if the build succeeded)
+        """
+        from paignion.__main__ import paignion_build
+
+        output = io.StringIO()
+        error = None
+
+        with self.build_lock:
+            daemon_cwd = os.getcwd()
+            try:
+                os.chdir(cwd)
+                project_dir = os.path.abspath(options["project_dir"])
+                room_cache = self.room_caches.pop(project_dir, {})
+                self.room_caches[project_dir] = room_cache
+                while len(self.room_caches) > DAEMON_MAX_PROJECTS:
+                    del self.room_caches[next(iter(self.room_caches))]
+                with contextlib.redirect_stdout(output):
+                    paignion_build(Namespace(room_cache=room_cache, **options))
+            except Exception as e:
+                # Errors are reported to the client instead of stopping the daemon
+                error = str(e) or type(e).__name__
+            finally:
+                os.chdir(daemon_cwd)
+
+        return output.getvalue(), error
+
+    def handle_request(self, request):
+        """Handle a request sent by a client.
+
+        Requests are dicts with a `command` key, either `ping` (to check that the
+        daemon is running) or `build`; `build` requests also have the working
+        directory of the client (`cwd`) and the arguments of the build command
+        (`options`, limited to DAEMON_BUILD_OPTIONS).
+
+        :param request: the request
+        :type request: dict
+        :return: the response, a dict with the `output` and the `error` (None if
+            there was none) of the command
+        """
+        if request.get("command") == "ping":
+            return {"output": "", "error": None}
+        if request.get("command") != "build":
+            return {
+                "output": "",
+                "error": f"Unknown command `{request.get('command')}`",
+            }
+
+        try:
+            cwd, options = check_build_request(request)
+        except PaignionException as e:
+            return {"output": "", "error": str(e)}
+
+        output, error = self.build(cwd, options)
+        return {"output": output, "error": error}
+
+    def serve_forever(self):
+        """Listen on the socket and handle requests until interrupted."""
+        if send_request(self.socket_path, {"command": "ping"}) is not None:
+            raise PaignionException(
+                f"A daemon is already listening on `{self.socket_path}`"
+            )
+        # The socket of a daemon that did not stop cleanly may still be there
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                request = json.loads(self.rfile.readline())
+                response = daemon.handle_request(request)
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        try:
+            with socketserver.ThreadingUnixStreamServer(
+                self.socket_path, RequestHandler
+            ) as self.server:
+                # Only the user running the daemon can connect to it
+                os.chmod(self.socket_path, 0o600)
+                self.server.serve_forever()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def shutdown(self):
+        """Stop listening on the socket (from another thread)."""
+        if self.server is not None:
+            self.server.shutdown()
@@ -1,6 +1,5 @@
 import os
 
-
 # The current version of Paignion
 __version_info__ = ("0", "0", "7")
 __version__ = ".".join(__version_info__)
@@ -28,6 +27,160 @@ MD_EXTENSIONS = [
 ]
 
 
+# The optional features of the frontend engine. The code implementing each of them is
+# enclosed in `// @feature-begin <feature>` and `// @feature-end <feature>` lines in
+# paignion.js, so that it can be left out of games that do not use the feature.
+ENGINE_FEATURES = [
+    # Item-related commands & the approximation of mistyped item names
+    "items",
+    # The `use` command
+    "used_with",
+    # The execution of compiled actions
+    "actions",
+    # The `go to <room>` command
+    "travel",
+]
+
+# The strategies the explorer can use to search the game states (the first one is the
+# default)
+EXPLORATION_STRATEGIES = [
+    "bfs",
+    "dfs",
+]
+
+# The size (in bytes) of the hashed keys of the game states visited by the explorer
+EXPLORER_STATE_KEY_SIZE = 16
+
+# The default maximum number of game states the explorer visits
+EXPLORER_MAX_STATES = 100000
+
+# The maximum number of rooms for which the `go to <room>` command uses a full routing
+# table (whose size grows with the square of the number of rooms); larger worlds route
+# the player through landmark rooms instead
+FAST_TRAVEL_TABLE_MAX_ROOMS = 256
+
+# The maximum number of landmark rooms used for the routes of larger worlds
+FAST_TRAVEL_LANDMARKS = 8
+
+# The number of room files read in advance (on a background thread) while the previous
+# ones are being parsed during a build
+ROOM_FILES_READ_AHEAD = 16
+
+# The index of the rooms directory kept by the builds (relative to the project dir), and
+# the version of its format
+ROOM_INDEX_FILE = os.path.join(".paignion", "room_index.json")
+ROOM_INDEX_VERSION = 3
+
+# The coarsest modification time granularity of the supported file systems (2 seconds
+# on FAT), in nanoseconds: directories modified less than that before the last scan of
+# the rooms directory may have changed again without changing their modification time
+ROOM_INDEX_MTIME_GRANULARITY = 2_000_000_000
+
+# The extensions of the files that can be built as packed projects: documents
+# concatenating all of the rooms, and archives of the rooms directory
+PACKED_DOCUMENT_EXTENSIONS = (".md",)
+PACKED_ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# The number of rendered Markdown strings & compiled actions kept in memory, to be
+# reused by the other rooms (and games) using them
+MARKDOWN_CACHE_SIZE = 4096
+COMPILED_ACTIONS_CACHE_SIZE = 4096
+
+# The number of projects whose parsed rooms are kept in memory by the build daemon (the
+# least recently built ones are dropped first)
+DAEMON_MAX_PROJECTS = 16
+
+# The events emitted by the build, to which listeners can be added (see
+# `paignion.hooks`), along with the data they carry
+HOOK_EVENTS = {
+    # A room was parsed: `room` (its name), `size` (the length of its room file) and
+    # `duration` (in seconds)
+    "room_parsed": ("room", "size", "duration"),
+    # A Markdown string was rendered to HTML (strings found in the cache are not
+    # rendered again): `size` (the length of the Markdown string), `html_size` and
+    # `duration`
+    "markdown_rendered": ("size", "html_size", "duration"),
+    # An action was compiled (actions found in the cache are not compiled again):
+    # `action`, `size` (the length of the compiled JavaScript code) and `duration`
+    "action_compiled": ("action", "size", "duration"),
+    # The room files of a project were found, before being parsed: `count` (not
+    # emitted for packed projects, whose rooms are read as they are parsed)
+    "rooms_found": ("count",),
+    # A build started: `project`
+    "build_started": ("project",),
+    # A build finished: `project`, `size` (the total size of the built files, in bytes)
+    # and `duration`
+    "build_finished": ("project", "size", "duration"),
+    # A phase of a build (see `paignion.metrics.BuildMetrics`) started: `phase`
+    "phase_started": ("phase",),
+    # A phase of a build finished: `phase` and `duration`
+    "phase_finished": ("phase", "duration"),
+    # A built file was written: `file` (its name), `size` (in bytes) and `duration`
+    "file_written": ("file", "size", "duration"),
+}
+
+# The costs reported for every room by `paignion stats`, by which the rooms can be
+# sorted (the first one is the default), along with their column headers
+ROOM_STATS_COLUMNS = {
+    "size": "bytes",
+    "gzip_size": "gzip bytes",
+    "parse_time": "parse ms",
+    "markdown_time": "markdown ms",
+    "actions": "actions",
+    "used_with": "used_with",
+}
+
+# The configuration file of a project (optional, in the project directory)
+PROJECT_CONFIG_FILE = "paignion.yaml"
+
+# The size budgets (in bytes) that builds can be held to, set in the `budgets` section
+# of the project configuration or with the `--budget-*` options of `paignion build`
+BUDGETS = {
+    "total_gzip_size": "the total size of the built files, once gzip-compressed",
+    "room_size": "the size of the largest room in the game data (as JSON)",
+    "description_size": "the size of the largest description of a room or an item",
+    "engine_size": "the size of the engine (paignion.js)",
+}
+# The number of largest rooms listed when a budget is exceeded
+BUDGET_REPORT_TOP_ROOMS = 5
+
+# When to report the progress of builds (`auto` reports it only if the standard output
+# is a terminal; the first one is the default)
+PROGRESS_MODES = ["auto", "always", "never"]
+# The minimum time (in seconds) between two updates of the progress of a build, when
+# it is updated in place in a terminal, and when it is logged line by line
+PROGRESS_TERMINAL_INTERVAL = 0.1
+PROGRESS_LOG_INTERVAL = 5
+
+# The version of the format of the metrics files written by `--metrics-json`
+METRICS_VERSION = 1
+# The relative increase of a cost metric above which `paignion metrics compare`
+# considers it a regression
+METRICS_REGRESSION_THRESHOLD = 0.1
+# The differences of times (in seconds) too small to be compared reliably
+METRICS_TIME_RESOLUTION = 0.01
+# The number of allocation sites reported for each phase by `--profile-memory`
+MEMORY_PROFILE_TOP_SITES = 5
+
+# The formats in which the GAME_DATA object can be embedded in the game (the first one
+# is the default)
+GAME_DATA_FORMATS = [
+    "script",
+    "json-parse",
+    "literal",
+]
+
+# The id of the <script> element containing the GAME_DATA object (`script` format)
+GAME_DATA_SCRIPT_ID = "game-data"
+
+# The template of the <script> element containing the GAME_DATA object
+GAME_DATA_SCRIPT_TEMPLATE = """\
+<script type="application/json" id="{id}">
+{data}
+</script>
+"""
+
+
 # The HTML game file template
 INDEX_HTML_TEMPLATE = """\
 <!DOCTYPE html>
@@ -35,13 +188,56 @@ INDEX_HTML_TEMPLATE = """\
 <head>
 <title>paignion</title>
 <style type="text/css">
-{}
+{main_css}
 </style>
 </head>
 <body>
 <main></main>
+{game_data}<script type="text/javascript">
+{paignion_js}
+</script>
+</body>
+</html>
+"""
+
+
+# The number of hex digits of the content hashes in the file names of split builds
+SPLIT_BUILD_HASH_LENGTH = 16
+
+# The HTML game file template for split builds, where the engine, the CSS and the game
+# data are separate (content-hashed, long-term-cacheable) files. The game data is
+# fetched first, and the engine is only loaded once it is available (an error message is
+# shown instead if the game data can not be loaded).
+SPLIT_INDEX_HTML_TEMPLATE = """\
+<!DOCTYPE html>
+<html>
+<head>
+<title>paignion</title>
+<link rel="stylesheet" type="text/css" href="{main_css}">
+<link rel="preload" href="{game_data}" as="fetch" crossorigin="anonymous">
+<link rel="preload" href="{paignion_js}" as="script">
+</head>
+<body>
+<main></main>
 <script type="text/javascript">
-{}
+let GAME_DATA;
+fetch("{game_data}")
+    .then(response => {{
+        if (!response.ok) {{
+            throw new Error(`${{response.status}} ${{response.statusText}}`);
+        }}
+        return response.json();
+    }})
+    .then(data => {{
+        GAME_DATA = data;
+        let engine = document.createElement("script");
+        engine.src = "{paignion_js}";
+        document.body.append(engine);
+    }})
+    .catch(error => {{
+        document.getElementsByTagName("main")[0].textContent =
+            `The game could not be loaded: ${{error.message}}`;
+    }});
 </script>
 </body>
 </html>
@@ -0,0 +1,964 @@
+import functools
+import json
+import re
+
+from paignion.action_compiler import ActionCompiler
+from paignion.builder import detect_engine_features
+from paignion.definitions import COMPILED_ACTIONS_CACHE_SIZE, DIRECTIONS
+from paignion.exceptions import PaignionEngineException
+
+# Words that are ignored when parsing the player's input
+STOP_WORDS = frozenset(
+    ["to", "the", "towards", "on", "at", "out", "around", "with", "into", "in"]
+)
+
+# The answer to the `help` command, per engine feature (None for the basic commands)
+HELP_LINES = [
+    (None, "go (north|east|south|west|up|down): move towards a given direction"),
+    ("travel", "go to &lt;room&gt;: go back to a room you have already been to"),
+    (
+        None,
+        "take &lt;item&gt;: take a given item in the room and add it to your inventory",
+    ),
+    (
+        None,
+        "look (around room|at inventory|at &lt;item&gt;): look around the room, at "
+        "your inventory or at a specific item",
+    ),
+    (
+        "used_with",
+        "use &lt;item&gt; with &lt;other&gt;item>: use an item from your inventory "
+        "with another item (from your inventory or the room)",
+    ),
+    (None, "inventory: look at your inventory"),
+    (None, "examine &lt;item&gt;: examine an item from your inventory"),
+    (None, "help: display this message"),
+]
+
+HTML_TAG_REGEX = re.compile(r"<[^>]+>")
+
+
+def p(string):
+    """Wrap a string in a paragraph, like the frontend engine does.
+
+    :param string: a string
+    :type string: str
+    :return: the string in a <p> element
+    """
+    return f"<p>{string}</p>"
+
+
+def js_string(value):
+    """Convert a value to a string the way JavaScript does.
+
+    :param value: a value from the GAME_DATA object
+    :type value: str, int, float, bool or None
+    :return: the string representation of the value in JavaScript
+    """
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def js_number(value):
+    """Convert a value to a number the way JavaScript does.
+
+    :param value: a value from the GAME_DATA object
+    :type value: str, int, float, bool or None
+    :return: the numeric value (NaN if the value is not a number)
+    """
+    if isinstance(value, (int, float)):
+        return value
+    if value is None:
+        return 0
+    try:
+        return float(value) if value.strip() else 0
+    except ValueError:
+        return float("nan")
+
+
+def js_truthy(value):
+    """Check if a value is truthy in JavaScript.
+
+    :param value: a value from the GAME_DATA object
+    :type value: str, int, float, bool or None
+    :return: True if the value is truthy, False otherwise
+    """
+    return bool(value) and value == value
+
+
+@functools.lru_cache(maxsize=COMPILED_ACTIONS_CACHE_SIZE)
+def decompile_cached_actions(compiled_actions):
+    """Decompile actions, reusing the result if they were already decompiled.
+
+    The actions are decompiled by `ActionCompiler.decompile_actions()`.
+
+    The cache is shared by all the engines of the process, and bounded so that engines
+    kept alive across many games do not pile up the actions of all of them.
+
+    :param compiled_actions: JavaScript code produced by the ActionCompiler
+    :type compiled_actions: str
+    :return: a tuple of (action, element, key, value) tuples
+    """
+    return tuple(ActionCompiler().decompile_actions(compiled_actions))
+
+
+def dump_state_value(value):
+    """Serialize a part of the state of a game canonically (see `get_state()`).
+
+    :param value: a value from the GAME_DATA object or the inventory
+    :type value: dict, list, str, int, float, bool or None
+    :return: the value, serialized to compact JSON with sorted keys
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def js_number_result(value):
+    """Normalize the result of an arithmetic operation (`3.0` is `3` in JavaScript).
+
+    :param value: an arithmetic result
+    :type value: int or float
+    :return: the result, as an int if it is integral
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def apply_operator(action, current_value, value):
+    """Apply the operator of an action to a value.
+
+    :param action: the name of the action (`set`, `add`, `sub`, `mul` or `div`)
+    :type action: str
+    :param current_value: the current value of the key the action applies to
+    :type current_value: str, int, float, bool or None
+    :param value: the value given to the action
+    :type value: str or int
+    :return: the new value of the key
+    """
+    if action == "set":
+        return value
+    if action == "add":
+        if isinstance(current_value, str) or isinstance(value, str):
+            return js_string(current_value) + js_string(value)
+        return js_number_result(js_number(current_value) + value)
+
+    current_value = js_number(current_value)
+    if action == "sub":
+        return js_number_result(current_value - value)
+    if action == "mul":
+        return js_number_result(current_value * value)
+    return js_number_result(current_value / value)
+
+
+def html_to_text(html):
+    """Strip the HTML tags off of a piece of feedback or a description.
+
+    :param html: an HTML string
+    :type html: str
+    :return: the text of the HTML string
+    """
+    text = " ".join(HTML_TAG_REGEX.sub(" ", html or "").split())
+    return text.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+
+
+class PaignionEngine(object):
+    """Play a Paignion game without a browser.
+
+    This class is a Python port of the runtime of the frontend engine (paignion.js):
+    it parses the player's commands and applies them to the game state in the exact
+    same way, except that actions are executed natively instead of being evaluated as
+    JavaScript code. This makes it possible to run scripted playthroughs of a game
+    very quickly, for example to check that it can still be completed.
+    """
+
+    def __init__(self, game_data, origin="origin", features=None):
+        """Construct a new instance of PaignionEngine.
+
+        :param game_data: the GAME_DATA object (it is copied, not modified)
+        :type game_data: dict
+        :param origin: the name of the room the player starts in
+        :type origin: str
+        :param features: the engine features to enable (see ENGINE_FEATURES); by
+            default, only the features used by the game are enabled, just like in a
+            built game
+        :type features: set
+        :return: an instance of PaignionEngine
+        """
+        self.features = (
+            detect_engine_features(game_data) if features is None else set(features)
+        )
+        # The initial data of the rooms, kept to restore the rooms and to tell what
+        # changed in them (see `get_state()`)
+        self.initial_rooms = {
+            room_name: json.dumps(room) for room_name, room in game_data.items()
+        }
+        self.game_data = {
+            room_name: json.loads(room)
+            for room_name, room in self.initial_rooms.items()
+        }
+        # The changes made to the rooms as of the last `set_state()`, and the rooms
+        # that commands may have changed since then
+        self.room_changes = {}
+        self.changed_rooms = set()
+        self.current_room_name = origin
+        self.current_room = self.game_data[origin]
+        self.inventory = []
+        self.visited_rooms = {origin}
+        self.description = self.current_room["description"]
+        self.feedback = ""
+        # The names of the rooms by route ID (see `find_route()`), built on the first
+        # `go to <room>` command
+        self.room_names_by_route_id = None
+
+    def run(self, command):
+        """Run a command, as if the player typed it.
+
+        :param command: the command
+        :type command: str
+        :return: the feedback of the engine (an HTML string)
+        """
+        parsed_sentence = self.parse_user_input(command)
+
+        if parsed_sentence.get("sentence") == "invalid":
+            if parsed_sentence["reason"] == "incomplete":
+                self.set_action_feedback(p(parsed_sentence["response"]))
+            else:
+                self.set_action_feedback(
+                    p("I don't understand that.")
+                    + p("If you're really lost, type 'help'.")
+                )
+        else:
+            action = parsed_sentence["action"]
+            if action == "go":
+                self.handle_go_action(parsed_sentence)
+            elif action == "take":
+                self.handle_take_action(parsed_sentence)
+            elif action == "look":
+                self.handle_look_action(parsed_sentence)
+            elif action == "use":
+                self.handle_use_action(parsed_sentence)
+            elif action in ("inventory", "examine"):
+                self.handle_inventory_action(parsed_sentence)
+            elif action == "help":
+                self.help()
+
+        return self.feedback
+
+    def run_script(self, commands):
+        """Run a list of commands.
+
+        :param commands: the commands
+        :type commands: list
+        :return: the list of the feedback of the engine for each command
+        """
+        return [self.run(command) for command in commands]
+
+    def run_walkthrough(self, lines):
+        """Run a walkthrough script and check its expectations.
+
+        Each line of a walkthrough is either:
+        - empty, or a comment starting with `#`;
+        - an expectation on the feedback of the last command, starting with `?` and
+          followed by a piece of text that the feedback must contain (HTML tags are
+          ignored);
+        - an expectation on the current room, starting with `@` and followed by the
+          name of the room the player must be in;
+        - a command.
+
+        :param lines: the lines of the walkthrough
+        :type lines: list
+        :return: a tuple (int, list) containing the number of commands that were run and
+            a list of (line number, message) tuples describing the failed expectations
+        """
+        command_count = 0
+        failures = []
+
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith("?"):
+                expected_text = line[1:].strip()
+                if expected_text not in html_to_text(self.feedback):
+                    failures.append(
+                        (
+                            line_number,
+                            f"Expected `{expected_text}` in feedback, got "
+                            f"`{html_to_text(self.feedback)}`",
+                        )
+                    )
+            elif line.startswith("@"):
+                expected_room = line[1:].strip()
+                if expected_room != self.current_room_name:
+                    failures.append(
+                        (
+                            line_number,
+                            f"Expected to be in room `{expected_room}`, but in room "
+                            f"`{self.current_room_name}`",
+                        )
+                    )
+            else:
+                try:
+                    self.run(line)
+                except PaignionEngineException as e:
+                    failures.append((line_number, str(e)))
+                command_count += 1
+
+        return command_count, failures
+
+    def get_state(self):
+        """Describe the state of the game (current room, inventory & game data).
+
+        The game data is described by its changes only: the fields of the rooms that
+        differ from their initial data (because of actions or consumed items). Only
+        the rooms changed since the last `set_state()` are compared to their initial
+        data, so the cost of a state does not grow with the size of the game.
+
+        The description is canonical: two identical game states are always described
+        by equal tuples.
+
+        :return: the state of the game, as a (current room name, inventory, changes)
+            tuple, where the inventory is serialized to JSON and the changes are a
+            sorted tuple of (room name, field, JSON-serialized value) tuples
+        """
+        for room_name in self.changed_rooms:
+            room = self.game_data[room_name]
+            initial_room = json.loads(self.initial_rooms[room_name])
+            changes = {}
+            for key in set(room) | set(initial_room):
+                value = dump_state_value(room.get(key))
+                if value != dump_state_value(initial_room.get(key)):
+                    changes[key] = value
+            if changes:
+                self.room_changes[room_name] = changes
+            else:
+                self.room_changes.pop(room_name, None)
+        self.changed_rooms.clear()
+
+        return (
+            self.current_room_name,
+            dump_state_value(self.inventory),
+            tuple(
+                sorted(
+                    (room_name, key, value)
+                    for room_name, changes in self.room_changes.items()
+                    for key, value in changes.items()
+                )
+            ),
+        )
+
+    def set_state(self, state):
+        """Restore a state of the game returned by `get_state()`.
+
+        Only the rooms changed in the current state or in the restored one are
+        restored.
+
+        :param state: the state of the game
+        :type state: tuple
+        """
+        current_room_name, inventory, changes = state
+
+        # Undo the changes of the current state
+        for room_name in self.changed_rooms | set(self.room_changes):
+            self.game_data[room_name] = json.loads(self.initial_rooms[room_name])
+        self.changed_rooms.clear()
+        self.room_changes = {}
+
+        # Apply the changes of the restored state
+        for room_name, key, value in changes:
+            self.game_data[room_name][key] = json.loads(value)
+            self.room_changes.setdefault(room_name, {})[key] = value
+
+        self.inventory = json.loads(inventory)
+        self.current_room_name = current_room_name
+        self.current_room = self.game_data[self.current_room_name]
+        self.set_room_description(self.current_room["description"])
+        self.feedback = ""
+
+    def parse_user_input(self, sentence):
+        """Parse a command into an action (see `Parser.parseUserInput()`).
+
+        :param sentence: the command
+        :type sentence: str
+        :return: a dict describing the parsed command
+        """
+        action, subject, object = self.get_input_tokens(sentence)
+
+        if not action:
+            return {"sentence": "invalid", "reason": "no_action"}
+
+        capitalized_action = action[0].upper() + action[1:]
+
+        if action in ("go", "move", "walk", "run"):
+            if not subject:
+                return {
+                    "sentence": "invalid",
+                    "reason": "incomplete",
+                    "response": f"{capitalized_action} where?",
+                }
+            return {"sentence": "valid", "action": "go", "direction": subject}
+
+        if action in ("take", "pick", "get"):
+            if not subject:
+                return {
+                    "sentence": "invalid",
+                    "reason": "incomplete",
+                    "response": f"{capitalized_action} what?",
+                }
+            return {"action": "take", "subject": subject}
+
+        if action in ("look", "check"):
+            if not subject:
+                return {
+                    "sentence": "invalid",
+                    "reason": "incomplete",
+                    "response": capitalized_action
+                    + (" at what?" if action == "look" else " out what?"),
+                }
+            return {"action": "look", "subject": subject}
+
+        if (
+            action in ("use", "combine", "insert", "put")
+            and "used_with" in self.features
+        ):
+            if not subject or not object:
+                middle_word = " on "
+                if action == "combine":
+                    middle_word = " with "
+                if action == "insert":
+                    middle_word = " into "
+                return {
+                    "sentence": "invalid",
+                    "reason": "incomplete",
+                    "response": f"{capitalized_action} {subject or 'what'}"
+                    f"{middle_word}{object or 'what'}?",
+                }
+            return {"action": "use", "subject": subject, "object": object}
+
+        if action == "inventory":
+            return {"action": "inventory"}
+
+        if action == "examine":
+            if not subject:
+                return {
+                    "sentence": "invalid",
+                    "reason": "incomplete",
+                    "response": "Examine what?",
+                }
+            return {"action": "examine", "subject": subject}
+
+        if action == "help":
+            return {"action": "help"}
+
+        return {"sentence": "invalid", "reason": "unknown_action"}
+
+    def get_input_tokens(self, sentence):
+        """Split a command into its action, subject & object (see `getInputTokens()`).
+
+        :param sentence: the command
+        :type sentence: str
+        :return: a tuple (action, subject, object), whose elements may be None
+        """
+        words = [w for w in sentence.split(" ") if w]
+        if not words:
+            return None, None, None
+
+        length = len(words)
+        i = 1
+
+        # Skip any stop words
+        while i < length and words[i] in STOP_WORDS:
+            i += 1
+        # All the following words contain the subject
+        start = i
+        while i < length and words[i] not in STOP_WORDS:
+            i += 1
+        subject = " ".join(words[start:i]) or None
+
+        # There may be more stop words
+        while i < length and words[i] in STOP_WORDS:
+            i += 1
+        # All the following words contain the object
+        start = i
+        while i < length and words[i] not in STOP_WORDS:
+            i += 1
+        object = " ".join(words[start:i]) or None
+
+        return words[0], subject, object
+
+    def set_action_feedback(self, feedback):
+        self.feedback = feedback if feedback is not None else ""
+
+    def set_room_description(self, description):
+        self.description = description if description is not None else ""
+
+    def get_item_from_room(self, type, item_name, room=None):
+        room = self.current_room if room is None else room
+        for item in room["items"][type]:
+            if item["name"] == item_name:
+                return item
+        return None
+
+    def get_item_from_inventory(self, item_name):
+        for item in self.inventory:
+            if item["name"] == item_name:
+                return item
+        return None
+
+    def get_room_or_item(self, element):
+        """Find the room or item an action applies to (see `getRoomOrItem()`).
+
+        :param element: the name of a room or item
+        :type element: str
+        :return: the name of the room the data belongs to (None for the items of the
+            inventory), and the data of the room or item
+        """
+        result = self.game_data.get(element)
+        if result:
+            return element, result
+        result = self.get_item_from_inventory(element)
+        if result:
+            return None, result
+        result = self.get_item_from_room("intangible", element)
+        if result:
+            return self.current_room_name, result
+
+        # Intangible items of the other rooms
+        for room_name, room in self.game_data.items():
+            if room_name != self.current_room_name:
+                result = self.get_item_from_room("intangible", element, room)
+                if result:
+                    return room_name, result
+        raise PaignionEngineException(
+            f"No room or item `{element}` found for action in room "
+            f"`{self.current_room_name}`"
+        )
+
+    def can_approximate_item_name(self, item_list, item_name):
+        if "items" not in self.features:
+            return None
+        approximate_items = [
+            i["name"]
+            for i in item_list
+            if i["name"] in item_name or item_name in i["name"]
+        ]
+        return "/".join(approximate_items) or None
+
+    def starts_with_vowel_sound(self, string):
+        letter = string[0]
+
+        if letter in "aeiou":
+            return True
+        # String is an acronym
+        if string == string.upper() and letter in "AEHILMNORSX":
+            return True
+
+        return False
+
+    def handle_go_action(self, parsed_sentence):
+        direction = parsed_sentence["direction"]
+
+        if (
+            "travel" in self.features
+            and direction not in DIRECTIONS
+            and self.game_data.get(direction)
+        ):
+            self.handle_travel_action(direction)
+            return
+
+        next_room_name = self.current_room.get(direction)
+
+        if js_truthy(next_room_name):
+            if not isinstance(next_room_name, str) or (
+                next_room_name not in self.game_data
+            ):
+                raise PaignionEngineException(
+                    f"Room `{self.current_room_name}` leads to nonexistent room "
+                    f"`{next_room_name}` ({direction})"
+                )
+            self.current_room_name = next_room_name
+            self.current_room = self.game_data[next_room_name]
+            self.visited_rooms.add(next_room_name)
+            self.set_room_description(self.current_room["description"])
+            self.set_action_feedback(p(""))
+        else:
+            self.set_action_feedback(p(f"You cannot go {direction}."))
+
+    def handle_travel_action(self, room_name):
+        if room_name not in self.visited_rooms:
+            self.set_action_feedback(p("You haven't been there yet."))
+            return
+
+        if room_name == self.current_room_name:
+            self.set_action_feedback(p("You are already there."))
+            return
+
+        route = self.find_route(room_name)
+        if route is None:
+            self.set_action_feedback(p("You don't know how to get there from here."))
+            return
+
+        # Go through all the rooms on the way
+        for direction in route:
+            self.current_room_name = self.current_room[direction]
+            self.current_room = self.game_data[self.current_room_name]
+            self.visited_rooms.add(self.current_room_name)
+        self.set_room_description(self.current_room["description"])
+        self.set_action_feedback(p(f"You go {', then '.join(route)}."))
+
+    def find_route(self, target_name):
+        """Find the directions leading to a room with the routing table (see
+        `findRoute()` and `compute_routes()`).
+
+        :param target_name: the name of the room to go to
+        :type target_name: str
+        :return: the list of the directions to follow, or None if there is no route
+        """
+        target = self.game_data[target_name]
+        if self.room_names_by_route_id is None:
+            self.room_names_by_route_id = {
+                room["route_id"]: room_name
+                for room_name, room in self.game_data.items()
+            }
+        room_names_by_route_id = self.room_names_by_route_id
+        max_length = len(room_names_by_route_id)
+
+        def follow(room_name, directions, direction):
+            next_room_name = self.game_data[room_name].get(direction)
+            if next_room_name not in self.game_data or len(directions) >= max_length:
+                return None
+            directions.append(direction)
+            return next_room_name
+
+        def direction_of(hops, index):
+            hop = hops[index]
+            return DIRECTIONS[int(hop)] if hop.isdigit() else None
+
+        # Small worlds
+        if "next_hops" in self.current_room:
+            room_name = self.current_room_name
+            directions = []
+            while room_name != target_name:
+                room_name = follow(
+                    room_name,
+                    directions,
+                    direction_of(
+                        self.game_data[room_name]["next_hops"], target["route_id"]
+                    ),
+                )
+                if room_name is None:
+                    return None
+            return directions
+
+        # Larger worlds
+        landmark_count = len(self.current_room["landmark_hops"])
+        for i in range(landmark_count):
+            landmark = (target["home_landmark"] + i) % landmark_count
+            room_name = self.current_room_name
+            directions = []
+
+            while (
+                room_name is not None
+                and room_name != target_name
+                and self.game_data[room_name]["landmark_hops"][landmark] != "*"
+            ):
+                room_name = follow(
+                    room_name,
+                    directions,
+                    direction_of(self.game_data[room_name]["landmark_hops"], landmark),
+                )
+            if room_name == target_name:
+                return directions
+            if room_name is None:
+                continue
+
+            # Go back up the path from the target room to the landmark
+            path = []
+            route_id = target["route_id"]
+            parent_id = target["landmark_parents"][landmark]
+            while parent_id != route_id and parent_id >= 0 and len(path) < max_length:
+                path.append(room_names_by_route_id[route_id])
+                route_id = parent_id
+                parent_id = self.game_data[room_names_by_route_id[route_id]][
+                    "landmark_parents"
+                ][landmark]
+            if parent_id != route_id:
+                continue
+
+            for next_room_name in reversed(path):
+                room = self.game_data[room_name]
+                direction = next(
+                    (d for d in DIRECTIONS if room.get(d) == next_room_name), None
+                )
+                room_name = direction and follow(room_name, directions, direction)
+                if room_name is None:
+                    break
+            else:
+                return directions
+
+        return None
+
+    def handle_take_action(self, parsed_sentence):
+        item_name = parsed_sentence["subject"]
+        item = self.get_item_from_room("tangible", item_name)
+
+        if item:
+            amount = item["amount"]
+            if amount == "inf" or js_number(amount) > 0:
+                inventory_item = self.get_item_from_inventory(item["name"])
+                if inventory_item:
+                    # Item already in inventory, increase its amount
+                    inventory_item["amount"] = js_number(inventory_item["amount"]) + 1
+                else:
+                    # Copy item in inventory
+                    inventory_item = dict(
+                        item, used_with=[dict(u) for u in item["used_with"]], amount=1
+                    )
+                    self.inventory.append(inventory_item)
+
+                # Decrease number of items
+                self.changed_rooms.add(self.current_room_name)
+                if amount != "inf":
+                    item["amount"] = js_number_result(js_number(amount) - 1)
+                if item["amount"] == 0:
+                    # Remove item from room
+                    self.current_room["items"]["tangible"] = [
+                        i
+                        for i in self.current_room["items"]["tangible"]
+                        if i is not item
+                    ]
+
+                appropriate_word = "the"
+                if item["amount"] == "inf" or js_number(item["amount"]) > 0:
+                    appropriate_word = (
+                        "an" if self.starts_with_vowel_sound(item["name"]) else "a"
+                    )
+                self.set_action_feedback(
+                    p(f"You've taken {appropriate_word} {item['name']}.")
+                )
+            else:
+                self.set_action_feedback(
+                    p(f"There are no more {item['name']}s in this room you can take.")
+                )
+        elif self.get_item_from_room("intangible", item_name):
+            self.set_action_feedback(p("You cannot take that."))
+        else:
+            self.set_action_feedback(p(f"There aren't any {item_name}s in this room."))
+
+            all_items = (
+                self.current_room["items"]["tangible"]
+                + self.current_room["items"]["intangible"]
+            )
+            approximation = self.can_approximate_item_name(all_items, item_name)
+            if approximation:
+                self.set_action_feedback(
+                    p(f'Did you mean to say "take {approximation}"?')
+                )
+
+    def format_item(self, item):
+        if item["amount"] == 1:
+            res = f"1 {item['name']}"
+        else:
+            res = f"{js_string(item['amount'])} {item['name']}s"
+        if js_truthy(item["effect"]):
+            res += f" ({js_string(item['effect'])})"
+        return res
+
+    def handle_look_action(self, parsed_sentence):
+        item_name = parsed_sentence["subject"]
+
+        if item_name == "inventory":
+            self.handle_inventory_action({"action": "inventory"})
+            return
+
+        all_items = (
+            self.current_room["items"]["tangible"]
+            + self.current_room["items"]["intangible"]
+        )
+
+        if item_name == "room":
+            # List visible items in the room
+            item_names = []
+            for item in all_items:
+                if not js_truthy(item["visible"]):
+                    continue
+                if item["amount"] == "inf":
+                    res = f"a lot of {item['name']}s"
+                    if js_truthy(item["effect"]):
+                        res += f" ({js_string(item['effect'])})"
+                    item_names.append(res)
+                else:
+                    item_names.append(self.format_item(item))
+
+            if item_names:
+                item_string = ", ".join(item_names)
+                item_string = item_string[0].upper() + item_string[1:] + "."
+                self.set_action_feedback(
+                    p("You can see the following items in the room:") + p(item_string)
+                )
+            else:
+                self.set_action_feedback(
+                    p("There are no items you can interact with in this room.")
+                )
+            return
+
+        room_item = self.get_item_from_room("tangible", item_name)
+        if not room_item:
+            room_item = self.get_item_from_room("intangible", item_name)
+
+        if not room_item:
+            self.set_action_feedback(p(f"There are no {item_name}s in this room."))
+
+            approximation = self.can_approximate_item_name(all_items, item_name)
+            if approximation:
+                self.set_action_feedback(
+                    p(f'Did you mean to say "look at {approximation}"?')
+                )
+        else:
+            self.set_action_feedback(room_item["description"])
+
+    def is_x_used_with_y(self, x, y):
+        for used_with_item in y["used_with"]:
+            if used_with_item["name"] == x["name"]:
+                return used_with_item
+        return None
+
+    def handle_use_action(self, parsed_sentence):
+        subject_name = parsed_sentence["subject"]
+        object_name = parsed_sentence["object"]
+
+        subject = self.get_item_from_inventory(subject_name)
+        if not subject and self.get_item_from_room("tangible", subject_name):
+            self.set_action_feedback(
+                p("You have to take that first in order to use it.")
+            )
+            return
+
+        if not subject:
+            self.set_action_feedback(p("You don't have such an item."))
+            return
+
+        object = self.get_item_from_inventory(object_name)
+        if not object and self.get_item_from_room("tangible", object_name):
+            self.set_action_feedback(
+                p("You have to take that first in order to use items with/on it.")
+            )
+            return
+
+        if not self.get_item_from_room(
+            "tangible", object_name
+        ) and not self.get_item_from_room("intangible", object_name):
+            self.set_action_feedback(p("There is no such thing in this room."))
+            return
+
+        # Object is either in inventory or in the room
+        object_comes_from_inventory = True
+        if not object:
+            object = self.get_item_from_room("intangible", object_name)
+            object_comes_from_inventory = False
+
+        use_actions = self.is_x_used_with_y(subject, object)
+        if not use_actions:
+            use_actions = self.is_x_used_with_y(object, subject)
+
+        if not use_actions:
+            self.set_action_feedback(p("You cannot use these items together."))
+            return
+
+        # Items can now be used together!
+        if use_actions["actions"] and "actions" in self.features:
+            self.apply_actions(use_actions["actions"])
+
+        self.set_action_feedback(use_actions["effect_message"])
+        # Just in case the current room description was just updated, update it too
+        self.set_room_description(self.current_room["description"])
+
+        if use_actions["consumes_subject"]:
+            if subject["amount"] != "inf":
+                subject["amount"] = js_number_result(js_number(subject["amount"]) - 1)
+            if subject["amount"] == 0:
+                self.inventory = [i for i in self.inventory if i is not subject]
+
+        if use_actions["consumes_object"]:
+            if not object_comes_from_inventory:
+                self.changed_rooms.add(self.current_room_name)
+            if object["amount"] != "inf":
+                object["amount"] = js_number_result(js_number(object["amount"]) - 1)
+            if object["amount"] == 0:
+                if object_comes_from_inventory:
+                    self.inventory = [i for i in self.inventory if i is not object]
+                else:
+                    self.current_room["items"]["intangible"] = [
+                        i
+                        for i in self.current_room["items"]["intangible"]
+                        if i is not object
+                    ]
+
+    def apply_actions(self, compiled_actions):
+        """Execute compiled actions natively.
+
+        :param compiled_actions: JavaScript code produced by the ActionCompiler
+        :type compiled_actions: str
+        """
+        for action, element, key, value in decompile_cached_actions(compiled_actions):
+            room_name, target = self.get_room_or_item(element)
+            target[key] = apply_operator(action, target.get(key), value)
+            if room_name is not None:
+                self.changed_rooms.add(room_name)
+
+    def handle_inventory_action(self, parsed_sentence):
+        # Examine specific inventory item
+        if parsed_sentence["action"] == "examine":
+            item_name = parsed_sentence["subject"]
+            item = self.get_item_from_inventory(item_name)
+
+            if not item:
+                self.set_action_feedback(p("There is no such item in your inventory."))
+
+                approximation = self.can_approximate_item_name(
+                    self.inventory, item_name
+                )
+                if approximation:
+                    self.set_action_feedback(
+                        p(f'Did you mean to say "examine {approximation}"?')
+                    )
+            else:
+                description = js_string(item["description"])
+                if js_truthy(item["effect"]):
+                    description += p(f"Effect: {js_string(item['effect'])}")
+                self.set_action_feedback(description)
+
+        # Simply list inventory items
+        elif self.inventory:
+            item_string = ", ".join(self.format_item(i) for i in self.inventory) + "."
+            item_string = item_string[0].upper() + item_string[1:]
+
+            self.set_action_feedback(
+                p("You have the following items in your inventory:")
+                + p(item_string)
+                + p(
+                    "You can get more information on an item by saying "
+                    '"examine &lt;item name&gt;".'
+                )
+            )
+        else:
+            self.set_action_feedback(p("Your inventory is empty."))
+
+    def help(self):
+        self.set_action_feedback(
+            p("I see you're kinda lost. Here is a list of the things you can say:")
+            + "".join(
+                p(line)
+                for feature, line in HELP_LINES
+                if feature is None or feature in self.features
+            )
+        )
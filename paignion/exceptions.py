@@ -20,3 +20,7 @@ class PaignionUsedWithItemException(PaignionException):
 
 class PaignionActionCompilerException(PaignionException):
     pass
+
+
+class PaignionEngineException(PaignionException):
+    pass
@@ -0,0 +1,432 @@
+import hashlib
+import json
+import multiprocessing
+from array import array
+
+from paignion.definitions import (
+    DIRECTIONS,
+    EXPLORATION_STRATEGIES,
+    EXPLORER_STATE_KEY_SIZE,
+    EXPLORER_MAX_STATES,
+)
+from paignion.engine import PaignionEngine, js_number, js_truthy
+from paignion.exceptions import PaignionException, PaignionEngineException
+
+# The engine used by the worker processes of a parallel exploration
+worker_engine = None
+
+
+def state_key(state):
+    """Compute the compact key of a game state.
+
+    :param state: a game state, as returned by `PaignionEngine.get_state()`
+    :type state: tuple
+    :return: the key of the state (a short hash of the state)
+    """
+    return hashlib.blake2b(
+        json.dumps(state, separators=(",", ":")).encode("utf-8"),
+        digest_size=EXPLORER_STATE_KEY_SIZE,
+    ).digest()
+
+
+def iter_interactions(game_data):
+    """Iterate over all the `used_with` interactions defined in a game.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :return: a generator of (item name, used_with item name) tuples
+    """
+    for room in game_data.values():
+        for item_type in ("tangible", "intangible"):
+            for item in room["items"][item_type]:
+                for used_with_item in item["used_with"]:
+                    yield item["name"], used_with_item["name"]
+
+
+def iter_possible_commands(engine):
+    """Iterate over the commands that can change the current game state.
+
+    Commands that never change the state (`look`, `inventory`, `help`...) and commands
+    that are bound to fail (taking an item that is not there, using two items that
+    have nothing to do with each other...) are left out. An item in infinite supply is
+    only taken if the player does not already have one.
+
+    :param engine: an engine, in the state to explore
+    :type engine: PaignionEngine
+    :return: a generator of (command, parsed command, interaction) tuples, where
+        interaction is the (item name, used_with item name) tuple of the interaction
+        triggered by a `use` command, or None
+    """
+    current_room = engine.current_room
+
+    for direction in DIRECTIONS:
+        if js_truthy(current_room.get(direction)):
+            yield f"go {direction}", {"action": "go", "direction": direction}, None
+
+    for item in current_room["items"]["tangible"]:
+        if item["amount"] == "inf":
+            if engine.get_item_from_inventory(item["name"]):
+                continue
+        elif not js_number(item["amount"]) > 0:
+            continue
+        yield f"take {item['name']}", {"action": "take", "subject": item["name"]}, None
+
+    if "used_with" not in engine.features:
+        return
+
+    subject_names = list(dict.fromkeys(item["name"] for item in engine.inventory))
+    # Tangible items have to be taken before being used, so the objects can only come
+    # from the inventory or be intangible items of the room
+    object_names = list(
+        dict.fromkeys(
+            subject_names
+            + [item["name"] for item in current_room["items"]["intangible"]]
+        )
+    )
+
+    for subject_name in subject_names:
+        subject = engine.get_item_from_inventory(subject_name)
+        for object_name in object_names:
+            object = engine.get_item_from_inventory(object_name)
+            if not object:
+                object = engine.get_item_from_room("intangible", object_name)
+
+            if engine.is_x_used_with_y(subject, object):
+                interaction = (object_name, subject_name)
+            elif engine.is_x_used_with_y(object, subject):
+                interaction = (subject_name, object_name)
+            else:
+                continue
+
+            yield f"use {subject_name} with {object_name}", {
+                "action": "use",
+                "subject": subject_name,
+                "object": object_name,
+            }, interaction
+
+
+def expand_state(engine, state):
+    """Compute the successors of a game state.
+
+    :param engine: the engine to run the commands with
+    :type engine: PaignionEngine
+    :param state: a game state, as returned by `PaignionEngine.get_state()`
+    :type state: tuple
+    :return: a tuple (list, list, list) containing the (command, interaction, room
+        name, state key, state) tuples of the successors, the items taken (as (room
+        name, item name) tuples) and the error messages of the engine
+    """
+    engine.set_state(state)
+    room_name = engine.current_room_name
+    commands = list(iter_possible_commands(engine))
+
+    successors = []
+    taken_items = []
+    errors = []
+
+    for command, parsed_command, interaction in commands:
+        action = parsed_command["action"]
+
+        if action == "go":
+            # Moving around only changes the current room, which is the first part of
+            # the state
+            next_room_name = engine.current_room.get(parsed_command["direction"])
+            if not isinstance(next_room_name, str) or (
+                next_room_name not in engine.game_data
+            ):
+                errors.append(
+                    f"Room `{room_name}` leads to nonexistent room `{next_room_name}` "
+                    f"({parsed_command['direction']})"
+                )
+                continue
+            next_state = (next_room_name,) + state[1:]
+        else:
+            engine.set_state(state)
+            try:
+                if action == "take":
+                    engine.handle_take_action(parsed_command)
+                    taken_items.append((room_name, parsed_command["subject"]))
+                else:
+                    engine.handle_use_action(parsed_command)
+            except PaignionEngineException as e:
+                errors.append(str(e))
+                continue
+            next_room_name = engine.current_room_name
+            next_state = engine.get_state()
+
+        if next_state != state:
+            successors.append(
+                (
+                    command,
+                    interaction,
+                    next_room_name,
+                    state_key(next_state),
+                    next_state,
+                )
+            )
+
+    return successors, taken_items, errors
+
+
+def init_worker(game_data, origin, features):
+    """Initialize the engine of a worker process of a parallel exploration."""
+    global worker_engine
+    worker_engine = PaignionEngine(game_data, origin=origin, features=features)
+
+
+def expand_state_in_worker(state):
+    """Compute the successors of a game state in a worker process."""
+    return expand_state(worker_engine, state)
+
+
+class PaignionExplorer(object):
+    """Explore all the states a Paignion game can be in.
+
+    Starting from the initial state, the explorer runs every command that can change
+    the game state (moving, taking items and using them together) in every state it
+    finds. A game state is made of the current room, the inventory and the changes
+    that actions and consumed items made to the game data (see
+    `PaignionEngine.get_state()`). Visited states are only kept as short hashes, and
+    their number is bounded, so that large worlds can be explored in a bounded amount
+    of memory.
+    """
+
+    def __init__(
+        self,
+        game_data,
+        origin="origin",
+        features=None,
+        strategy=EXPLORATION_STRATEGIES[0],
+        max_states=EXPLORER_MAX_STATES,
+        jobs=1,
+    ):
+        """Construct a new instance of PaignionExplorer.
+
+        :param game_data: the GAME_DATA object (it is not modified)
+        :type game_data: dict
+        :param origin: the name of the room the player starts in
+        :type origin: str
+        :param features: the engine features to enable (see PaignionEngine)
+        :type features: set
+        :param strategy: the search strategy, breadth-first (`bfs`) or depth-first
+            (`dfs`)
+        :type strategy: str
+        :param max_states: the maximum number of states to visit
+        :type max_states: int
+        :param jobs: the number of processes expanding the states in parallel (only
+            for breadth-first searches)
+        :type jobs: int
+        :return: an instance of PaignionExplorer
+        """
+        if strategy not in EXPLORATION_STRATEGIES:
+            raise PaignionException(f"Unknown exploration strategy `{strategy}`")
+        if jobs > 1 and strategy != "bfs":
+            raise PaignionException(
+                "Parallel explorations are only supported for breadth-first searches"
+            )
+
+        self.game_data = game_data
+        self.origin = origin
+        self.engine = PaignionEngine(game_data, origin=origin, features=features)
+        self.strategy = strategy
+        self.max_states = max_states
+        self.jobs = jobs
+
+    def explore(self, goal=None):
+        """Explore the states of the game.
+
+        :param goal: the name of the room the player must be able to reach to complete
+            the game (optional)
+        :type goal: str
+        :return: a dictionary containing the results of the exploration
+        """
+        if goal is not None and goal not in self.game_data:
+            raise PaignionException(f"Unknown goal room `{goal}`")
+
+        initial_state = self.engine.get_state()
+
+        # The visited states are numbered in the order they are found; for each of them,
+        # the number of the state it was found from & the command leading to it are kept
+        # in order to rebuild the shortest known path to the state
+        state_ids = {state_key(initial_state): 0}
+        parents = array("l", [-1])
+        depths = array("l", [0])
+        commands = [None]
+        goal_states = {0} if self.origin == goal else set()
+        # The goal state found with the shortest path (the first one found in a
+        # breadth-first search)
+        goal_state_id = 0 if goal_states else None
+        # Transitions between the expanded states
+        transitions_from = array("l")
+        transitions_to = array("l")
+        expanded = bytearray(1)
+
+        visited_rooms = {self.origin}
+        taken_items = set()
+        fired_interactions = set()
+        errors = set()
+        truncated = False
+
+        pending_states = [(0, initial_state)]
+        pool = (
+            multiprocessing.Pool(
+                self.jobs,
+                initializer=init_worker,
+                initargs=(self.game_data, self.origin, self.engine.features),
+            )
+            if self.jobs > 1
+            else None
+        )
+
+        try:
+            while pending_states:
+                if self.strategy == "bfs":
+                    # Expand the states one level at a time
+                    level = pending_states
+                    pending_states = []
+                else:
+                    level = [pending_states.pop()]
+
+                if pool:
+                    results = pool.imap(
+                        expand_state_in_worker,
+                        [state for _, state in level],
+                        chunksize=max(1, len(level) // (self.jobs * 4)),
+                    )
+                else:
+                    results = (expand_state(self.engine, state) for _, state in level)
+
+                for (state_id, _), (successors, taken, expand_errors) in zip(
+                    level, results
+                ):
+                    expanded[state_id] = 1
+                    taken_items.update(taken)
+                    errors.update(expand_errors)
+
+                    for command, interaction, room_name, key, state in successors:
+                        if interaction:
+                            fired_interactions.add(interaction)
+                        visited_rooms.add(room_name)
+
+                        next_state_id = state_ids.get(key)
+                        if next_state_id is None:
+                            if len(state_ids) >= self.max_states:
+                                # The state was not fully expanded after all
+                                expanded[state_id] = 0
+                                truncated = True
+                                continue
+                            next_state_id = len(state_ids)
+                            state_ids[key] = next_state_id
+                            parents.append(state_id)
+                            depths.append(depths[state_id] + 1)
+                            commands.append(command)
+                            expanded.append(0)
+                            if room_name == goal:
+                                goal_states.add(next_state_id)
+                                if (
+                                    goal_state_id is None
+                                    or depths[next_state_id] < depths[goal_state_id]
+                                ):
+                                    goal_state_id = next_state_id
+                            pending_states.append((next_state_id, state))
+
+                        transitions_from.append(state_id)
+                        transitions_to.append(next_state_id)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        dead_ends = self.find_dead_ends(
+            expanded, transitions_from, transitions_to, goal, goal_states
+        )
+
+        def path_to(state_id):
+            path = []
+            while state_id > 0:
+                path.append(commands[state_id])
+                state_id = parents[state_id]
+            return path[::-1]
+
+        all_items = set()
+        for room_name, room in self.game_data.items():
+            for item_type in ("tangible", "intangible"):
+                for item in room["items"][item_type]:
+                    all_items.add((room_name, item["name"], item_type))
+
+        return {
+            "states": len(state_ids),
+            "transitions": len(transitions_from),
+            "truncated": truncated,
+            "unreachable_rooms": sorted(set(self.game_data) - visited_rooms),
+            "unreachable_items": sorted(
+                (room_name, item_name)
+                for room_name, item_name, item_type in all_items
+                if room_name not in visited_rooms
+                or (
+                    item_type == "tangible"
+                    and (room_name, item_name) not in taken_items
+                )
+            ),
+            "unused_interactions": sorted(
+                set(iter_interactions(self.game_data)) - fired_interactions
+            ),
+            "dead_ends": [path_to(state_id) for state_id in dead_ends],
+            "goal_path": (
+                path_to(goal_state_id) if goal_state_id is not None else None
+            ),
+            "errors": sorted(errors),
+        }
+
+    def find_dead_ends(
+        self, expanded, transitions_from, transitions_to, goal, goal_states
+    ):
+        """Find the dead ends among the explored game states.
+
+        When there is a goal, dead ends are the states from which it can not be
+        reached anymore; otherwise, they are the states in which no command changes
+        anything.
+
+        :param expanded: for each state, 1 if it was expanded, 0 otherwise
+        :type expanded: bytearray
+        :param transitions_from: the origin state of each transition
+        :type transitions_from: array
+        :param transitions_to: the target state of each transition
+        :type transitions_to: array
+        :param goal: the name of the goal room (or None)
+        :type goal: str
+        :param goal_states: the states in which the player is in the goal room
+        :type goal_states: set
+        :return: the sorted list of the dead end states
+        """
+        if goal is None:
+            has_successors = bytearray(len(expanded))
+            for state_id in transitions_from:
+                has_successors[state_id] = 1
+            return [
+                state_id
+                for state_id in range(len(expanded))
+                if expanded[state_id] and not has_successors[state_id]
+            ]
+
+        # Walk the transitions backwards from the goal states
+        predecessors = {}
+        for state_from, state_to in zip(transitions_from, transitions_to):
+            predecessors.setdefault(state_to, []).append(state_from)
+
+        can_reach_goal = bytearray(len(expanded))
+        states_to_visit = list(goal_states)
+        for state_id in states_to_visit:
+            can_reach_goal[state_id] = 1
+        while states_to_visit:
+            state_id = states_to_visit.pop()
+            for predecessor in predecessors.get(state_id, []):
+                if not can_reach_goal[predecessor]:
+                    can_reach_goal[predecessor] = 1
+                    states_to_visit.append(predecessor)
+
+        return [
+            state_id
+            for state_id in range(len(expanded))
+            if expanded[state_id] and not can_reach_goal[state_id]
+        ]
@@ -85,6 +85,7 @@ class Parser {
                 };
 
 
+            // @feature-begin used_with
             case "use":
             case "combine":
             case "insert":
@@ -110,6 +111,7 @@ class Parser {
                     "subject": tokens.subject,
                     "object": tokens.object
                 };
+            // @feature-end used_with
 
 
             case "inventory":
@@ -213,6 +215,7 @@ class Parser {
     }
 
 
+    // @feature-begin items
     canApproximateItemName(itemList, itemName)
     {
         // Get all possible items whose name might overlap with the item the user has specified
@@ -227,6 +230,7 @@ class Parser {
             return null;
         }
     }
+    // @feature-end items
 }
 
 
@@ -247,6 +251,14 @@ let parser;
 let currentRoom;
 // Array to hold the user's inventory
 let inventory = [];
+// @feature-begin travel
+// The room directions, in the order used by the routing table
+const DIRECTIONS = ["north", "east", "south", "west", "up", "down"];
+// Set to hold the rooms the user has been to (and can travel back to)
+let visitedRooms = new Set();
+// Array to hold the names of the rooms, indexed by their route id
+let roomNamesByRouteId;
+// @feature-end travel
 
 
 window.onload = setup();
@@ -256,6 +268,9 @@ function setup ()
 {
     parser = new Parser();
     currentRoom = getRoom("origin");
+    // @feature-begin travel
+    visitedRooms.add(currentRoom);
+    // @feature-end travel
 
     roomDescriptionElement = document.createElement("div");
     roomDescriptionElement.id = "room-description";
@@ -344,9 +359,11 @@ function handleInput ()
                 break;
 
 
+            // @feature-begin used_with
             case "use":
                 handleUseAction(parsedSentence);
                 break;
+            // @feature-end used_with
 
 
             case "inventory":
@@ -372,9 +389,19 @@ function handleGoAction (parsedSentence)
 {
     let direction = parsedSentence.direction;
 
+    // @feature-begin travel
+    if (!DIRECTIONS.includes(direction) && getRoom(direction)) {
+        handleTravelAction(direction);
+        return;
+    }
+
+    // @feature-end travel
     if (currentRoom[direction]) {
         // Change room
         currentRoom = getRoom(currentRoom[direction]);
+        // @feature-begin travel
+        visitedRooms.add(currentRoom);
+        // @feature-end travel
         // Change room description text
         setRoomDescription(currentRoom.description);
         // Clear feedback text
@@ -385,6 +412,117 @@ function handleGoAction (parsedSentence)
 }
 
 
+// @feature-begin travel
+function handleTravelAction (roomName)
+{
+    let target = getRoom(roomName);
+
+    if (!visitedRooms.has(target)) {
+        setActionFeedback(p("You haven't been there yet."));
+        return;
+    }
+
+    if (target === currentRoom) {
+        setActionFeedback(p("You are already there."));
+        return;
+    }
+
+    let directions = findRoute(target);
+    if (!directions) {
+        setActionFeedback(p("You don't know how to get there from here."));
+        return;
+    }
+
+    // Go through all the rooms on the way
+    directions.forEach(direction => {
+        currentRoom = getRoom(currentRoom[direction]);
+        visitedRooms.add(currentRoom);
+    });
+    setRoomDescription(currentRoom.description);
+    setActionFeedback(p("You go " + directions.join(", then ") + "."));
+}
+
+
+function getRoomNameByRouteId (routeId)
+{
+    if (!roomNamesByRouteId) {
+        roomNamesByRouteId = [];
+        for (let roomName in GAME_DATA) {
+            roomNamesByRouteId[GAME_DATA[roomName].route_id] = roomName;
+        }
+    }
+
+    return roomNamesByRouteId[routeId];
+}
+
+
+function findRoute (target)
+{
+    // Find the directions leading from the current room to the target room, using the routing table computed when
+    // the game was built (so that no search is needed). Actions can change the map during the game, so every
+    // direction is checked before being followed.
+    let room;
+    let directions;
+    // Routes are never longer than the number of rooms (unless actions changed the map)
+    getRoomNameByRouteId(0);
+    let maxLength = roomNamesByRouteId.length;
+
+    let follow = direction => {
+        let nextRoom = getRoom(room[direction]);
+        if (!nextRoom || directions.length >= maxLength) return false;
+
+        directions.push(direction);
+        room = nextRoom;
+        return true;
+    };
+
+    // Small worlds: the next direction to take towards every room is known in every room
+    if (currentRoom.next_hops !== undefined) {
+        room = currentRoom;
+        directions = [];
+        while (room !== target) {
+            if (!follow(DIRECTIONS[room.next_hops[target.route_id]])) return null;
+        }
+        return directions;
+    }
+
+    // Larger worlds: go to a landmark room, then follow the shortest path from the landmark to the target room,
+    // starting with the landmark the closest to the target room
+    let landmarkCount = currentRoom.landmark_hops.length;
+    for (let i = 0; i < landmarkCount; i++) {
+        let landmark = (target.home_landmark + i) % landmarkCount;
+        room = currentRoom;
+        directions = [];
+
+        while (room !== target && room.landmark_hops[landmark] !== "*") {
+            if (!follow(DIRECTIONS[room.landmark_hops[landmark]])) break;
+        }
+        if (room === target) return directions;
+        if (room.landmark_hops[landmark] !== "*") continue;
+
+        // Go back up the path from the target room to the landmark
+        let path = [];
+        let routeId = target.route_id;
+        let parentId = target.landmark_parents[landmark];
+        while (parentId !== routeId && parentId >= 0 && path.length < maxLength) {
+            path.push(getRoomNameByRouteId(routeId));
+            routeId = parentId;
+            parentId = getRoom(getRoomNameByRouteId(routeId)).landmark_parents[landmark];
+        }
+        if (parentId !== routeId) continue;
+
+        let found = path.reverse().every(roomName => {
+            let direction = DIRECTIONS.find(d => room[d] === roomName);
+            return direction && follow(direction);
+        });
+        if (found) return directions;
+    }
+
+    return null;
+}
+
+
+// @feature-end travel
 function handleTakeAction (parsedSentence)
 {
     let itemName = parsedSentence.subject;
@@ -427,11 +565,13 @@ function handleTakeAction (parsedSentence)
     } else {
         setActionFeedback(p("There aren't any " + itemName + "s in this room."));
 
+        // @feature-begin items
         let allItems = currentRoom.items.tangible.concat(currentRoom.items.intangible);
         let tentativeApproximation = parser.canApproximateItemName(allItems, itemName);
         if (tentativeApproximation) {
             setActionFeedback(p("Did you mean to say \"take " + tentativeApproximation + "\"?"));
         }
+        // @feature-end items
     }
 }
 
@@ -484,18 +624,21 @@ function handleLookAction (parsedSentence)
         // There is no such item
         setActionFeedback(p("There are no " + itemName + "s in this room."));
 
+        // @feature-begin items
         // Search for similar item names
         let allItems = currentRoom.items.tangible.concat(currentRoom.items.intangible);
         let tentativeApproximation = parser.canApproximateItemName(allItems, itemName);
         if (tentativeApproximation) {
             setActionFeedback(p("Did you mean to say \"look at " + tentativeApproximation + "\"?"));
         }
+        // @feature-end items
     } else {
         setActionFeedback(roomItem.description);
     }
 }
 
 
+// @feature-begin used_with
 function handleUseAction (parsedSentence)
 {
     let subjectName = parsedSentence.subject;
@@ -549,8 +692,10 @@ function handleUseAction (parsedSentence)
 
     // Items can now be used together!
 
+    // @feature-begin actions
     // Apply actions
     if (useActions.actions) eval(useActions.actions);
+    // @feature-end actions
 
     // Update feedback text
     setActionFeedback(useActions.effect_message);
@@ -586,6 +731,7 @@ function handleUseAction (parsedSentence)
         }
     }
 }
+// @feature-end used_with
 
 
 function handleInventoryAction (parsedSentence)
@@ -599,11 +745,13 @@ function handleInventoryAction (parsedSentence)
         if (!item) {
             setActionFeedback(p("There is no such item in your inventory."));
 
+            // @feature-begin items
             // Try to suggest similarly named items
             let tentativeApproximation = parser.canApproximateItemName(inventory, itemName);
             if (tentativeApproximation) {
                 setActionFeedback(p("Did you mean to say \"examine " + tentativeApproximation + "\"?"));
             }
+            // @feature-end items
         } else {
             // Item found, examine it
             let description = item.description;
@@ -639,6 +787,7 @@ function p (string)
 }
 
 
+// @feature-begin used_with
 function isXUsedWithY (x, y)
 {
     if (!y.used_with) return null;
@@ -651,16 +800,17 @@ function isXUsedWithY (x, y)
 
     return usedWithItemNames[0];
 }
+// @feature-end used_with
 
 
 function getItemFromRoom (room, type, itemName)
 {
     if (type === "tangible") {
-        return currentRoom.items.tangible.find(i => {
+        return room.items.tangible.find(i => {
             return i.name === itemName;
         });
     } else {
-        return currentRoom.items.intangible.find(i => {
+        return room.items.intangible.find(i => {
             return i.name === itemName;
         });
     }
@@ -675,6 +825,7 @@ function getItemFromInventory (itemName)
 }
 
 
+// @feature-begin actions
 function getRoomOrItem (element)
 {
     // First, try to get a room name
@@ -689,17 +840,18 @@ function getRoomOrItem (element)
     // Fourth, try to get an (intangible) item from the other rooms
     if (!result) {
         let otherRooms = Object.keys(GAME_DATA).filter(r => {
-            return r != currentRoom;
+            return getRoom(r) !== currentRoom;
         });
 
         for (let i = 0; i < otherRooms.length; i++) {
-            result = getItemFromRoom(otherRooms[i], "intangible", element);
+            result = getItemFromRoom(getRoom(otherRooms[i]), "intangible", element);
             if (result) break;
         }
     }
 
     return result;
 }
+// @feature-end actions
 
 
 function help ()
@@ -707,9 +859,14 @@ function help ()
     // Commands: go, take, look, use, inventory, examine, help
     setActionFeedback(p("I see you're kinda lost. Here is a list of the things you can say:") +
                       p("go (north|east|south|west|up|down): move towards a given direction") +
+                      // @feature-begin travel
+                      p("go to &lt;room&gt;: go back to a room you have already been to") +
+                      // @feature-end travel
                       p("take &lt;item&gt;: take a given item in the room and add it to your inventory") +
                       p("look (around room|at inventory|at &lt;item&gt;): look around the room, at your inventory or at a specific item") +
+                      // @feature-begin used_with
                       p("use &lt;item&gt; with &lt;other&gt;item>: use an item from your inventory with another item (from your inventory or the room)") +
+                      // @feature-end used_with
                       p("inventory: look at your inventory") +
                       p("examine &lt;item&gt;: examine an item from your inventory") +
                       p("help: display this message"));
@@ -0,0 +1,87 @@
+import contextlib
+
+from paignion.definitions import HOOK_EVENTS
+
+# The listeners of every event. Emitting an event nobody listens to only costs a dict
+# lookup, so the places emitting events check for listeners before emitting them (see
+# `emit()`). The lists are replaced instead of being modified, so that events can be
+# emitted from several threads while listeners are added or removed.
+listeners = {event: [] for event in HOOK_EVENTS}
+
+
+def check_event(event):
+    """Check that an event exists.
+
+    :param event: the name of the event (see HOOK_EVENTS)
+    :type event: str
+    """
+    if event not in HOOK_EVENTS:
+        # Imported here, as the exceptions depend on the tools, which emit events
+        from paignion.exceptions import PaignionException
+
+        raise PaignionException(
+            f"Unknown event `{event}` (expected one of {', '.join(HOOK_EVENTS)})"
+        )
+
+
+def add_listener(event, listener):
+    """Add a listener to an event.
+
+    :param event: the name of the event (see HOOK_EVENTS)
+    :type event: str
+    :param listener: the function to call every time the event is emitted, with the
+        name of the event and a dict containing its data (e.g. `duration`)
+    :type listener: callable
+    """
+    check_event(event)
+    listeners[event] = listeners[event] + [listener]
+
+
+def remove_listener(event, listener):
+    """Remove a listener from an event.
+
+    :param event: the name of the event (see HOOK_EVENTS)
+    :type event: str
+    :param listener: the listener to remove (if it was added several times, only one
+        of them is removed)
+    :type listener: callable
+    """
+    check_event(event)
+    event_listeners = list(listeners[event])
+    event_listeners.remove(listener)
+    listeners[event] = event_listeners
+
+
+@contextlib.contextmanager
+def listening(listener, events=None):
+    """Add a listener to some events for the duration of a `with` block.
+
+    :param listener: the listener (see `add_listener()`)
+    :type listener: callable
+    :param events: the names of the events to listen to (all of them by default)
+    :type events: list
+    """
+    events = list(HOOK_EVENTS) if events is None else events
+    for event in events:
+        add_listener(event, listener)
+
+    try:
+        yield
+    finally:
+        for event in events:
+            remove_listener(event, listener)
+
+
+def emit(event, **data):
+    """Emit an event, calling all its listeners.
+
+    Places emitting events that are costly to measure (or that happen very often)
+    should check `listeners[event]` first, to skip the measurements when nobody
+    listens.
+
+    :param event: the name of the event (see HOOK_EVENTS)
+    :type event: str
+    :param data: the data of the event
+    """
+    for listener in listeners[event]:
+        listener(event, data)
@@ -7,6 +7,8 @@ from paignion.used_with_item import PaignionUsedWithItem
 class PaignionItem(object):
     """Describe a Paignion item."""
 
+    __slots__ = ("name", "description", "amount", "visible", "effect", "used_with")
+
     def __init__(
         self, name, description, amount=1, visible=True, effect=None, used_with=None
     ):
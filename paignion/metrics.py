@@ -0,0 +1,340 @@
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+from paignion import hooks
+from paignion.action_compiler import compile_cached_action
+from paignion.definitions import (
+    MEMORY_PROFILE_TOP_SITES,
+    METRICS_VERSION,
+    METRICS_REGRESSION_THRESHOLD,
+    METRICS_TIME_RESOLUTION,
+    __version__,
+)
+from paignion.exceptions import PaignionException
+from paignion.room_graph import iter_room_actions
+from paignion.tools import markdownify
+
+# The metrics that measure the cost of a build (the higher, the worse), compared by
+# `compare_metrics()`
+COST_METRICS_PREFIXES = ("phases.", "total_time", "output.", "peak_rss")
+# The metrics measured in seconds
+TIME_METRICS_PREFIXES = ("phases.", "total_time")
+
+# The caches whose hit rates are reported
+METRICS_CACHES = {"markdown": markdownify, "actions": compile_cached_action}
+
+
+def peak_rss():
+    """Get the peak resident set size of the process.
+
+    :return: the peak RSS in bytes, or None if it cannot be measured on this platform
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def game_data_counts(game_data):
+    """Count the rooms, items & actions of a game.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :return: a dict of counts
+    """
+    counts = {
+        "rooms": len(game_data),
+        "tangible_items": 0,
+        "intangible_items": 0,
+        "used_with_items": 0,
+        "actions": 0,
+    }
+
+    for room in game_data.values():
+        for item_type in ("tangible", "intangible"):
+            counts[f"{item_type}_items"] += len(room["items"][item_type])
+            for item in room["items"][item_type]:
+                counts["used_with_items"] += len(item["used_with"])
+        counts["actions"] += sum(1 for _ in iter_room_actions(room))
+
+    return counts
+
+
+def output_sizes(build_files, sections=None):
+    """Measure the size of the output of a build.
+
+    :param build_files: a dict mapping the names of the built files to their contents
+    :type build_files: dict
+    :param sections: the sections of the build (see `encode_build_sections()`)
+    :type sections: dict
+    :return: a dict containing the total size, the size of every file and the size of
+        every section of the output, in bytes
+    """
+    files = {
+        file_name: len(file_data.encode("utf-8"))
+        for file_name, file_data in build_files.items()
+    }
+
+    if sections is not None:
+        section_sizes = {
+            "main_css": len(sections["main_css"].encode("utf-8")),
+            "paignion_js": len(sections["paignion_js"].encode("utf-8")),
+            "game_data": len(sections["game_data_html"].encode("utf-8"))
+            + len(sections["game_data_js"].encode("utf-8")),
+        }
+    else:
+        # The files of split builds are the sections themselves
+        section_sizes = {"main_css": 0, "paignion_js": 0, "game_data": 0}
+        for file_name, size in files.items():
+            for section, prefix in [
+                ("main_css", "main."),
+                ("paignion_js", "paignion."),
+                ("game_data", "game-data."),
+            ]:
+                if file_name.startswith(prefix):
+                    section_sizes[section] = size
+    # Everything else comes from the HTML template
+    section_sizes["template"] = sum(files.values()) - sum(section_sizes.values())
+
+    return {"total": sum(files.values()), "files": files, "sections": section_sizes}
+
+
+class BuildMetrics(object):
+    """Describe the metrics of a build, measured while it runs."""
+
+    def __init__(self):
+        """Construct a new instance of BuildMetrics (the build starts then).
+
+        :return: an instance of BuildMetrics
+        """
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.cache_infos = {
+            cache_name: cache.cache_info()
+            for cache_name, cache in METRICS_CACHES.items()
+        }
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Measure the time taken by a phase of the build.
+
+        :param name: the name of the phase
+        :type name: str
+        """
+        hooks.emit("phase_started", phase=name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0) + duration
+            hooks.emit("phase_finished", phase=name, duration=duration)
+
+    def report(self, project_dir, game_data, build_files, sections=None):
+        """Collect all the metrics of the build (once it is done).
+
+        :param project_dir: the project that was built
+        :type project_dir: str
+        :param game_data: the final GAME_DATA object
+        :type game_data: dict
+        :param build_files: the built files (see `output_sizes()`)
+        :type build_files: dict
+        :param sections: the sections of the index.html file of single-file builds
+        :type sections: dict
+        :return: a dict of metrics, that can be dumped to JSON
+        """
+        caches = {}
+        for cache_name, cache in METRICS_CACHES.items():
+            cache_info = cache.cache_info()
+            hits = cache_info.hits - self.cache_infos[cache_name].hits
+            misses = cache_info.misses - self.cache_infos[cache_name].misses
+            caches[cache_name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else None,
+            }
+
+        return {
+            "version": METRICS_VERSION,
+            "paignion_version": __version__,
+            "project": project_dir,
+            "counts": game_data_counts(game_data),
+            "phases": self.phases,
+            "total_time": time.perf_counter() - self.start,
+            "output": output_sizes(build_files, sections),
+            "caches": caches,
+            "peak_rss": peak_rss(),
+        }
+
+
+class MemoryProfile(object):
+    """Describe the memory profile of a build, traced with tracemalloc.
+
+    For every phase, the profile holds the peak memory allocated during the phase (None
+    before Python 3.9) and the memory it retained once done (both relative to the
+    memory allocated when the phase started), along with the allocation sites of the
+    memory it retained.
+    """
+
+    def __init__(self, enabled=True, top_sites=MEMORY_PROFILE_TOP_SITES):
+        """Construct a new instance of MemoryProfile.
+
+        :param enabled: False if the phases should not be profiled at all (tracing
+            memory allocations slows the build down a lot)
+        :type enabled: bool
+        :param top_sites: the number of allocation sites to keep for each phase
+        :type top_sites: int
+        :return: an instance of MemoryProfile
+        """
+        self.enabled = enabled
+        self.top_sites = top_sites
+        self.phases = {}
+        # The allocations of the profiler itself (e.g. snapshots) are not reported
+        self.snapshot_filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Profile the memory allocated by a phase of the build.
+
+        :param name: the name of the phase
+        :type name: str
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot().filter_traces(self.snapshot_filters)
+        start_size, _ = tracemalloc.get_traced_memory()
+        # The peak can only be reset from Python 3.9 (before, the peak of the phase is
+        # not known, only the overall peak since tracing started)
+        can_reset_peak = hasattr(tracemalloc, "reset_peak")
+        if can_reset_peak:
+            tracemalloc.reset_peak()
+
+        try:
+            yield
+        except BaseException:
+            # Do not keep slowing down the process (e.g. a daemon) after a failed build
+            self.stop()
+            raise
+
+        size, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(self.snapshot_filters)
+        sites = [
+            (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in after.compare_to(before, "lineno")
+            if stat.size_diff > 0
+        ]
+        self.phases[name] = {
+            "peak": peak - start_size if can_reset_peak else None,
+            "retained": size - start_size,
+            "top_sites": sites[: self.top_sites],
+        }
+
+    def stop(self):
+        """Stop tracing memory allocations."""
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def flatten_metrics(metrics, prefix=""):
+    """Flatten the numeric metrics of a metrics dict.
+
+    :param metrics: a dict of metrics (see `BuildMetrics.report()`)
+    :type metrics: dict
+    :param prefix: the prefix of the names of the metrics
+    :type prefix: str
+    :return: a dict mapping dotted metric names (e.g. `phases.parse`) to their values
+    """
+    flat_metrics = {}
+
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            flat_metrics.update(flatten_metrics(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat_metrics[f"{prefix}{key}"] = value
+
+    return flat_metrics
+
+
+def load_metrics(metrics_file):
+    """Load a metrics file written by `paignion build --metrics-json`.
+
+    :param metrics_file: the path to the metrics file
+    :type metrics_file: str
+    :return: the metrics
+    """
+    try:
+        with open(metrics_file, "r") as f:
+            metrics = json.load(f)
+    except (OSError, ValueError) as e:
+        raise PaignionException(f"Could not read metrics file `{metrics_file}`") from e
+
+    if not isinstance(metrics, dict) or metrics.get("version") != METRICS_VERSION:
+        raise PaignionException(
+            f"Unsupported metrics file `{metrics_file}` (expected version "
+            f"{METRICS_VERSION})"
+        )
+
+    return metrics
+
+
+def compare_metrics(
+    old_metrics,
+    new_metrics,
+    threshold=METRICS_REGRESSION_THRESHOLD,
+    time_resolution=METRICS_TIME_RESOLUTION,
+):
+    """Compare the cost metrics of two builds.
+
+    :param old_metrics: the metrics of the reference build
+    :type old_metrics: dict
+    :param new_metrics: the metrics of the new build
+    :type new_metrics: dict
+    :param threshold: the relative increase of a metric above which it is considered a
+        regression (e.g. 0.1 for 10%)
+    :type threshold: float
+    :param time_resolution: the differences of times (in seconds) below which times are
+        considered equal, as they are too small to be measured reliably
+    :type time_resolution: float
+    :return: a list of (metric name, old value, new value, relative change, regression)
+        tuples, the relative change being None if the old value is 0
+    """
+    old_values = flatten_metrics(old_metrics)
+    new_values = flatten_metrics(new_metrics)
+    comparison = []
+
+    for metric in sorted(set(old_values) & set(new_values)):
+        if not metric.startswith(COST_METRICS_PREFIXES):
+            continue
+
+        old_value = old_values[metric]
+        new_value = new_values[metric]
+        change = (new_value - old_value) / old_value if old_value else None
+
+        if metric.startswith(TIME_METRICS_PREFIXES) and (
+            new_value - old_value < time_resolution
+        ):
+            regression = False
+        elif change is None:
+            regression = new_value > 0
+        else:
+            regression = change > threshold
+
+        comparison.append((metric, old_value, new_value, change, regression))
+
+    return comparison
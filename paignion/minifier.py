@@ -0,0 +1,240 @@
+import re
+
+# Characters after which a `/` starts a regular expression literal instead of a division
+JS_REGEX_PRECEDERS = "(,=:[!&|?{};+-*%<>~^"
+# Keywords after which a `/` starts a regular expression literal (`return /a/.test(b)`)
+JS_REGEX_PRECEDING_KEYWORDS = {
+    "return",
+    "typeof",
+    "case",
+    "do",
+    "else",
+    "in",
+    "of",
+    "new",
+    "delete",
+    "void",
+    "throw",
+    "instanceof",
+    "yield",
+}
+# Pairs of characters that must stay apart (`a + +b` is not `a ++b`, `a / /b/` is not
+# a comment)
+JS_UNSPLITTABLE_PAIRS = ["++", "--", "+-", "-+", "//", "/*"]
+# Characters after which a newline can be dropped without triggering (or preventing)
+# automatic semicolon insertion
+JS_LINE_CONTINUATORS = "{([;,:"
+# Characters before which a newline can be dropped without triggering (or preventing)
+# automatic semicolon insertion
+JS_LINE_CLOSERS = "})]"
+
+# Characters next to which whitespace can always be dropped in CSS code
+CSS_PUNCTUATION = "{};,>"
+
+# HTML elements whose whitespace is significant
+HTML_PREFORMATTED_REGEX = re.compile(r"(<pre[\s>][\s\S]*?</pre>)")
+# HTML tags around which whitespace is not rendered
+HTML_BLOCK_TAG = (
+    r"</?(?:!doctype|html|head|title|meta|link|style|script|body|main|div|p|h[1-6]"
+    r"|ul|ol|li|dl|dt|dd|table|thead|tbody|tfoot|tr|th|td|blockquote|hr)\b[^>]*>"
+)
+HTML_BLOCK_TAG_WHITESPACE_REGEX = re.compile(
+    rf"\s*({HTML_BLOCK_TAG})\s*", flags=re.IGNORECASE
+)
+
+
+def is_js_word_character(char):
+    """Check if a character can be part of a JavaScript identifier, keyword or number.
+
+    :param char: a character
+    :type char: str
+    :return: True if the character is a word character, False otherwise
+    """
+    return char.isalnum() or char in "_$.\\" or ord(char) > 127
+
+
+def minify_js(code):
+    """Minify JavaScript code.
+
+    Comments are stripped and whitespace is collapsed, while strings, template literals
+    and regular expression literals are kept intact. Newlines are only dropped where
+    that cannot change the outcome of automatic semicolon insertion, so code relying on
+    it keeps working.
+
+    :param code: the JavaScript code
+    :type code: str
+    :return: the minified JavaScript code
+    """
+    result = []
+    i = 0
+    length = len(code)
+    # The last significant (non-whitespace) character that was emitted
+    last = ""
+    # The word (identifier, keyword or number) that was emitted last, if the last
+    # emitted token was part of a word
+    last_word = ""
+    # Whitespace seen since the last emitted token (None, " " or "\n")
+    pending = None
+
+    while i < length:
+        char = code[i]
+
+        # Comments
+        if code.startswith("//", i):
+            end = code.find("\n", i)
+            i = length if end < 0 else end
+            continue
+        if code.startswith("/*", i):
+            end = code.find("*/", i + 2)
+            # A multi-line comment counts as a newline for semicolon insertion
+            if "\n" in code[i:end]:
+                pending = "\n"
+            elif pending is None:
+                pending = " "
+            i = length if end < 0 else end + 2
+            continue
+
+        # Whitespace
+        if char in " \t\r\n":
+            if char == "\n":
+                pending = "\n"
+            elif pending is None:
+                pending = " "
+            i += 1
+            continue
+
+        # Strings, template literals and regular expression literals are copied over
+        if char in "\"'`" or (
+            char == "/"
+            and (
+                not last
+                or last in JS_REGEX_PRECEDERS
+                or last_word in JS_REGEX_PRECEDING_KEYWORDS
+            )
+        ):
+            end = i + 1
+            in_class = False
+            while end < length:
+                if code[end] == "\\":
+                    end += 2
+                    continue
+                if char == "/" and code[end] == "[":
+                    in_class = True
+                elif char == "/" and code[end] == "]":
+                    in_class = False
+                elif code[end] == char and not in_class:
+                    break
+                end += 1
+            end += 1
+            # Regular expression flags
+            if char == "/":
+                while end < length and (code[end].isalnum() or code[end] == "_"):
+                    end += 1
+            token = code[i:end]
+            i = end
+        else:
+            token = char
+            i += 1
+
+        if len(token) == 1 and is_js_word_character(token):
+            last_word = ("" if pending else last_word) + token
+        else:
+            last_word = ""
+
+        if pending and last:
+            if pending == "\n":
+                if last not in JS_LINE_CONTINUATORS and token[0] not in JS_LINE_CLOSERS:
+                    result.append("\n")
+            elif (is_js_word_character(last) and is_js_word_character(token[0])) or (
+                last + token[0] in JS_UNSPLITTABLE_PAIRS
+            ):
+                result.append(" ")
+        pending = None
+
+        result.append(token)
+        last = token[-1]
+
+    return "".join(result)
+
+
+def minify_css(code):
+    """Minify CSS code.
+
+    :param code: the CSS code
+    :type code: str
+    :return: the minified CSS code
+    """
+    result = []
+    i = 0
+    length = len(code)
+    last = ""
+    pending = False
+
+    while i < length:
+        char = code[i]
+
+        # Comments
+        if code.startswith("/*", i):
+            end = code.find("*/", i + 2)
+            i = length if end < 0 else end + 2
+            pending = True
+            continue
+
+        # Whitespace
+        if char.isspace():
+            pending = True
+            i += 1
+            continue
+
+        # Strings are copied over
+        if char in "\"'":
+            end = i + 1
+            while end < length and code[end] != char:
+                end += 2 if code[end] == "\\" else 1
+            token = code[i : end + 1]
+            i = end + 1
+        else:
+            token = char
+            i += 1
+
+        # The last semicolon of a block is not needed
+        if token == "}" and last == ";":
+            result.pop()
+
+        # Whitespace after a colon can only appear in declarations, where it can be
+        # dropped (but `a :hover` and `a:hover` are two different selectors)
+        if (
+            pending
+            and last
+            and last not in CSS_PUNCTUATION + ":"
+            and token[0] not in CSS_PUNCTUATION
+        ):
+            result.append(" ")
+        pending = False
+
+        result.append(token)
+        last = token[-1]
+
+    return "".join(result)
+
+
+def minify_html(html):
+    """Collapse the whitespace of an HTML fragment.
+
+    Runs of whitespace are collapsed into a single space (which is how browsers render
+    them anyway), and whitespace around block-level tags is dropped. The contents of
+    <pre> elements are left untouched.
+
+    :param html: the HTML fragment
+    :type html: str
+    :return: the minified HTML fragment
+    """
+    parts = HTML_PREFORMATTED_REGEX.split(html)
+
+    # Odd indices hold the <pre> elements
+    for i in range(0, len(parts), 2):
+        parts[i] = HTML_BLOCK_TAG_WHITESPACE_REGEX.sub(
+            r"\1", re.sub(r"\s+", " ", parts[i])
+        )
+
+    return "".join(parts).strip()
@@ -0,0 +1,136 @@
+import os
+import re
+import tarfile
+import zipfile
+
+from paignion.definitions import PACKED_DOCUMENT_EXTENSIONS, PACKED_ARCHIVE_EXTENSIONS
+from paignion.exceptions import PaignionException
+
+# The line introducing each room of a packed document (e.g. `=== forest/clearing ===`)
+PACKED_ROOM_DELIMITER_REGEX = re.compile(r"^=== (.+) ===$")
+
+
+def is_packed_project(path):
+    """Check if a path points to a packed project (instead of a project directory).
+
+    :param path: the path to the project
+    :type path: str
+    :return: True if the path is a packed document or archive, False otherwise
+    """
+    return os.path.isfile(path) and path.endswith(
+        PACKED_DOCUMENT_EXTENSIONS + PACKED_ARCHIVE_EXTENSIONS
+    )
+
+
+def packed_project_name(path):
+    """Get the name of a packed project: its file name without the extension.
+
+    :param path: the path to the packed project
+    :type path: str
+    :return: the name of the packed project (e.g. `my_game` for `games/my_game.tar.gz`)
+    """
+    file_name = os.path.basename(path)
+    for extension in PACKED_DOCUMENT_EXTENSIONS + PACKED_ARCHIVE_EXTENSIONS:
+        if file_name.endswith(extension):
+            return file_name[: -len(extension)]
+
+    return file_name
+
+
+def room_name_from_member(member_name):
+    """Derive the name of a room from the name of an archive member.
+
+    Only the Markdown files inside of a `rooms/` directory (which may itself be inside
+    of another directory, e.g. `my_game/rooms/`) are room files.
+
+    :param member_name: the name of the archive member (using `/` as the separator)
+    :type member_name: str
+    :return: the name of the room, or None if the member is not a room file
+    """
+    parts = member_name.split("/")
+    if "rooms" not in parts[:-1] or not parts[-1].endswith(".md"):
+        return None
+
+    room_parts = parts[parts.index("rooms") + 1 :]
+    # Hidden files & directories are ignored, like in project directories
+    if any(part.startswith(".") for part in room_parts):
+        return None
+
+    return "/".join(room_parts)[: -len(".md")]
+
+
+def read_packed_document(path):
+    """Read the rooms of a packed document, in one pass.
+
+    A packed document is the concatenation of room files, each one introduced by a
+    delimiter line containing the name of the room (e.g. `=== forest/clearing ===`).
+
+    :param path: the path to the packed document
+    :type path: str
+    :return: a generator of (room name, raw room data) tuples
+    """
+    room_name = None
+    lines = []
+
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            delimiter_match = PACKED_ROOM_DELIMITER_REGEX.match(line.rstrip("\n"))
+            if delimiter_match:
+                if room_name is not None:
+                    yield room_name, "".join(lines)
+                room_name = delimiter_match.group(1).strip()
+                lines = []
+            elif room_name is not None:
+                lines.append(line)
+            elif line.strip():
+                raise PaignionException(
+                    f"Text found before the first room in `{path}` (line "
+                    f"{line_number}); rooms must start with a `=== room name ===` line"
+                )
+
+    if room_name is not None:
+        yield room_name, "".join(lines)
+
+
+def read_packed_archive(path):
+    """Read the rooms of a `.zip` or `.tar` archive, in one pass.
+
+    The room files are read from the archive directly, without extracting them to disk.
+    Tar archives are streamed (so their rooms come in the order of the archive), while
+    the rooms of zip archives come in the order of their names.
+
+    :param path: the path to the archive
+    :type path: str
+    :return: a generator of (room name, raw room data) tuples
+    """
+    try:
+        if path.endswith(".zip"):
+            with zipfile.ZipFile(path) as archive:
+                for member in sorted(archive.infolist(), key=lambda m: m.filename):
+                    room_name = room_name_from_member(member.filename)
+                    if room_name is None or member.is_dir():
+                        continue
+                    with archive.open(member) as f:
+                        yield room_name, f.read().decode("utf-8")
+        else:
+            with tarfile.open(path, mode="r|*") as archive:
+                for member in archive:
+                    room_name = room_name_from_member(member.name)
+                    if room_name is None or not member.isfile():
+                        continue
+                    yield room_name, archive.extractfile(member).read().decode("utf-8")
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise PaignionException(f"Invalid archive `{path}`") from e
+
+
+def read_packed_project(path):
+    """Read the rooms of a packed project, in one pass.
+
+    :param path: the path to the packed document or archive
+    :type path: str
+    :return: a generator of (room name, raw room data) tuples
+    """
+    if path.endswith(PACKED_DOCUMENT_EXTENSIONS):
+        return read_packed_document(path)
+
+    return read_packed_archive(path)
@@ -1,8 +1,12 @@
 import re
 import os
 import json
-import yaml
+import queue
+import threading
+import time
 
+from paignion import hooks
+from paignion.action_compiler import ActionCompiler
 from paignion.definitions import DIRECTIONS
 from paignion.exceptions import (
     PaignionException,
@@ -16,6 +20,38 @@ from paignion.used_with_item import PaignionUsedWithItem
 from paignion.tools import markdownify
 
 
+def room_name_from_path(room_file, rooms_dir=None):
+    """Derive the name of a room from the path to its room file.
+
+    :param room_file: the path to the room file
+    :type room_file: str
+    :param rooms_dir: the rooms directory containing the room file; if given, the name
+        of the room is its path relative to that directory (e.g. `forest/clearing`),
+        otherwise it is the name of the file
+    :type rooms_dir: str
+    :return: the name of the room
+    """
+    if rooms_dir is None:
+        return os.path.splitext(room_file)[0].split("/")[-1]
+
+    relative_path = os.path.relpath(room_file, rooms_dir)
+    return os.path.splitext(relative_path)[0].replace(os.sep, "/")
+
+
+def sort_rooms(rooms):
+    """Put the rooms of a game in their canonical order (sorted by name).
+
+    The order of the rooms decides the order of the game data (and of the routing
+    table of the `go to <room>` command), so sorting them makes the build independent
+    of the order in which the room files were found or the rooms were given.
+
+    :param rooms: an iterable of (room name, room data) tuples
+    :type rooms: iterable
+    :return: a dict mapping the names of the rooms to their data, sorted by name
+    """
+    return dict(sorted(rooms, key=lambda room: room[0]))
+
+
 class PaignionParser(object):
     """Parse Paignion room files.
 
@@ -25,6 +61,31 @@ class PaignionParser(object):
     working game.
     """
 
+    def __init__(self, render_markdown=True):
+        """Construct a new instance of PaignionParser.
+
+        :param render_markdown: True if the Markdown parts of the rooms should be
+            rendered to HTML, False otherwise (in which case they are left as they are,
+            which is much faster when the game data is only validated)
+        :type render_markdown: bool
+        :return: an instance of PaignionParser
+        """
+        self.render_markdown = render_markdown
+        self.action_compiler = ActionCompiler(render_markdown=render_markdown)
+
+    def markdownify(self, md_string):
+        """Convert a Markdown string to HTML, if Markdown rendering is enabled.
+
+        :param md_string: the Markdown string
+        :type md_string: str
+        :return: the HTML string (or the Markdown string itself)
+        """
+        if not self.render_markdown:
+            # Blank strings are rendered as empty strings
+            return md_string.strip() if md_string else md_string
+
+        return markdownify(md_string)
+
     def verify_project_dir(self, project_dir):
         """Verify the structure & contents of a project directory.
 
@@ -46,28 +107,162 @@ class PaignionParser(object):
                 "Origin room (origin.md) not found. Please create an origin room."
             )
 
-    def parse_room_files(self, room_files):
-        """Parse a list of Paignion room files and generate the GAME_DATA object.
+    def read_room_files(self, room_files, read_ahead=0, rooms_dir=None):
+        """Read a list of Paignion room files, one by one.
 
-        Parse a series of room files and merge the results to derive the final
-        GAME_DATA object containing all of the relevant game info needed by the
-        frontend engine.
+        :param room_files: a list of the paths to the room files
+        :type room_files: list
+        :param read_ahead: the number of files to read in advance on a background
+            thread (0 to read each file only when it is needed)
+        :type read_ahead: int
+        :param rooms_dir: the rooms directory containing the room files, from which
+            the names of the rooms are derived (see `room_name_from_path()`)
+        :type rooms_dir: str
+        :return: a generator of (room name, raw room data) tuples
+        """
+        if read_ahead <= 0:
+            for room_file in room_files:
+                with open(room_file, "r") as f:
+                    yield room_name_from_path(room_file, rooms_dir), f.read()
+            return
+
+        contents = queue.Queue(maxsize=read_ahead)
+        stopped = threading.Event()
+
+        def put(content):
+            # Give up as soon as the consumer stops consuming
+            while not stopped.is_set():
+                try:
+                    contents.put(content, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read():
+            try:
+                for room_file in room_files:
+                    with open(room_file, "r") as f:
+                        content = (room_name_from_path(room_file, rooms_dir), f.read())
+                    if not put(content):
+                        return
+            except Exception as e:
+                # Errors are raised again on the consumer's side
+                put(e)
+            put(None)
+
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+
+        try:
+            while True:
+                content = contents.get()
+                if content is None:
+                    break
+                if isinstance(content, Exception):
+                    raise content
+                yield content
+        finally:
+            stopped.set()
+            reader.join()
+
+    def iter_room_files(self, room_files, read_ahead=0, rooms_dir=None, cache=None):
+        """Parse a list of Paignion room files, one by one.
+
+        Contrary to `parse_room_files()`, the rooms are yielded as soon as they are
+        parsed, so that they can be processed without keeping all of them in memory.
 
         :param room_files: a list of the paths to the room files
         :type room_files: list
+        :param read_ahead: the number of files to read in advance on a background
+            thread, while the previous ones are being parsed
+        :type read_ahead: int
+        :param rooms_dir: the rooms directory containing the room files, from which
+            the names of the rooms are derived (see `room_name_from_path()`)
+        :type rooms_dir: str
+        :param cache: a dict keeping the parsed rooms between calls (initially empty);
+            the rooms whose files have not changed since the last call (judging by
+            their modification time & size) are taken from it instead of being parsed
+            again
+        :type cache: dict
+        :return: a generator of (room name, room data) tuples, the room data being
+            the room's entry in the GAME_DATA object
         """
-        room_data = {}
+        if cache is not None:
+            return self.iter_cached_room_files(room_files, read_ahead, rooms_dir, cache)
+
+        return self.iter_rooms(self.read_room_files(room_files, read_ahead, rooms_dir))
 
+    def iter_cached_room_files(self, room_files, read_ahead, rooms_dir, cache):
+        """Parse the room files that changed since the last call, and reuse the others.
+
+        See `iter_room_files()` for the parameters; the rooms of the files that are
+        gone are dropped from the cache.
+        """
+        stamps = {}
         for room_file in room_files:
-            with open(room_file, "r") as f:
-                room_data.update(
-                    self.parse_room_data(
-                        room_data=f.read(),
-                        room_name=os.path.splitext(room_file)[0].split("/")[-1],
-                    )
+            stat = os.stat(room_file)
+            stamps[room_file] = (stat.st_mtime_ns, stat.st_size)
+
+        for room_file in set(cache) - set(stamps):
+            del cache[room_file]
+
+        changed_files = [
+            room_file
+            for room_file in room_files
+            if room_file not in cache or cache[room_file][0] != stamps[room_file]
+        ]
+        for room_file, room in zip(
+            changed_files, self.iter_room_files(changed_files, read_ahead, rooms_dir)
+        ):
+            cache[room_file] = (stamps[room_file], room)
+
+        for room_file in room_files:
+            yield cache[room_file][1]
+
+    def iter_rooms(self, room_sources):
+        """Parse a series of rooms, one by one.
+
+        :param room_sources: an iterable of (room name, raw room data) tuples, e.g. the
+            rooms of a packed project (see `paignion.packed.read_packed_project()`)
+        :type room_sources: iterable
+        :return: a generator of (room name, room data) tuples, the room data being
+            the room's entry in the GAME_DATA object
+        """
+        for room_name, room_data in room_sources:
+            start = time.perf_counter()
+            room = self.parse_room_data(room_data=room_data, room_name=room_name)
+            if hooks.listeners["room_parsed"]:
+                hooks.emit(
+                    "room_parsed",
+                    room=room_name,
+                    size=len(room_data),
+                    duration=time.perf_counter() - start,
                 )
+            yield room_name, room[room_name]
 
-        return room_data
+    def parse_room_files(self, room_files, read_ahead=0, rooms_dir=None, cache=None):
+        """Parse a list of Paignion room files and generate the GAME_DATA object.
+
+        Parse a series of room files and merge the results to derive the final
+        GAME_DATA object containing all of the relevant game info needed by the
+        frontend engine.
+
+        :param room_files: a list of the paths to the room files
+        :type room_files: list
+        :param read_ahead: the number of files to read in advance on a background
+            thread (see `iter_room_files()`)
+        :type read_ahead: int
+        :param rooms_dir: the rooms directory containing the room files, from which
+            the names of the rooms are derived (see `room_name_from_path()`)
+        :type rooms_dir: str
+        :param cache: a dict keeping the parsed rooms between calls (see
+            `iter_room_files()`)
+        :type cache: dict
+        """
+        return sort_rooms(
+            self.iter_room_files(room_files, read_ahead, rooms_dir, cache)
+        )
 
     def parse_room_data(self, room_data, room_name):
         """Parse a single room file.
@@ -83,15 +278,23 @@ class PaignionParser(object):
         """
         # Detect YAML part
         frontmatter_match = re.search("---\n(((?!---)[\\s\\S])*)---", room_data)
+        if not frontmatter_match:
+            raise PaignionException(f"YAML header not found in room `{room_name}`")
+
+        # Parse YAML part (yaml is imported here, as it takes a while and is not
+        # needed by every command)
+        import yaml
 
-        # Parse YAML part
-        frontmatter = yaml.load(frontmatter_match.group(1), Loader=yaml.Loader)
+        try:
+            frontmatter = yaml.load(frontmatter_match.group(1), Loader=yaml.Loader)
+        except yaml.YAMLError as e:
+            raise PaignionException(f"Invalid YAML header in room `{room_name}`") from e
         # If the YAML is empty, replace it by an empty dict
         if not frontmatter:
             frontmatter = {}
 
         # Parse Markdown part
-        md = markdownify(room_data[frontmatter_match.span()[1] :])
+        md = self.markdownify(room_data[frontmatter_match.span()[1] :])
 
         # Parse items
         if "items" in frontmatter:
@@ -113,19 +316,20 @@ class PaignionParser(object):
                             used_with.append(
                                 PaignionUsedWithItem(
                                     name=uw_item.get("name"),
-                                    effect_message=markdownify(
+                                    effect_message=self.markdownify(
                                         uw_item.get("effect_message")
                                     ),
                                     consumes_subject=uw_item.get("consumes_subject"),
                                     consumes_object=uw_item.get("consumes_object"),
                                     actions=uw_item.get("actions"),
+                                    action_compiler=self.action_compiler,
                                 )
                             )
-                        except PaignionUsedWithItemException:
+                        except PaignionUsedWithItemException as e:
                             raise PaignionException(
                                 f"Could not parse used_with item for tangible item "
                                 f"`{tangible_item.get('name')}` in room `{room_name}`"
-                            )
+                            ) from e
                 else:
                     used_with = []
 
@@ -133,17 +337,19 @@ class PaignionParser(object):
                     tangible_items.append(
                         PaignionItem(
                             name=tangible_item.get("name"),
-                            description=markdownify(tangible_item.get("description")),
+                            description=self.markdownify(
+                                tangible_item.get("description")
+                            ),
                             amount=tangible_item.get("amount"),
                             visible=tangible_item.get("visible"),
                             effect=tangible_item.get("effect"),
                             used_with=used_with,
                         )
                     )
-                except PaignionItemException:
+                except PaignionItemException as e:
                     raise PaignionException(
                         f"Could not parse tangible item in room `{room_name}`"
-                    )
+                    ) from e
 
             # Parse intangible items
             intangible_items = []
@@ -163,19 +369,20 @@ class PaignionParser(object):
                             used_with.append(
                                 PaignionUsedWithItem(
                                     name=uw_item.get("name"),
-                                    effect_message=markdownify(
+                                    effect_message=self.markdownify(
                                         uw_item.get("effect_message")
                                     ),
                                     consumes_subject=uw_item.get("consumes_subject"),
                                     consumes_object=uw_item.get("consumes_object"),
                                     actions=uw_item.get("actions"),
+                                    action_compiler=self.action_compiler,
                                 )
                             )
-                        except PaignionUsedWithItemException:
+                        except PaignionUsedWithItemException as e:
                             raise PaignionException(
                                 f"Could not parse used_with item for intangible item "
                                 f"`{intangible_item['name']}` in room `{room_name}`"
-                            )
+                            ) from e
                 else:
                     used_with = []
 
@@ -183,17 +390,19 @@ class PaignionParser(object):
                     intangible_items.append(
                         PaignionItem(
                             name=intangible_item.get("name"),
-                            description=markdownify(intangible_item.get("description")),
+                            description=self.markdownify(
+                                intangible_item.get("description")
+                            ),
                             amount=intangible_item.get("amount"),
                             visible=intangible_item.get("visible"),
                             effect=intangible_item.get("effect"),
                             used_with=used_with,
                         )
                     )
-                except PaignionItemException:
+                except PaignionItemException as e:
                     raise PaignionException(
                         f"Could not parse intangible item in room `{room_name}`"
-                    )
+                    ) from e
         else:
             tangible_items = []
             intangible_items = []
@@ -212,7 +421,7 @@ class PaignionParser(object):
                 tangible_items=tangible_items,
                 intangible_items=intangible_items,
             )
-        except PaignionRoomException:
-            raise PaignionException(f"Could not parse room `{room_name}`")
+        except PaignionRoomException as e:
+            raise PaignionException(f"Could not parse room `{room_name}`") from e
 
         return room.dump()
@@ -0,0 +1,164 @@
+import sys
+import time
+
+from paignion.definitions import PROGRESS_TERMINAL_INTERVAL, PROGRESS_LOG_INTERVAL
+from paignion.tools import info
+
+# The events the progress of a build is derived from (see HOOK_EVENTS)
+PROGRESS_EVENTS = [
+    "rooms_found",
+    "room_parsed",
+    "phase_started",
+    "phase_finished",
+    "file_written",
+]
+
+# Erases the rest of the line in a terminal
+CLEAR_LINE = "\033[K"
+
+
+class BuildProgress(object):
+    """Describe the progress report of a build.
+
+    The progress is derived from the events of the build (see `paignion.hooks`): the
+    `listener()` method is to be added to PROGRESS_EVENTS. In a terminal, the progress
+    is updated in place; otherwise (e.g. in CI logs), it is logged line by line, less
+    often. The progress is only printed if enough time has passed since the last
+    update, so that reporting it does not slow the build down.
+    """
+
+    def __init__(self, terminal=None, interval=None):
+        """Construct a new instance of BuildProgress.
+
+        :param terminal: True if the progress is printed to a terminal (by default,
+            True if the standard output is one)
+        :type terminal: bool
+        :param interval: the minimum time (in seconds) between two updates (by
+            default, PROGRESS_TERMINAL_INTERVAL in a terminal and PROGRESS_LOG_INTERVAL
+            otherwise)
+        :type interval: float
+        :return: an instance of BuildProgress
+        """
+        self.terminal = sys.stdout.isatty() if terminal is None else terminal
+        if interval is None:
+            interval = (
+                PROGRESS_TERMINAL_INTERVAL if self.terminal else PROGRESS_LOG_INTERVAL
+            )
+        self.interval = interval
+
+        # The total number of rooms to parse (None if unknown)
+        self.total_rooms = None
+        self.phase = None
+        self.phase_start = None
+        self.next_update = 0
+        # The number of rooms parsed, or of files written (with their total size)
+        self.done = 0
+        self.written_size = 0
+        # True if the last progress line was printed in place, without a newline
+        self.line_open = False
+
+    def report(self, message, final=False):
+        """Print a progress message.
+
+        :param message: the message
+        :type message: str
+        :param final: True if the message should stay on screen (e.g. the summary of a
+            phase), False if it can be replaced by the next update
+        :type final: bool
+        """
+        if self.terminal:
+            info(f"{message}{CLEAR_LINE}", end="\n" if final else "\r")
+            self.line_open = not final
+        else:
+            info(message)
+        sys.stdout.flush()
+
+    def due(self):
+        """Check if the progress should be updated, and schedule the next update.
+
+        :return: True if enough time has passed since the last update
+        """
+        now = time.perf_counter()
+        if now < self.next_update:
+            return False
+
+        self.next_update = now + self.interval
+        return True
+
+    def rooms_progress(self, room):
+        """Describe the progress of the parsing of the rooms.
+
+        :param room: the room being parsed
+        :type room: str
+        :return: the progress message
+        """
+        elapsed = time.perf_counter() - self.phase_start
+        rate = self.done / elapsed if elapsed else 0
+        message = f"Parsing rooms: {self.done}"
+
+        if self.total_rooms:
+            message += f"/{self.total_rooms} ({self.done / self.total_rooms:.0%})"
+        message += f", {rate:.0f} rooms/s"
+        if self.total_rooms and rate:
+            message += f", ETA {max(self.total_rooms - self.done, 0) / rate:.0f}s"
+
+        return f"{message}, `{room}`"
+
+    def listener(self, event, data):
+        """Update the progress on an event of the build.
+
+        :param event: the name of the event (see PROGRESS_EVENTS)
+        :type event: str
+        :param data: the data of the event
+        :type data: dict
+        """
+        if event == "room_parsed":
+            self.done += 1
+            if self.due():
+                self.report(self.rooms_progress(data["room"]))
+        elif event == "file_written":
+            self.done += 1
+            self.written_size += data["size"]
+            if self.due():
+                elapsed = time.perf_counter() - self.phase_start
+                self.report(
+                    f"Writing files: {self.done} ({self.written_size} bytes, "
+                    f"{self.written_size / elapsed / 1e6:.1f} MB/s), `{data['file']}`"
+                )
+        elif event == "rooms_found":
+            self.total_rooms = data["count"]
+        elif event == "phase_started":
+            self.phase = data["phase"]
+            self.phase_start = time.perf_counter()
+            self.done = 0
+            self.written_size = 0
+            # The first update of a phase comes after an interval, so that quick
+            # phases are only reported once done
+            self.next_update = self.phase_start + self.interval
+        elif event == "phase_finished":
+            self.report(self.phase_summary(data["duration"]), final=True)
+            self.phase = None
+
+    def phase_summary(self, duration):
+        """Describe a finished phase of the build.
+
+        :param duration: the duration of the phase, in seconds
+        :type duration: float
+        :return: the summary message
+        """
+        if self.phase == "parse":
+            rate = f", {self.done / duration:.0f} rooms/s" if duration else ""
+            return f"Parsed {self.done} room(s) in {duration:.3f}s{rate}"
+        elif self.phase == "write":
+            return (
+                f"Wrote {self.done} file(s) ({self.written_size} bytes) in "
+                f"{duration:.3f}s"
+            )
+
+        return f"Phase `{self.phase}` done in {duration:.3f}s"
+
+    def close(self):
+        """End the progress report (ending the last progress line, if needed)."""
+        if self.line_open:
+            print()
+            self.line_open = False
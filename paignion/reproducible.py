@@ -0,0 +1,110 @@
+import os
+
+from paignion.action_compiler import compile_cached_action
+from paignion.api import build_game_data
+from paignion.builder import (
+    detect_engine_features,
+    frontend_engine,
+    read_frontend_file,
+    render_build_files,
+)
+from paignion.definitions import ENGINE_FEATURES, GAME_DATA_FORMATS
+from paignion.packed import is_packed_project, read_packed_project
+from paignion.parser import PaignionParser
+from paignion.room_index import scan_rooms_dir
+from paignion.tools import markdownify
+
+# The number of characters shown around the first difference between two builds
+DIFF_CONTEXT = 40
+
+
+def read_project_rooms(project_dir):
+    """Read the sources of all the rooms of a project, in reverse order.
+
+    The rooms are read in the reverse order of a normal build, to check that the order
+    in which the room files are found does not change the build.
+
+    :param project_dir: the directory containing the project files, or the path to a
+        packed project
+    :type project_dir: str
+    :return: a list of (room name, raw room data) tuples
+    """
+    if is_packed_project(project_dir):
+        rooms = list(read_packed_project(project_dir))
+    else:
+        rooms_dir = os.path.join(project_dir, "rooms")
+        room_files, _ = scan_rooms_dir(rooms_dir)
+        rooms = list(PaignionParser().read_room_files(room_files, rooms_dir=rooms_dir))
+
+    return rooms[::-1]
+
+
+def rebuild_project(project_dir, options):
+    """Build a project again from scratch, without writing anything.
+
+    The caches of the process (rendered Markdown, compiled actions) are emptied first,
+    and the project is not read through the index of its rooms directory nor through
+    the room cache of a daemon, so that nothing is reused from the first build.
+
+    :param project_dir: the directory containing the project files, or the path to a
+        packed project
+    :type project_dir: str
+    :param options: the arguments of the build command
+    :type options: dict
+    :return: a dict mapping file names to file contents
+    """
+    markdownify.cache_clear()
+    compile_cached_action.cache_clear()
+
+    game_data = build_game_data(
+        read_project_rooms(project_dir),
+        keep_unreachable=options.get("keep_unreachable", False),
+        fast_travel=options.get("fast_travel", False),
+    )
+    if options.get("full_engine", False):
+        engine_features = frozenset(ENGINE_FEATURES)
+    else:
+        engine_features = frozenset(detect_engine_features(game_data))
+
+    return render_build_files(
+        game_data=game_data,
+        main_css=read_frontend_file("main.css"),
+        paignion_js=frontend_engine(engine_features),
+        data_format=options.get("data_format", GAME_DATA_FORMATS[0]),
+        minify=options.get("minify", False),
+        split=options.get("split", False),
+    )
+
+
+def diff_build_files(build_files, other_build_files):
+    """Compare the files of two builds.
+
+    :param build_files: a dict mapping file names to file contents
+    :type build_files: dict
+    :param other_build_files: the files of the other build
+    :type other_build_files: dict
+    :return: a list of messages describing the differences (empty if the builds are
+        identical)
+    """
+    differences = []
+
+    for file_name in sorted(set(build_files) | set(other_build_files)):
+        if file_name not in other_build_files:
+            differences.append(f"`{file_name}` is only in the first build")
+        elif file_name not in build_files:
+            differences.append(f"`{file_name}` is only in the second build")
+        elif build_files[file_name] != other_build_files[file_name]:
+            data = build_files[file_name]
+            other_data = other_build_files[file_name]
+            offset = next(
+                (i for i, (a, b) in enumerate(zip(data, other_data)) if a != b),
+                min(len(data), len(other_data)),
+            )
+            start = max(offset - DIFF_CONTEXT, 0)
+            end = offset + DIFF_CONTEXT
+            differences.append(
+                f"`{file_name}` differs at character {offset}: "
+                f"{data[start:end]!r} != {other_data[start:end]!r}"
+            )
+
+    return differences
@@ -7,6 +7,19 @@ from paignion.item import PaignionItem
 class PaignionRoom(object):
     """Describe a Paignion room."""
 
+    __slots__ = (
+        "name",
+        "description",
+        "north",
+        "east",
+        "south",
+        "west",
+        "up",
+        "down",
+        "tangible_items",
+        "intangible_items",
+    )
+
     def __init__(
         self,
         name,
@@ -0,0 +1,475 @@
+import json
+from array import array
+
+from paignion.action_compiler import ActionCompiler
+from paignion.definitions import (
+    DIRECTIONS,
+    FAST_TRAVEL_TABLE_MAX_ROOMS,
+    FAST_TRAVEL_LANDMARKS,
+)
+
+
+def iter_room_actions(room):
+    """Iterate over all the (decompiled) actions defined in a room.
+
+    :param room: the data of a room, as found in the GAME_DATA object
+    :type room: dict
+    :return: a generator of (action, element, key, value) tuples (see
+        `ActionCompiler.decompile_actions()`)
+    """
+    action_compiler = ActionCompiler()
+
+    for item_type in ("tangible", "intangible"):
+        for item in room["items"][item_type]:
+            for used_with_item in item["used_with"]:
+                if used_with_item["actions"]:
+                    yield from action_compiler.decompile_actions(
+                        used_with_item["actions"]
+                    )
+
+
+class RoomGraph(object):
+    """A compact representation of the map of a game.
+
+    Rooms are numbered in the order of the GAME_DATA object. The exits of the room
+    numbered `i` are the room numbers `targets[offsets[i]:offsets[i + 1]]` (in the
+    compressed sparse row format), and `directions` holds the index (in DIRECTIONS) of
+    the direction of each exit. This keeps the graph of a world of a million rooms
+    small and quick to walk. Exits are both the static exits of the rooms and the ones
+    that `set(<direction>, ...)` actions can open during the game.
+    """
+
+    def __init__(self, game_data):
+        """Construct a new instance of RoomGraph.
+
+        :param game_data: the GAME_DATA object
+        :type game_data: dict
+        :return: an instance of RoomGraph
+        """
+        self.room_names = list(game_data)
+        self.room_ids = {
+            room_name: room_id for room_id, room_name in enumerate(self.room_names)
+        }
+        self.offsets = array("l", [0])
+        self.targets = array("l")
+        self.directions = array("b")
+        # Exits leading to rooms that do not exist, as (room name, direction, target)
+        # tuples
+        self.dangling_exits = []
+
+        # Exits opened by actions, per room
+        dynamic_exits = {}
+        for room in game_data.values():
+            for action, element, key, value in iter_room_actions(room):
+                if action == "set" and key in DIRECTIONS and element in game_data:
+                    dynamic_exits.setdefault(element, []).append((key, value))
+
+        room_ids = self.room_ids
+        offsets = self.offsets
+        targets = self.targets
+        directions = self.directions
+        direction_ids = {direction: i for i, direction in enumerate(DIRECTIONS)}
+        for room_name, room in game_data.items():
+            exits = [(direction, room[direction]) for direction in DIRECTIONS]
+            if room_name in dynamic_exits:
+                exits += dynamic_exits[room_name]
+
+            for direction, exit in exits:
+                if exit:
+                    exit_id = room_ids.get(exit)
+                    if exit_id is None:
+                        self.dangling_exits.append((room_name, direction, exit))
+                    else:
+                        targets.append(exit_id)
+                        directions.append(direction_ids[direction])
+
+            offsets.append(len(targets))
+
+    def reachable(self, origin="origin"):
+        """Find the rooms that can be reached from a given room.
+
+        :param origin: the name of the room to start from
+        :type origin: str
+        :return: a bytearray containing 1 for each reachable room, 0 otherwise
+        """
+        offsets, targets = self.offsets, self.targets
+        reachable = bytearray(len(self.room_names))
+
+        origin_id = self.room_ids[origin]
+        reachable[origin_id] = 1
+        rooms_to_visit = [origin_id]
+
+        while rooms_to_visit:
+            room_id = rooms_to_visit.pop()
+            for exit_id in targets[offsets[room_id] : offsets[room_id + 1]]:
+                if not reachable[exit_id]:
+                    reachable[exit_id] = 1
+                    rooms_to_visit.append(exit_id)
+
+        return reachable
+
+    def transpose(self):
+        """Reverse all the exits of the graph.
+
+        :return: a tuple (array, array, array) containing the offsets, targets and
+            directions of the reversed graph, in the same format as the graph itself;
+            the direction of a reversed exit is the direction of the original exit
+        """
+        room_count = len(self.room_names)
+        offsets, targets, directions = self.offsets, self.targets, self.directions
+
+        # Count the entrances of each room, then place the reversed exits
+        reversed_offsets = array("l", [0]) * (room_count + 1)
+        for exit_id in targets:
+            reversed_offsets[exit_id + 1] += 1
+        for room_id in range(room_count):
+            reversed_offsets[room_id + 1] += reversed_offsets[room_id]
+
+        positions = array("l", reversed_offsets[:-1])
+        reversed_targets = array("l", [0]) * len(targets)
+        reversed_directions = array("b", [0]) * len(targets)
+        for room_id in range(room_count):
+            for position in range(offsets[room_id], offsets[room_id + 1]):
+                exit_id = targets[position]
+                reversed_targets[positions[exit_id]] = room_id
+                reversed_directions[positions[exit_id]] = directions[position]
+                positions[exit_id] += 1
+
+        return reversed_offsets, reversed_targets, reversed_directions
+
+    def strongly_connected_components(self):
+        """Find the strongly connected components of the graph (with Tarjan's
+        algorithm, without recursion).
+
+        :return: a tuple (array, int) containing the component of each room and the
+            number of components; components are numbered in reverse topological
+            order, which means that an exit always leads to a room of the same
+            component or of a component with a lower number
+        """
+        room_count = len(self.room_names)
+        offsets, targets = self.offsets, self.targets
+        index = array("l", [-1]) * room_count
+        lowlink = array("l", [0]) * room_count
+        component = array("l", [-1]) * room_count
+        on_stack = bytearray(room_count)
+        stack = []
+        next_index = 0
+        component_count = 0
+
+        for root in range(room_count):
+            if index[root] != -1:
+                continue
+
+            index[root] = lowlink[root] = next_index
+            next_index += 1
+            stack.append(root)
+            on_stack[root] = 1
+            # (room, position of the next exit to follow) pairs
+            call_stack = [(root, offsets[root])]
+
+            while call_stack:
+                room_id, position = call_stack[-1]
+                end = offsets[room_id + 1]
+
+                while position < end:
+                    exit_id = targets[position]
+                    position += 1
+                    if index[exit_id] == -1:
+                        # Visit the exit first, then come back to the next one
+                        call_stack[-1] = (room_id, position)
+                        index[exit_id] = lowlink[exit_id] = next_index
+                        next_index += 1
+                        stack.append(exit_id)
+                        on_stack[exit_id] = 1
+                        call_stack.append((exit_id, offsets[exit_id]))
+                        break
+                    if on_stack[exit_id] and index[exit_id] < lowlink[room_id]:
+                        lowlink[room_id] = index[exit_id]
+                else:
+                    # All the exits of the room have been followed
+                    call_stack.pop()
+                    if lowlink[room_id] == index[room_id]:
+                        while True:
+                            member_id = stack.pop()
+                            on_stack[member_id] = 0
+                            component[member_id] = component_count
+                            if member_id == room_id:
+                                break
+                        component_count += 1
+                    if call_stack:
+                        parent_id = call_stack[-1][0]
+                        if lowlink[room_id] < lowlink[parent_id]:
+                            lowlink[parent_id] = lowlink[room_id]
+
+        return component, component_count
+
+    def analyze(self, origin="origin"):
+        """Analyze the map of the game.
+
+        :param origin: the name of the room the player starts in
+        :type origin: str
+        :return: a dictionary containing the number of rooms (`rooms`), exits
+            (`exits`), reachable rooms (`reachable`) and strongly connected components
+            (`components`) of the map, and the sorted lists of the unreachable rooms
+            (`unreachable_rooms`), of the dangling exits (`dangling_exits`) and of the
+            traps (`traps`), which are the groups of reachable rooms that the player
+            can never leave once they enter them
+        """
+        offsets, targets = self.offsets, self.targets
+        reachable = self.reachable(origin)
+        component, component_count = self.strongly_connected_components()
+
+        # A component that no exit leaves is a trap, unless the player starts in it
+        can_be_left = bytearray(component_count)
+        can_be_left[component[self.room_ids[origin]]] = 1
+        for room_id in range(len(self.room_names)):
+            room_component = component[room_id]
+            for exit_id in targets[offsets[room_id] : offsets[room_id + 1]]:
+                if component[exit_id] != room_component:
+                    can_be_left[room_component] = 1
+                    break
+
+        traps = {}
+        for room_id, room_name in enumerate(self.room_names):
+            if reachable[room_id] and not can_be_left[component[room_id]]:
+                traps.setdefault(component[room_id], []).append(room_name)
+
+        return {
+            "rooms": len(self.room_names),
+            "exits": len(targets),
+            "reachable": reachable.count(1),
+            "components": component_count,
+            "unreachable_rooms": sorted(
+                room_name
+                for room_id, room_name in enumerate(self.room_names)
+                if not reachable[room_id]
+            ),
+            "traps": sorted(sorted(trap) for trap in traps.values()),
+            "dangling_exits": sorted(self.dangling_exits, key=str),
+        }
+
+
+def breadth_first_search(offsets, targets, start):
+    """Walk a graph breadth-first.
+
+    :param offsets: the offsets of the exits of each room (see RoomGraph)
+    :type offsets: array
+    :param targets: the targets of the exits (see RoomGraph)
+    :type targets: array
+    :param start: the room to start from
+    :type start: int
+    :return: a tuple (array, array) containing the distance of each room from the start
+        (-1 if it can not be reached) and the position in `targets` of the exit that
+        first led to each room (-1 for the start & the rooms that can not be reached)
+    """
+    room_count = len(offsets) - 1
+    distances = array("l", [-1]) * room_count
+    via = array("l", [-1]) * room_count
+    distances[start] = 0
+    queue = array("l", [start])
+
+    for room_id in queue:
+        distance = distances[room_id] + 1
+        for position in range(offsets[room_id], offsets[room_id + 1]):
+            exit_id = targets[position]
+            if distances[exit_id] < 0:
+                distances[exit_id] = distance
+                via[exit_id] = position
+                queue.append(exit_id)
+
+    return distances, via
+
+
+def compute_routes(
+    game_data,
+    room_graph=None,
+    max_table_rooms=FAST_TRAVEL_TABLE_MAX_ROOMS,
+    landmark_count=FAST_TRAVEL_LANDMARKS,
+):
+    """Compute the routing table used by the `go to <room>` command of the engine.
+
+    Every room is given a `route_id` (its number in the room graph). Then:
+    - in small worlds (up to `max_table_rooms` rooms), every room gets a `next_hops`
+      string, whose character number `i` is the index (in DIRECTIONS) of the direction
+      to take to get to the room whose `route_id` is `i` the shortest way possible (or
+      `-` if that room can not be reached);
+    - in larger worlds, a few landmark rooms are picked, as far from each other as
+      possible, and routes go through one of them. Every room gets a `landmark_hops`
+      string, whose character number `j` is the direction to take to get to the
+      landmark number `j` (`*` in the landmark itself, `-` if it can not be reached),
+      a `landmark_parents` list, whose element number `j` is the `route_id` of the
+      room the player comes from when following the shortest path from the landmark
+      number `j` (the room's own `route_id` in the landmark itself, -1 if the room can
+      not be reached from it), and a `home_landmark`, the number of the closest
+      landmark the room can be reached from.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param room_graph: the graph of the rooms of the game, if it was already built
+    :type room_graph: RoomGraph
+    :param max_table_rooms: the maximum number of rooms for which a full table is
+        computed
+    :type max_table_rooms: int
+    :param landmark_count: the maximum number of landmarks in larger worlds
+    :type landmark_count: int
+    :return: a tuple (dict, str, int) containing a copy of the GAME_DATA object with
+        the routing table, the kind of routing table (`table` or `landmarks`) and the
+        size of the routing table in the JSON-encoded game data (in bytes)
+    """
+    if room_graph is None:
+        room_graph = RoomGraph(game_data)
+
+    room_count = len(room_graph.room_names)
+    reversed_offsets, reversed_targets, reversed_directions = room_graph.transpose()
+    direction_characters = [str(i) for i in range(len(DIRECTIONS))]
+    routes = [{"route_id": room_id} for room_id in range(room_count)]
+
+    def hops_to(room_id):
+        # The direction to take from every room to get to a given room is the
+        # direction of the reversed exit that led to the room in a breadth-first
+        # search of the reversed graph
+        _, via = breadth_first_search(reversed_offsets, reversed_targets, room_id)
+        return [
+            (
+                direction_characters[reversed_directions[position]]
+                if position >= 0
+                else "-"
+            )
+            for position in via
+        ]
+
+    if room_count <= max_table_rooms:
+        kind = "table"
+        next_hops = [hops_to(room_id) for room_id in range(room_count)]
+        for room_id in range(room_count):
+            routes[room_id]["next_hops"] = "".join(
+                next_hops[target_id][room_id] for target_id in range(room_count)
+            )
+    else:
+        kind = "landmarks"
+        offsets, targets = room_graph.offsets, room_graph.targets
+
+        # The source of each exit, to go back up the breadth-first search trees
+        sources = array("l", [0]) * len(targets)
+        for room_id in range(room_count):
+            for position in range(offsets[room_id], offsets[room_id + 1]):
+                sources[position] = room_id
+
+        landmarks = []
+        closest_distances = array("l", [-1]) * room_count
+        home_landmarks = array("l", [-1]) * room_count
+        landmark = room_graph.room_ids.get("origin", 0)
+
+        while len(landmarks) < landmark_count:
+            landmark_number = len(landmarks)
+            landmarks.append(landmark)
+
+            distances, via = breadth_first_search(offsets, targets, landmark)
+            hops = hops_to(landmark)
+            hops[landmark] = "*"
+            for room_id in range(room_count):
+                route = routes[room_id]
+                route.setdefault("landmark_hops", []).append(hops[room_id])
+                if room_id == landmark:
+                    parent = room_id
+                elif via[room_id] >= 0:
+                    parent = sources[via[room_id]]
+                else:
+                    parent = -1
+                route.setdefault("landmark_parents", []).append(parent)
+
+                distance = distances[room_id]
+                if distance >= 0 and (
+                    closest_distances[room_id] < 0
+                    or distance < closest_distances[room_id]
+                ):
+                    closest_distances[room_id] = distance
+                    home_landmarks[room_id] = landmark_number
+
+            # The next landmark is the room that is the farthest from all of them
+            landmark = max(range(room_count), key=closest_distances.__getitem__)
+            if closest_distances[landmark] <= 0:
+                break
+
+        for room_id in range(room_count):
+            route = routes[room_id]
+            route["landmark_hops"] = "".join(route["landmark_hops"])
+            route["home_landmark"] = max(home_landmarks[room_id], 0)
+
+    routed_game_data = {
+        room_name: dict(room, **routes[room_graph.room_ids[room_name]])
+        for room_name, room in game_data.items()
+    }
+    size = sum(len(json.dumps(route, separators=(",", ":"))) - 1 for route in routes)
+
+    return routed_game_data, kind, size
+
+
+def reachable_rooms(game_data, origin="origin", room_graph=None):
+    """Compute the set of rooms that the player can reach from the origin room.
+
+    Rooms are linked by their static exits, but also by the `set(<direction>, ...)`
+    actions that open new exits during the game. The latter are followed regardless of
+    whether their item interactions can actually happen, so the result may contain
+    more rooms than can truly be reached, but never less.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param origin: the name of the room the player starts in
+    :type origin: str
+    :param room_graph: the graph of the rooms of the game, if it was already built
+    :type room_graph: RoomGraph
+    :return: the set of the names of the reachable rooms
+    """
+    if room_graph is None:
+        room_graph = RoomGraph(game_data)
+    reachable = room_graph.reachable(origin)
+
+    return {
+        room_name
+        for room_id, room_name in enumerate(room_graph.room_names)
+        if reachable[room_id]
+    }
+
+
+def tree_shake(game_data, origin="origin", room_graph=None):
+    """Remove the rooms that the player can never reach from the GAME_DATA object.
+
+    Unreachable rooms that are still the target of an action from a reachable room
+    (for example, `add(..., description, <room>)`), or that own an item targeted by
+    such an action, are kept, as the frontend engine needs them to exist in order to
+    apply the action. Only rooms are removed; the items of the kept rooms are left
+    untouched.
+
+    :param game_data: the GAME_DATA object
+    :type game_data: dict
+    :param origin: the name of the room the player starts in
+    :type origin: str
+    :param room_graph: the graph of the rooms of the game, if it was already built
+    :type room_graph: RoomGraph
+    :return: a tuple (dict, list) containing the shaken GAME_DATA object and the
+        sorted list of the names of the rooms that were removed
+    """
+    kept_rooms = reachable_rooms(game_data, origin, room_graph)
+
+    elements = set()
+    for room_name in kept_rooms:
+        for _, element, _, _ in iter_room_actions(game_data[room_name]):
+            elements.add(element)
+
+    for room_name, room in game_data.items():
+        if room_name in elements or any(
+            item["name"] in elements
+            for item_type in ("tangible", "intangible")
+            for item in room["items"][item_type]
+        ):
+            kept_rooms.add(room_name)
+
+    shaken_game_data = {
+        room_name: room
+        for room_name, room in game_data.items()
+        if room_name in kept_rooms
+    }
+    removed_rooms = sorted(set(game_data) - kept_rooms)
+
+    return shaken_game_data, removed_rooms
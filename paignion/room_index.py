@@ -0,0 +1,110 @@
+import os
+import json
+import time
+
+from paignion.definitions import ROOM_INDEX_VERSION, ROOM_INDEX_MTIME_GRANULARITY
+
+
+def scan_rooms_dir(rooms_dir, index=None):
+    """Recursively collect the room files of a rooms directory.
+
+    Every directory is listed with `os.scandir()` and described in the returned index
+    (its modification time, and the names of its room files & subdirectories). If a
+    previous index is given, the directories whose modification time has not changed
+    since then (meaning that no entry was added, removed or renamed in them) are not
+    listed again; their entries in the previous index are reused as they are.
+
+    File systems with coarse modification times (e.g. FAT or some NFS servers) may not
+    change the modification time of a directory whose entries changed in the same tick
+    as the previous scan, so the directories modified less than
+    ROOM_INDEX_MTIME_GRANULARITY before the previous scan are always listed again.
+
+    Hidden files & directories are ignored.
+
+    :param rooms_dir: the path to the rooms directory
+    :type rooms_dir: str
+    :param index: a previous index of the rooms directory (see `load_room_index()`)
+    :type index: dict
+    :return: the sorted list of the paths to the room files, and the new index of the
+        rooms directory
+    """
+    previous_directories = index["directories"] if index else {}
+    # The directories modified after this time may have changed since the previous scan
+    # even though their modification time is the same
+    trusted_mtime = index["scanned"] - ROOM_INDEX_MTIME_GRANULARITY if index else None
+    scanned = time.time_ns()
+    directories = {}
+    room_files = []
+
+    # Paths relative to the rooms directory, using `/` as the separator
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        directory = os.path.join(rooms_dir, *relative_dir.split("/"))
+        mtime = os.stat(directory).st_mtime_ns
+
+        entry = previous_directories.get(relative_dir)
+        if entry is None or entry["mtime"] != mtime or mtime >= trusted_mtime:
+            files = []
+            subdirectories = []
+            with os.scandir(directory) as dir_entries:
+                for dir_entry in dir_entries:
+                    if dir_entry.name.startswith("."):
+                        continue
+                    # Symbolic links to directories are not followed, as they could
+                    # lead out of the rooms directory (or into a loop)
+                    if dir_entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(dir_entry.name)
+                    elif dir_entry.is_file() and dir_entry.name.endswith(".md"):
+                        files.append(dir_entry.name)
+            entry = {
+                "mtime": mtime,
+                "files": sorted(files),
+                "directories": sorted(subdirectories),
+            }
+        directories[relative_dir] = entry
+
+        room_files += [os.path.join(directory, name) for name in entry["files"]]
+        pending += [
+            f"{relative_dir}/{name}" if relative_dir else name
+            for name in entry["directories"]
+        ]
+
+    return sorted(room_files), {
+        "version": ROOM_INDEX_VERSION,
+        "scanned": scanned,
+        "directories": directories,
+    }
+
+
+def load_room_index(index_file):
+    """Load a persisted index of a rooms directory.
+
+    :param index_file: the path to the index file
+    :type index_file: str
+    :return: the index, or None if the file does not exist or cannot be used (in which
+        case the rooms directory has to be scanned from scratch)
+    """
+    try:
+        with open(index_file, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or index.get("version") != ROOM_INDEX_VERSION:
+        return None
+
+    return index
+
+
+def save_room_index(index_file, index):
+    """Persist the index of a rooms directory.
+
+    :param index_file: the path to the index file
+    :type index_file: str
+    :param index: the index of the rooms directory (see `scan_rooms_dir()`)
+    :type index: dict
+    """
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    with open(index_file, "w") as f:
+        json.dump(index, f, sort_keys=True)
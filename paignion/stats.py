@@ -0,0 +1,144 @@
+import gzip
+import json
+
+from paignion.definitions import ROOM_STATS_COLUMNS
+from paignion.room_graph import iter_room_actions
+
+# The events the costs of the rooms are derived from (see HOOK_EVENTS)
+ROOM_STATS_EVENTS = ["room_parsed", "markdown_rendered"]
+
+# The costs measured in seconds, shown in milliseconds
+ROOM_STATS_TIMES = ["parse_time", "markdown_time"]
+
+
+def room_size_stats(room):
+    """Measure the size of a room in the game data.
+
+    :param room: the data of a room, as found in the GAME_DATA object
+    :type room: dict
+    :return: a dict containing the number of actions (`actions`) and of `used_with`
+        items (`used_with`) of the room, and the size of its JSON serialization
+        (`size`) and of the gzip-compressed serialization (`gzip_size`), in bytes
+    """
+    room_json = json.dumps(room).encode("utf-8")
+
+    return {
+        "actions": sum(1 for _ in iter_room_actions(room)),
+        "used_with": sum(
+            len(item["used_with"])
+            for item_type in ("tangible", "intangible")
+            for item in room["items"][item_type]
+        ),
+        "size": len(room_json),
+        "gzip_size": len(gzip.compress(room_json)),
+    }
+
+
+def warm_up_parser():
+    """Set up what the parser only sets up for its first room.
+
+    The Markdown converter is created (and the YAML loader imported) when the first
+    room is parsed, which would otherwise be counted in the time of that room.
+    """
+    from paignion.parser import PaignionParser
+
+    PaignionParser().parse_room_data("---\n---\nWarming up", "warm_up")
+
+
+class RoomStats(object):
+    """Describe the costs of the rooms of a game.
+
+    The time taken to parse each room (and to render its Markdown) is derived from the
+    events of the parser (see `paignion.hooks`): the `listener()` method is to be added
+    to ROOM_STATS_EVENTS while the rooms are parsed. Markdown strings found in the
+    cache are not rendered again, so their rendering time is only counted for the
+    first room using them.
+    """
+
+    def __init__(self):
+        """Construct a new instance of RoomStats.
+
+        :return: an instance of RoomStats
+        """
+        self.times = {}
+        # The time spent rendering Markdown since the last room was parsed
+        self.markdown_time = 0
+
+    def listener(self, event, data):
+        """Record the times of the rooms on an event of the parser.
+
+        :param event: the name of the event (see ROOM_STATS_EVENTS)
+        :type event: str
+        :param data: the data of the event
+        :type data: dict
+        """
+        if event == "markdown_rendered":
+            self.markdown_time += data["duration"]
+        elif event == "room_parsed":
+            self.times[data["room"]] = {
+                "parse_time": data["duration"],
+                "markdown_time": self.markdown_time,
+            }
+            self.markdown_time = 0
+
+    def report(self, game_data, sort_by=None, top=None):
+        """Collect the costs of the rooms (once they are parsed).
+
+        :param game_data: the GAME_DATA object
+        :type game_data: dict
+        :param sort_by: the cost to sort the rooms by, from the highest to the lowest
+            (see ROOM_STATS_COLUMNS, the size by default)
+        :type sort_by: str
+        :param top: the number of rooms to keep (all of them by default)
+        :type top: int
+        :return: a tuple (list, dict) containing the costs of the rooms (dicts with the
+            `room` name and its costs, see ROOM_STATS_COLUMNS), and the totals of the
+            costs over all the rooms of the game
+        """
+        sort_by = sort_by or list(ROOM_STATS_COLUMNS)[0]
+        room_stats = []
+
+        for room_name, room in game_data.items():
+            times = self.times.get(room_name, {"parse_time": 0, "markdown_time": 0})
+            room_stats.append({"room": room_name, **times, **room_size_stats(room)})
+
+        totals = {
+            column: sum(stats[column] for stats in room_stats)
+            for column in ROOM_STATS_COLUMNS
+        }
+        room_stats.sort(key=lambda stats: stats[sort_by], reverse=True)
+
+        return room_stats[:top], totals
+
+
+def format_stats_table(room_stats, totals):
+    """Format the costs of the rooms as a table.
+
+    :param room_stats: the costs of the rooms (see `RoomStats.report()`)
+    :type room_stats: list
+    :param totals: the totals of the costs
+    :type totals: dict
+    :return: the lines of the table
+    """
+    rows = [["room"] + list(ROOM_STATS_COLUMNS.values())]
+    for stats in room_stats + [dict(totals, room="total")]:
+        rows.append(
+            [stats["room"]]
+            + [
+                (
+                    f"{stats[column] * 1000:.3f}"
+                    if column in ROOM_STATS_TIMES
+                    else str(stats[column])
+                )
+                for column in ROOM_STATS_COLUMNS
+            ]
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return [
+        "  ".join(
+            [row[0].ljust(widths[0])]
+            + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        )
+        for row in rows
+    ]
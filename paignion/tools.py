@@ -1,20 +1,51 @@
-import markdown
+import functools
+import threading
+import time
 
 
-from paignion.definitions import MD_EXTENSIONS, TERMINAL_COLORS
+from paignion import hooks
+from paignion.definitions import MD_EXTENSIONS, MARKDOWN_CACHE_SIZE, TERMINAL_COLORS
 
+# The Markdown converters of the threads (setting up a converter and its extensions
+# takes a lot longer than converting a room description, and converters cannot be
+# shared between threads)
+markdown_converters = threading.local()
 
+
+@functools.lru_cache(maxsize=MARKDOWN_CACHE_SIZE)
 def markdownify(md_string):
     """Convert a Markdown string to HTML.
 
+    The results are cached, as the same strings (e.g. the messages of common items)
+    often appear in many rooms and games.
+
     :param md_string: the Markdown string
     :type md_string: str
     """
     if not md_string:
         return md_string
 
+    start = time.perf_counter()
+    converter = getattr(markdown_converters, "converter", None)
+    if converter is None:
+        # Imported here, as it takes a while and is not needed by every command
+        import markdown
+
+        converter = markdown.Markdown(extensions=MD_EXTENSIONS)
+        markdown_converters.converter = converter
+
     # Apply the Markdown conversion along with extensions
-    return markdown.markdown(md_string, extensions=MD_EXTENSIONS)
+    html = converter.reset().convert(md_string)
+
+    if hooks.listeners["markdown_rendered"]:
+        hooks.emit(
+            "markdown_rendered",
+            size=len(md_string),
+            html_size=len(html),
+            duration=time.perf_counter() - start,
+        )
+
+    return html
 
 
 def color_message(message, color):
@@ -11,6 +11,14 @@ class PaignionUsedWithItem(object):
     Paignion items.
     """
 
+    __slots__ = (
+        "name",
+        "effect_message",
+        "consumes_subject",
+        "consumes_object",
+        "actions",
+    )
+
     def __init__(
         self,
         name,
@@ -18,6 +26,7 @@ class PaignionUsedWithItem(object):
         consumes_subject=False,
         consumes_object=False,
         actions=None,
+        action_compiler=None,
     ):
         """Construct a new instance of PaignionUsedWithItem.
 
@@ -31,6 +40,9 @@ class PaignionUsedWithItem(object):
         :type consumes_object: bool
         :param actions: a list of actions to be executed during the interaction
         :type actions: list
+        :param action_compiler: the compiler to compile the actions with (a new one is
+            created by default)
+        :type action_compiler: ActionCompiler
         """
         self.name = name
         self.effect_message = effect_message
@@ -41,7 +53,8 @@ class PaignionUsedWithItem(object):
         self.verify_attributes()
 
         # Compile actions
-        action_compiler = ActionCompiler()
+        if action_compiler is None:
+            action_compiler = ActionCompiler()
         self.actions = "".join(
             [action_compiler.compile_action(a) for a in self.actions]
         )
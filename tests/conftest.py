@@ -0,0 +1,20 @@
+import pytest
+import shutil
+
+DEMO_DIR = "examples/complete_demo"
+
+
+@pytest.fixture
+def demo_project(tmp_path):
+    """Get a function copying the complete demo project into the temporary directory.
+
+    The function takes the name of the copy (`demo` by default) and returns the path to
+    it, so that the tests can build (and modify) as many copies of the demo as needed.
+    """
+
+    def copy_demo_project(name="demo"):
+        project_dir = str(tmp_path / name)
+        shutil.copytree(DEMO_DIR, project_dir)
+        return project_dir
+
+    return copy_demo_project
@@ -537,3 +537,26 @@ class TestActionCompiler:
             match=r"Undefined token `.+` in `.+`, in action `.+`",
         ):
             ac.compile_action("div(10f, description, origin)")
+
+    def test_decompile_actions(self):
+        ac = ActionCompiler()
+
+        compiled_actions = "".join(
+            [
+                ac.compile_action('set(west, "hidden room", origin)'),
+                ac.compile_action('add(m"_a_; b", description, "old door")'),
+                ac.compile_action("sub(2, amount, coin)"),
+                ac.compile_action("mul(3, amount, coin)"),
+                ac.compile_action("div(4, amount, coin)"),
+            ]
+        )
+
+        assert ac.decompile_actions(compiled_actions) == [
+            ("set", "origin", "west", "hidden room"),
+            ("add", "old door", "description", "<p><em>a</em>; b</p>"),
+            ("sub", "coin", "amount", 2),
+            ("mul", "coin", "amount", 3),
+            ("div", "coin", "amount", 4),
+        ]
+
+        assert ac.decompile_actions("") == []
@@ -0,0 +1,68 @@
+import pytest
+import glob
+import io
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from paignion.api import build_game_data, build_index_html
+from paignion.exceptions import PaignionException
+from paignion.parser import PaignionParser
+
+DEMO_DIR = "examples/complete_demo"
+
+
+def demo_rooms():
+    rooms = {}
+    for room_file in sorted(glob.glob(os.path.join(DEMO_DIR, "rooms", "*.md"))):
+        with open(room_file, "r") as f:
+            rooms[os.path.splitext(os.path.basename(room_file))[0]] = f.read()
+
+    return rooms
+
+
+class TestApi:
+    def test_build_game_data(self):
+        expected_game_data = PaignionParser().parse_room_files(
+            sorted(glob.glob(os.path.join(DEMO_DIR, "rooms", "*.md")))
+        )
+
+        assert build_game_data(demo_rooms()) == expected_game_data
+
+        # Room sources can be bytes or file-like objects too
+        rooms = [
+            (room_name, io.StringIO(room_data) if i % 2 else room_data.encode())
+            for i, (room_name, room_data) in enumerate(demo_rooms().items())
+        ]
+        assert build_game_data(rooms) == expected_game_data
+
+    def test_build_index_html(self, demo_project):
+        project_dir = demo_project()
+        with open(os.devnull, "w") as d:
+            subprocess.run(
+                [sys.executable, "-m", "paignion", "build", project_dir], stdout=d
+            )
+        with open(os.path.join(project_dir, "build", "index.html"), "rb") as f:
+            expected_index_html = f.read()
+
+        assert build_index_html(demo_rooms()) == expected_index_html
+
+    def test_concurrent_builds(self):
+        expected_index_html = build_index_html(demo_rooms(), minify=True)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            index_htmls = list(
+                executor.map(
+                    lambda _: build_index_html(demo_rooms(), minify=True), range(32)
+                )
+            )
+
+        assert index_htmls == [expected_index_html] * 32
+
+    def test_missing_origin_room(self):
+        rooms = demo_rooms()
+        del rooms["origin"]
+
+        with pytest.raises(PaignionException, match=r"Origin room not found"):
+            build_game_data(rooms)
@@ -0,0 +1,83 @@
+import pytest
+import os
+import subprocess
+import sys
+import zipfile
+
+from paignion.batch import expand_project_dirs, project_size, build_projects
+
+DEMO_DIR = "examples/complete_demo"
+
+
+def make_projects(tmp_path, demo_project):
+    project_dirs = [demo_project(name) for name in ["small", "large"]]
+    with open(os.path.join(tmp_path, "large", "rooms", "kitchen.md"), "a") as f:
+        f.write("\nA very long description.\n" * 100)
+    os.makedirs(tmp_path / "broken" / "rooms")
+
+    return project_dirs + [str(tmp_path / "broken")]
+
+
+class TestBatch:
+    def test_expand_project_dirs(self, tmp_path, demo_project):
+        small, large, broken = make_projects(tmp_path, demo_project)
+
+        assert expand_project_dirs([str(tmp_path / "*"), small]) == (
+            [broken, large, small],
+            [],
+        )
+        assert expand_project_dirs([large, str(tmp_path / "missing*")]) == (
+            [large],
+            [str(tmp_path / "missing*")],
+        )
+
+    def test_build_projects(self, tmp_path, demo_project):
+        small, large, broken = make_projects(tmp_path, demo_project)
+        assert project_size(large) > project_size(small) > project_size(broken) == 0
+
+        # The largest projects are built first
+        results = list(build_projects([small, broken, large], {}, jobs=1))
+        assert [result["project_dir"] for result in results] == [large, small, broken]
+
+        # Failed builds do not abort the other ones
+        results = {
+            result["project_dir"]: result
+            for result in build_projects([small, broken, large], {}, jobs=2)
+        }
+        assert sorted(results) == sorted([small, broken, large])
+        assert "Invalid project directory" in results[broken]["error"]
+        for project_dir in [small, large]:
+            assert results[project_dir]["error"] is None
+            assert "Done!" in results[project_dir]["output"]
+            assert os.path.isfile(os.path.join(project_dir, "build", "index.html"))
+
+    def test_build_packed_projects(self, tmp_path):
+        # Packed projects stored side by side are built into separate directories
+        packed_projects = []
+        for name in ["first", "second"]:
+            archive_path = str(tmp_path / f"{name}.zip")
+            with zipfile.ZipFile(archive_path, "w") as archive:
+                for file_name in os.listdir(os.path.join(DEMO_DIR, "rooms")):
+                    archive.write(
+                        os.path.join(DEMO_DIR, "rooms", file_name), f"rooms/{file_name}"
+                    )
+            packed_projects.append(archive_path)
+
+        results = list(build_projects(packed_projects, {}, jobs=2))
+        assert [result["error"] for result in results] == [None, None]
+        for name in ["first", "second"]:
+            assert os.path.isfile(tmp_path / f"{name}-build" / "index.html")
+        assert not os.path.exists(tmp_path / "build")
+
+    def test_batch_build_command(self, tmp_path, demo_project):
+        make_projects(tmp_path, demo_project)
+
+        res = subprocess.run(
+            [sys.executable, "-m", "paignion", "build", str(tmp_path / "*"), "-j", "2"],
+            stdout=subprocess.PIPE,
+        )
+        output = res.stdout.decode("utf-8")
+
+        assert res.returncode == 1
+        assert "Built 2 game(s)" in output
+        assert "1 failure(s)" in output
@@ -0,0 +1,132 @@
+import pytest
+import os
+from argparse import Namespace
+
+from paignion.__main__ import paignion_build, parse_project
+from paignion.budgets import (
+    budget_breakdown,
+    check_budgets,
+    load_project_budgets,
+    measure_budgets,
+    room_sizes,
+)
+from paignion.builder import minify_game_data
+from paignion.exceptions import PaignionException
+
+
+def make_project(demo_project, config=None):
+    project_dir = demo_project()
+    if config is not None:
+        with open(os.path.join(project_dir, "paignion.yaml"), "w") as f:
+            f.write(config)
+
+    return project_dir
+
+
+def make_game_data():
+    return {
+        "origin": {
+            "description": "<p>A small room.</p>",
+            "items": {
+                "tangible": [
+                    {"name": "book", "description": "<p>" + "A book. " * 20 + "</p>"}
+                ],
+                "intangible": [],
+            },
+        },
+        "hall": {
+            "description": "<p>" + "A long hall. " * 10 + "</p>",
+            "items": {"tangible": [], "intangible": []},
+        },
+    }
+
+
+class TestBudgets:
+    def test_load_project_budgets(self, demo_project):
+        project_dir = make_project(demo_project)
+        assert load_project_budgets(project_dir) == {}
+
+        with open(os.path.join(project_dir, "paignion.yaml"), "w") as f:
+            f.write("budgets:\n  room_size: 1000\n  warn: true\n")
+        assert load_project_budgets(project_dir) == {"room_size": 1000, "warn": True}
+
+        with open(os.path.join(project_dir, "paignion.yaml"), "w") as f:
+            f.write("budgets:\n  room_count: 1000\n")
+        with pytest.raises(PaignionException, match=r"Unknown budget `room_count`"):
+            load_project_budgets(project_dir)
+
+        with open(os.path.join(project_dir, "paignion.yaml"), "w") as f:
+            f.write("budgets:\n  room_size: 10kB\n")
+        with pytest.raises(PaignionException, match=r"must be a size in bytes"):
+            load_project_budgets(project_dir)
+
+    def test_check_budgets(self):
+        game_data = make_game_data()
+        build_files = {"index.html": "x" * 1000}
+        sections = {"paignion_js": "x" * 500, "main_css": "", "game_data_json": "{}"}
+
+        measurements = measure_budgets(game_data, build_files, sections)
+        assert measurements["description_size"] == (167, "item `book` of room `origin`")
+        assert measurements["room_size"][1] == "room `origin`"
+        assert measurements["engine_size"] == (500, None)
+        assert measurements["total_gzip_size"][0] < 1000
+
+        # Only the budgets asked for are measured
+        assert list(
+            measure_budgets(game_data, build_files, sections, ["room_size"])
+        ) == ["room_size"]
+
+        assert check_budgets(
+            {"engine_size": 400, "description_size": 200, "room_size": None},
+            measurements,
+        ) == [("engine_size", 500, 400, None)]
+
+        lines = budget_breakdown(game_data, build_files, sections, top_rooms=1)
+        assert lines[0].startswith("engine: 500 bytes (")
+        assert lines[3] == "HTML templates: 498 bytes"
+        assert lines[4].startswith("room `origin`: ")
+        assert len(lines) == 5
+
+    def test_build_budgets(self, demo_project, capsys):
+        project_dir = make_project(demo_project, "budgets:\n  description_size: 10\n")
+
+        with pytest.raises(PaignionException, match=r"exceeds 1 budget\(s\)"):
+            paignion_build(Namespace(project_dir=project_dir))
+        # Builds exceeding their budgets are not written
+        assert not os.path.exists(os.path.join(project_dir, "build"))
+        output = capsys.readouterr().out
+        assert "Budget `description_size` exceeded" in output
+        assert "engine: " in output
+
+        # Budgets given on the command line override the ones of the project
+        paignion_build(
+            Namespace(project_dir=project_dir, budget_description_size=100000)
+        )
+        assert os.path.exists(os.path.join(project_dir, "build", "index.html"))
+
+        paignion_build(
+            Namespace(project_dir=project_dir, budget_engine_size=10, budget_warn=True)
+        )
+        output = capsys.readouterr().out
+        assert "Warning: budget `description_size` exceeded" in output
+        assert "Warning: budget `engine_size` exceeded" in output
+
+    def test_minified_budgets(self, demo_project):
+        project_dir = demo_project()
+        game_data = parse_project(project_dir)
+        room_size = room_sizes(game_data)[0][1]
+        minified_room_size = room_sizes(minify_game_data(game_data), compact=True)[0][1]
+        assert minified_room_size < room_size
+
+        # Minified builds are measured as they are emitted
+        paignion_build(
+            Namespace(
+                project_dir=project_dir,
+                minify=True,
+                budget_room_size=minified_room_size,
+            )
+        )
+        with pytest.raises(PaignionException, match=r"exceeds 1 budget\(s\)"):
+            paignion_build(
+                Namespace(project_dir=project_dir, budget_room_size=minified_room_size)
+            )
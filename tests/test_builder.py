@@ -0,0 +1,238 @@
+import pytest
+import json
+import os
+import re
+
+from paignion.builder import (
+    dump_game_data,
+    encode_json_data,
+    render_index_html,
+    render_build_files,
+    content_hash,
+    game_data_format_report,
+    detect_engine_features,
+    strip_engine_features,
+)
+from paignion.definitions import GAME_DATA_FORMATS, ENGINE_FEATURES, FRONTEND_DIR
+from paignion.exceptions import PaignionException
+
+
+TRICKY_GAME_DATA = {
+    "origin": {
+        "description": "<p>It's a </script><script>alert('trap')</script> <!-- room",
+        "items": {"tangible": [], "intangible": []},
+    }
+}
+
+
+class TestBuilder:
+    def test_script_format(self):
+        html, js = encode_json_data(dump_game_data(TRICKY_GAME_DATA), "script")
+
+        assert html.startswith('<script type="application/json" id="game-data">\n')
+        assert js == (
+            "let GAME_DATA = JSON.parse("
+            'document.getElementById("game-data").textContent);'
+        )
+
+        # The data should not be able to close or alter the <script> element
+        payload = html[html.index(">") + 1 : html.rindex("</script>")]
+        assert "</" not in payload
+        assert "<!--" not in payload
+
+        # The payload must still decode to the exact same data
+        assert json.loads(payload) == TRICKY_GAME_DATA
+
+    def test_json_parse_format(self):
+        html, js = encode_json_data(dump_game_data(TRICKY_GAME_DATA), "json-parse")
+
+        assert html == ""
+        assert js.startswith("let GAME_DATA = JSON.parse('")
+        assert js.endswith("');")
+        assert "</" not in js
+
+        # Undo the JS string escaping to get the string passed to JSON.parse()
+        payload = js[len("let GAME_DATA = JSON.parse('") : -len("');")]
+        payload = payload.replace("\\'", "'").replace("\\\\", "\\")
+        assert json.loads(payload) == TRICKY_GAME_DATA
+
+    def test_literal_format(self):
+        html, js = encode_json_data(dump_game_data(TRICKY_GAME_DATA), "literal")
+
+        assert html == ""
+        assert "</" not in js
+        assert json.loads(js[len("let GAME_DATA = ") : -1]) == TRICKY_GAME_DATA
+
+    def test_unknown_format(self):
+        with pytest.raises(PaignionException, match=r"Unknown game data format"):
+            encode_json_data(dump_game_data(TRICKY_GAME_DATA), "yaml")
+
+    def test_render_index_html(self):
+        index_html = render_index_html(
+            game_data=TRICKY_GAME_DATA,
+            main_css="body {}",
+            paignion_js="setup();",
+        )
+
+        # The game data must come before the engine
+        assert index_html.index('id="game-data"') < index_html.index("setup();")
+        assert index_html.index("let GAME_DATA") < index_html.index("setup();")
+
+    def test_game_data_format_report(self):
+        report = game_data_format_report(TRICKY_GAME_DATA, repeat=1)
+
+        assert [entry["format"] for entry in report] == GAME_DATA_FORMATS
+        for entry in report:
+            assert entry["size"] > 0
+            if entry["format"] == "literal":
+                assert entry["decode_time"] is None
+            else:
+                assert entry["decode_time"] >= 0
+
+    def test_minified_index_html(self):
+        game_data = {
+            "origin": {
+                "description": "<p>a\nb</p>\n<p>c</p>",
+                "items": {
+                    "tangible": [
+                        {
+                            "name": "x",
+                            "description": "<p>d</p>\n",
+                            "used_with": [
+                                {"name": "y", "effect_message": "<p>e</p>\n"}
+                            ],
+                        }
+                    ],
+                    "intangible": [{"name": "y", "description": None, "used_with": []}],
+                },
+            }
+        }
+
+        index_html = render_index_html(
+            game_data=game_data,
+            main_css="body {\n    margin: 0;\n}\n",
+            paignion_js="// Comment\nlet a = 1;\n",
+            minify=True,
+        )
+
+        assert index_html.startswith("<!DOCTYPE html><html><head>")
+        assert '<style type="text/css">body{margin:0}</style>' in index_html
+        assert "// Comment" not in index_html
+        assert (
+            '{"origin":{"description":"<p>a b<\\/p><p>c<\\/p>","items":'
+            '{"tangible":[{"name":"x","description":"<p>d<\\/p>","used_with":'
+            '[{"name":"y","effect_message":"<p>e<\\/p>"}]}],"intangible":'
+            '[{"name":"y","description":null,"used_with":[]}]}}}'
+        ) in index_html
+
+        # The original game data should not have been modified
+        assert game_data["origin"]["description"] == "<p>a\nb</p>\n<p>c</p>"
+
+    def test_split_build(self):
+        files = render_build_files(
+            game_data=TRICKY_GAME_DATA,
+            main_css="body {}",
+            paignion_js="setup();",
+            split=True,
+        )
+
+        assert len(files) == 4
+        file_names = sorted(files)
+        assert file_names[0].startswith("game-data.") and file_names[0].endswith(
+            ".json"
+        )
+        assert file_names[1] == "index.html"
+        assert file_names[2].startswith("main.") and file_names[2].endswith(".css")
+        assert file_names[3].startswith("paignion.") and file_names[3].endswith(".js")
+
+        # File names should contain the hash of their contents
+        for file_name, file_data in files.items():
+            if file_name != "index.html":
+                assert file_name.split(".")[1] == content_hash(file_data)
+                assert file_name in files["index.html"]
+
+        assert json.loads(files[file_names[0]]) == TRICKY_GAME_DATA
+        # Failed requests for the game data show an error message
+        assert "response.ok" in files["index.html"]
+        assert ".catch(" in files["index.html"]
+
+        # A content update should only change the game data file
+        other_files = render_build_files(
+            game_data={"origin": {}},
+            main_css="body {}",
+            paignion_js="setup();",
+            split=True,
+        )
+        changed_files = set(other_files) - set(files)
+        assert len(changed_files) == 1
+        assert changed_files.pop().startswith("game-data.")
+
+    def test_detect_engine_features(self):
+        room = {"items": {"tangible": [], "intangible": []}}
+        assert detect_engine_features({"origin": room}) == set()
+
+        item = {"name": "x", "used_with": []}
+        room = {"items": {"tangible": [item], "intangible": []}}
+        assert detect_engine_features({"origin": room}) == {"items"}
+
+        item = {"name": "x", "used_with": [{"name": "y", "actions": ""}]}
+        room = {"items": {"tangible": [], "intangible": [item]}}
+        assert detect_engine_features({"origin": room}) == {"items", "used_with"}
+
+        item = {"name": "x", "used_with": [{"name": "y", "actions": "a = 1;"}]}
+        room = {"items": {"tangible": [], "intangible": [item]}}
+        assert detect_engine_features({"origin": room}) == {
+            "items",
+            "used_with",
+            "actions",
+        }
+
+        room = {"route_id": 0, "items": {"tangible": [], "intangible": []}}
+        assert detect_engine_features({"origin": room}) == {"travel"}
+
+    def test_strip_engine_features(self):
+        paignion_js = """\
+let a = 1;
+// @feature-begin used_with
+function use ()
+{
+    // @feature-begin actions
+    eval(actions);
+    // @feature-end actions
+}
+// @feature-end used_with
+help("go" +
+     // @feature-begin used_with
+     "use" +
+     // @feature-end used_with
+     "help");
+"""
+
+        assert strip_engine_features(paignion_js, set()) == (
+            'let a = 1;\nhelp("go" +\n     "help");\n'
+        )
+        assert strip_engine_features(paignion_js, {"used_with"}) == (
+            "let a = 1;\n"
+            "function use ()\n{\n}\n"
+            'help("go" +\n     "use" +\n     "help");\n'
+        )
+        assert strip_engine_features(paignion_js, {"used_with", "actions"}) == (
+            "let a = 1;\n"
+            "function use ()\n{\n    eval(actions);\n}\n"
+            'help("go" +\n     "use" +\n     "help");\n'
+        )
+
+    def test_frontend_engine_features(self):
+        with open(os.path.join(FRONTEND_DIR, "paignion.js"), "r") as f:
+            paignion_js = f.read()
+
+        # All the feature regions of the engine should be known & well-formed
+        features = set(re.findall(r"// @feature-begin (\w+)", paignion_js))
+        assert features == set(ENGINE_FEATURES)
+        assert "@feature" not in strip_engine_features(paignion_js, set())
+        assert "@feature" not in strip_engine_features(paignion_js, features)
+        assert "handleUseAction" not in strip_engine_features(paignion_js, {"items"})
+        # The commands that are always handled stay in the help
+        assert "inventory: look at your inventory" in strip_engine_features(
+            paignion_js, set()
+        )
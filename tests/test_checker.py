@@ -0,0 +1,77 @@
+import pytest
+import glob
+import os
+
+from paignion.checker import check_room_file, check_room_files
+
+TEST_DATA_DIR = "tests/test_data"
+ROOMS_OK_DIR = os.path.join(TEST_DATA_DIR, "rooms_ok")
+ROOMS_KO_DIR = os.path.join(TEST_DATA_DIR, "rooms_ko")
+
+
+class TestChecker:
+    def test_valid_rooms(self):
+        room_files = sorted(glob.glob(os.path.join(ROOMS_OK_DIR, "*.md")))
+
+        assert check_room_files(room_files) == {}
+
+    def test_invalid_rooms(self):
+        room_files = sorted(glob.glob(os.path.join(ROOMS_KO_DIR, "*.md")))
+        errors = check_room_files(room_files)
+
+        # Every error should be reported, not only the first one
+        assert sorted(errors) == room_files
+
+        # The causes of the errors should be reported too
+        messages = errors[os.path.join(ROOMS_KO_DIR, "missing_tangible_item_name.md")]
+        assert len(messages) == 2
+        assert "Could not parse tangible item" in messages[0]
+        assert "Name missing for item" in messages[1]
+
+    def test_parallel_check(self):
+        room_files = sorted(glob.glob(os.path.join(TEST_DATA_DIR, "rooms_*", "*.md")))
+
+        assert check_room_files(room_files, jobs=2) == check_room_files(room_files)
+
+    def test_nested_rooms(self, tmp_path):
+        rooms_dir = tmp_path / "rooms"
+        room_file = rooms_dir / "forest" / "clearing.md"
+        room_file.parent.mkdir(parents=True)
+        room_file.write_text("Just a description.\n")
+
+        # The rooms are named after their path in the rooms directory
+        errors = check_room_files(
+            [str(room_file)], rooms_dirs={str(room_file): str(rooms_dir)}
+        )
+        assert "room `forest/clearing`" in errors[str(room_file)][0]
+        assert "room `clearing`" in check_room_file(str(room_file))[0]
+
+    def test_malformed_files(self, tmp_path):
+        room_file = tmp_path / "no_header.md"
+        room_file.write_text("Just a description.\n")
+        assert "YAML header not found" in check_room_file(str(room_file))[0]
+
+        room_file = tmp_path / "bad_yaml.md"
+        room_file.write_text("---\nnorth: [kitchen\n---\n\nDescription.\n")
+        assert "Invalid YAML header" in check_room_file(str(room_file))[0]
+
+        room_file = tmp_path / "bad_action.md"
+        room_file.write_text(
+            "---\n"
+            "items:\n"
+            "    intangible:\n"
+            "        - name: lever\n"
+            "          used_with:\n"
+            "            - name: hand\n"
+            "              effect_message: Pulled.\n"
+            "              actions:\n"
+            "                - pull(lever)\n"
+            "---\n"
+            "\n"
+            "Description.\n"
+        )
+        assert "pull(lever)" in check_room_file(str(room_file))[0]
+
+        room_file = tmp_path / "bad_items.md"
+        room_file.write_text("---\nitems: 3\n---\n\nDescription.\n")
+        assert check_room_file(str(room_file))[0].startswith("TypeError")
@@ -0,0 +1,134 @@
+import pytest
+import os
+import stat
+import tempfile
+import threading
+import time
+from argparse import Namespace
+
+from paignion.__main__ import paignion_build
+from paignion import daemon as daemon_module
+from paignion.daemon import (
+    PaignionDaemon,
+    default_socket_path,
+    send_request,
+    forward_build,
+)
+from paignion.exceptions import PaignionException
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = PaignionDaemon(str(tmp_path / "paignion.sock"))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    while send_request(daemon.socket_path, {"command": "ping"}) is None:
+        time.sleep(0.01)
+
+    yield daemon
+
+    daemon.shutdown()
+    thread.join()
+
+
+class TestDaemon:
+    def test_build(self, daemon, demo_project, capsys):
+        project_dir = demo_project()
+        index_html = os.path.join(project_dir, "build", "index.html")
+
+        paignion_build(Namespace(project_dir=project_dir))
+        with open(index_html, "r") as f:
+            expected_index_html = f.read()
+        expected_output = capsys.readouterr().out
+        os.remove(index_html)
+
+        assert forward_build(daemon.socket_path, Namespace(project_dir=project_dir))
+        assert capsys.readouterr().out == expected_output
+        with open(index_html, "r") as f:
+            assert f.read() == expected_index_html
+
+        # The parsed rooms are kept, and only the changed ones are parsed again
+        room_cache = daemon.room_caches[os.path.abspath(project_dir)]
+        assert len(room_cache) == 3
+        kitchen_file = os.path.join(project_dir, "rooms", "kitchen.md")
+        origin_room = room_cache[os.path.join(project_dir, "rooms", "origin.md")]
+        with open(kitchen_file, "a") as f:
+            f.write("\nThe kitchen smells of bread.\n")
+
+        assert forward_build(daemon.socket_path, Namespace(project_dir=project_dir))
+        assert room_cache[os.path.join(project_dir, "rooms", "origin.md")] is (
+            origin_room
+        )
+        with open(index_html, "r") as f:
+            assert "smells of bread" in f.read()
+
+    def test_build_errors(self, tmp_path, daemon):
+        with pytest.raises(PaignionException, match=r"Invalid project directory"):
+            forward_build(
+                daemon.socket_path, Namespace(project_dir=str(tmp_path / "nothing"))
+            )
+
+        with pytest.raises(PaignionException, match=r"already listening"):
+            PaignionDaemon(daemon.socket_path).serve_forever()
+
+    def test_fallback(self, tmp_path, demo_project, capsys):
+        project_dir = demo_project()
+        socket_path = str(tmp_path / "paignion.sock")
+
+        assert not forward_build(socket_path, Namespace(project_dir=project_dir))
+
+        paignion_build(
+            Namespace(project_dir=project_dir, daemon=True, socket=socket_path)
+        )
+        assert "building in-process" in capsys.readouterr().out
+        assert os.path.isfile(os.path.join(project_dir, "build", "index.html"))
+
+    def test_private_socket(self, daemon):
+        assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+
+    def test_default_socket_path(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert default_socket_path() == str(tmp_path / "paignion.sock")
+
+        # Without a runtime directory, the socket is in a private directory
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        socket_path = default_socket_path()
+        private_dir = os.path.dirname(socket_path)
+        assert os.path.dirname(private_dir) == str(tmp_path)
+        assert stat.S_IMODE(os.stat(private_dir).st_mode) == 0o700
+        assert default_socket_path() == socket_path
+
+        os.chmod(private_dir, 0o755)
+        with pytest.raises(PaignionException, match=r"is not private"):
+            default_socket_path()
+
+    def test_invalid_requests(self, tmp_path, daemon):
+        def build(cwd, options):
+            return send_request(
+                daemon.socket_path, {"command": "build", "cwd": cwd, "options": options}
+            )["error"]
+
+        project_dir = str(tmp_path / "nothing")
+        assert "Invalid working directory" in build("relative", {"project_dir": "."})
+        assert "No project directory" in build(str(tmp_path), {})
+        assert "Unknown build option `room_cache`" in build(
+            str(tmp_path), {"project_dir": project_dir, "room_cache": {}}
+        )
+        assert "Invalid value for build option `minify`" in build(
+            str(tmp_path), {"project_dir": project_dir, "minify": "yes"}
+        )
+        assert not daemon.room_caches
+
+    def test_bounded_room_caches(self, demo_project, monkeypatch):
+        monkeypatch.setattr(daemon_module, "DAEMON_MAX_PROJECTS", 2)
+        daemon = PaignionDaemon("unused.sock")
+        first_dir, second_dir, third_dir = (
+            demo_project(name) for name in ["first", "second", "third"]
+        )
+
+        for project_dir in [first_dir, second_dir, first_dir, third_dir]:
+            assert daemon.build(os.getcwd(), {"project_dir": project_dir})[1] is None
+
+        # The least recently built project is dropped
+        assert list(daemon.room_caches) == [first_dir, third_dir]
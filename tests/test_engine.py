@@ -0,0 +1,236 @@
+import pytest
+import glob
+import json
+import shutil
+import subprocess
+
+from paignion.builder import read_frontend_file
+from paignion.definitions import COMPILED_ACTIONS_CACHE_SIZE
+from paignion.engine import PaignionEngine, decompile_cached_actions, html_to_text
+from paignion.parser import PaignionParser
+from paignion.room_graph import compute_routes
+from paignion.exceptions import PaignionEngineException
+
+
+def parse_complete_demo():
+    return PaignionParser().parse_room_files(
+        sorted(glob.glob("examples/complete_demo/rooms/*.md"))
+    )
+
+
+# Runs the frontend engine with Node.js (with just enough of a DOM for it to work) on a
+# list of commands, and prints the resulting GAME_DATA object
+FRONTEND_ENGINE_HARNESS = """\
+const element = () => ({{addEventListener() {{}}, append() {{}}, focus() {{}}}});
+global.window = {{}};
+global.document = {{createElement: element, getElementsByTagName: () => [element()]}};
+let GAME_DATA = {game_data};
+{paignion_js}
+for (const command of {commands}) {{
+    input.value = command;
+    handleInput();
+}}
+console.log(JSON.stringify(GAME_DATA));
+"""
+
+
+def run_frontend_engine(game_data, commands):
+    res = subprocess.run(
+        [
+            "node",
+            "-e",
+            FRONTEND_ENGINE_HARNESS.format(
+                game_data=json.dumps(game_data),
+                paignion_js=read_frontend_file("paignion.js"),
+                commands=json.dumps(commands),
+            ),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert res.returncode == 0, res.stderr.decode("utf-8")
+
+    return json.loads(res.stdout)
+
+
+class TestEngine:
+    def test_complete_demo(self):
+        engine = PaignionEngine(parse_complete_demo())
+
+        assert engine.current_room_name == "origin"
+        assert html_to_text(engine.run("take book")) == "You've taken the book."
+        assert html_to_text(engine.run("take coin")) == "You've taken a coin."
+        assert html_to_text(engine.run("take painting")) == "You cannot take that."
+
+        # Downstairs is closed until the book is put on its display
+        engine.run("go down")
+        assert engine.current_room_name == "origin"
+
+        feedback = engine.run("use book with book display")
+        assert "sinks into the floor" in feedback
+        assert "stairwell going <em>down</em>" in engine.current_room["description"]
+        assert engine.get_item_from_inventory("book") is None
+
+        engine.run("go down")
+        assert engine.current_room_name == "basement"
+        assert "hidden basement" in engine.description
+
+        engine.run("go up")
+        engine.run("go east")
+        assert engine.current_room_name == "kitchen"
+        assert "Wet coins" in engine.run("use coin on sink")
+        assert engine.get_item_from_inventory("coin")["effect"] == "wet"
+
+    def test_game_data_is_copied(self):
+        game_data = parse_complete_demo()
+        engine = PaignionEngine(game_data)
+        engine.run("take book")
+        engine.run("use book with book display")
+
+        assert game_data["origin"]["down"] is None
+
+    def test_features(self):
+        game_data = parse_complete_demo()
+
+        # Without the `use` command, the engine does not understand it (just like a
+        # built game which does not use it)
+        engine = PaignionEngine(game_data, features={"items"})
+        engine.run("take book")
+        feedback = html_to_text(engine.run("use book with book display"))
+        assert feedback.startswith("I don't understand that.")
+        assert "use <item>" not in html_to_text(engine.run("help"))
+
+        engine = PaignionEngine(game_data)
+        assert "use <item>" in html_to_text(engine.run("help"))
+
+        # The commands that are always handled are always listed
+        engine = PaignionEngine(game_data, features=set())
+        help_text = html_to_text(engine.run("help"))
+        assert "look (around room" in help_text
+        assert "inventory: look at your inventory" in help_text
+
+    def test_unknown_action_target(self):
+        game_data = parse_complete_demo()
+        game_data["kitchen"]["items"]["intangible"][0]["used_with"][1][
+            "actions"
+        ] = 'getRoomOrItem("nowhere")["effect"] = "wet";'
+        engine = PaignionEngine(game_data)
+        engine.run("take coin")
+        engine.run("go east")
+
+        with pytest.raises(PaignionEngineException, match=r"`nowhere`"):
+            engine.run("use coin on sink")
+
+    def test_walkthrough(self):
+        engine = PaignionEngine(parse_complete_demo())
+        lines = [
+            "# Open the basement",
+            "take book",
+            "? You've taken the book.",
+            "",
+            "use book with book display",
+            "? sinks into the floor",
+            "go down",
+            "@ basement",
+            "? This is not there",
+            "@ kitchen",
+        ]
+
+        command_count, failures = engine.run_walkthrough(lines)
+
+        assert command_count == 3
+        assert [line_number for line_number, _ in failures] == [9, 10]
+        assert "This is not there" in failures[0][1]
+        assert "`kitchen`" in failures[1][1]
+
+    def test_actions_on_other_rooms_items(self):
+        game_data = parse_complete_demo()
+        game_data["kitchen"]["items"]["intangible"][0]["used_with"][1][
+            "actions"
+        ] = 'getRoomOrItem("painting")["effect"] = "wet";'
+        engine = PaignionEngine(game_data)
+        engine.run("take coin")
+        engine.run("go east")
+        engine.run("use coin on sink")
+
+        assert engine.game_data["origin"]["items"]["intangible"][0]["effect"] == "wet"
+
+        # Decompiled actions are kept in a bounded cache shared by all the engines
+        cache_info = decompile_cached_actions.cache_info()
+        assert cache_info.maxsize == COMPILED_ACTIONS_CACHE_SIZE
+        assert cache_info.currsize > 0
+
+    def test_state(self):
+        engine = PaignionEngine(parse_complete_demo())
+        initial_state = engine.get_state()
+        assert initial_state == ("origin", "[]", ())
+
+        engine.run("take book")
+        engine.run("take coin")
+        engine.run("use book with book display")
+        engine.run("go east")
+        state = engine.get_state()
+        game_data = json.loads(json.dumps(engine.game_data))
+
+        # Only the fields that changed are part of the state
+        assert state[0] == "kitchen"
+        assert [(room_name, key) for room_name, key, _ in state[2]] == [
+            ("origin", "description"),
+            ("origin", "down"),
+            ("origin", "items"),
+        ]
+
+        engine.set_state(initial_state)
+        assert engine.game_data == PaignionEngine(parse_complete_demo()).game_data
+        assert engine.inventory == []
+        assert engine.get_state() == initial_state
+
+        engine.set_state(state)
+        assert engine.game_data == game_data
+        assert engine.current_room_name == "kitchen"
+        assert engine.get_state() == state
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+    def test_actions_on_other_rooms_items_in_frontend(self):
+        game_data = parse_complete_demo()
+        game_data["kitchen"]["items"]["intangible"][0]["used_with"][1][
+            "actions"
+        ] = 'getRoomOrItem("painting")["effect"] = "wet";'
+        commands = ["take coin", "go east", "use coin on sink"]
+
+        # Both engines should end up with the same game data
+        frontend_game_data = run_frontend_engine(game_data, commands)
+        engine = PaignionEngine(game_data)
+        for command in commands:
+            engine.run(command)
+
+        assert frontend_game_data == engine.game_data
+        assert frontend_game_data["origin"]["items"]["intangible"][0]["effect"] == "wet"
+
+    def test_travel(self):
+        game_data, _, _ = compute_routes(parse_complete_demo())
+        engine = PaignionEngine(game_data)
+
+        assert (
+            html_to_text(engine.run("go to kitchen")) == "You haven't been there yet."
+        )
+        engine.run("take book")
+        engine.run("use book with book display")
+        engine.run("go down")
+        engine.run("go up")
+        engine.run("go east")
+
+        assert html_to_text(engine.run("go to basement")) == "You go west, then down."
+        assert engine.current_room_name == "basement"
+        # The rooms by route ID are only gathered once
+        room_names_by_route_id = engine.room_names_by_route_id
+        assert len(room_names_by_route_id) == len(game_data)
+        assert html_to_text(engine.run("go to basement")) == "You are already there."
+        assert html_to_text(engine.run("go to kitchen")) == "You go up, then east."
+        assert engine.room_names_by_route_id is room_names_by_route_id
+
+        # Without the routing table, `go to` is not a thing
+        engine = PaignionEngine(parse_complete_demo())
+        engine.run("go east")
+        engine.run("go west")
+        assert html_to_text(engine.run("go to kitchen")) == "You cannot go kitchen."
@@ -0,0 +1,167 @@
+import pytest
+import glob
+import time
+
+from paignion.explorer import PaignionExplorer
+from paignion.parser import PaignionParser
+from paignion.room import PaignionRoom
+from paignion.item import PaignionItem
+from paignion.used_with_item import PaignionUsedWithItem
+from paignion.exceptions import PaignionException
+
+
+def make_game_data(*rooms):
+    game_data = {}
+    for room in rooms:
+        game_data.update(room.dump())
+    return game_data
+
+
+def make_dungeon():
+    # The key opens the vault, but it can also be wasted on the trapdoor (which leads
+    # to a pit the player can not get out of)
+    key = PaignionItem(name="key", description="A key.")
+    door = PaignionItem(
+        name="door",
+        description="A door.",
+        used_with=[
+            PaignionUsedWithItem(
+                name="key",
+                effect_message="Unlocked.",
+                consumes_subject=True,
+                actions=['set(west, "vault", origin)'],
+            )
+        ],
+    )
+    trapdoor = PaignionItem(
+        name="trapdoor",
+        description="A trapdoor.",
+        used_with=[
+            PaignionUsedWithItem(
+                name="key",
+                effect_message="Unlocked.",
+                consumes_subject=True,
+                actions=['set(down, "pit", origin)'],
+            )
+        ],
+    )
+    gem = PaignionItem(
+        name="gem",
+        description="A gem.",
+        used_with=[PaignionUsedWithItem(name="key", effect_message="Shiny.")],
+    )
+
+    return make_game_data(
+        PaignionRoom(
+            name="origin",
+            description="o",
+            tangible_items=[key],
+            intangible_items=[door, trapdoor],
+        ),
+        PaignionRoom(name="vault", description="v", east="origin"),
+        PaignionRoom(name="pit", description="p"),
+        PaignionRoom(name="draft", description="d", tangible_items=[gem]),
+    )
+
+
+def make_chain(length):
+    # A long corridor of rooms, each one leading to the next one
+    rooms = []
+    for i in range(length):
+        rooms.append(
+            PaignionRoom(
+                name="origin" if i == 0 else f"room_{i}",
+                description=f"Room {i}.",
+                east=f"room_{i + 1}" if i + 1 < length else None,
+                west=("origin" if i == 1 else f"room_{i - 1}") if i > 0 else None,
+            )
+        )
+    return make_game_data(*rooms)
+
+
+class TestExplorer:
+    def test_complete_demo(self):
+        game_data = PaignionParser().parse_room_files(
+            sorted(glob.glob("examples/complete_demo/rooms/*.md"))
+        )
+
+        report = PaignionExplorer(game_data).explore(goal="basement")
+
+        assert not report["truncated"]
+        assert report["unreachable_rooms"] == []
+        assert report["unreachable_items"] == []
+        assert report["unused_interactions"] == []
+        assert report["dead_ends"] == []
+        assert report["errors"] == []
+        assert report["goal_path"] == [
+            "take book",
+            "use book with book display",
+            "go down",
+        ]
+
+    def test_dungeon(self):
+        game_data = make_dungeon()
+
+        for strategy in ("bfs", "dfs"):
+            report = PaignionExplorer(game_data, strategy=strategy).explore(
+                goal="vault"
+            )
+
+            assert not report["truncated"]
+            assert report["unreachable_rooms"] == ["draft"]
+            assert report["unreachable_items"] == [("draft", "gem")]
+            assert report["unused_interactions"] == [("gem", "key")]
+            assert report["goal_path"] == ["take key", "use key with door", "go west"]
+
+        # Using the key on the trapdoor (and falling into the pit) prevents the player
+        # from ever reaching the vault
+        report = PaignionExplorer(game_data).explore(goal="vault")
+        assert sorted(report["dead_ends"]) == [
+            ["take key", "use key with trapdoor"],
+            ["take key", "use key with trapdoor", "go down"],
+        ]
+
+        # Without a goal, only the pit is a dead end
+        report = PaignionExplorer(game_data).explore()
+        assert report["dead_ends"] == [["take key", "use key with trapdoor", "go down"]]
+
+    def test_game_data_is_not_modified(self):
+        game_data = make_dungeon()
+        PaignionExplorer(game_data).explore()
+
+        assert game_data == make_dungeon()
+
+    def test_large_world(self):
+        game_data = make_chain(5000)
+
+        # The cost of a state does not depend on the size of the world
+        start = time.perf_counter()
+        report = PaignionExplorer(game_data).explore(goal="room_4999")
+        assert time.perf_counter() - start < 10
+
+        assert report["states"] == 5000
+        assert len(report["goal_path"]) == 4999
+
+    def test_max_states(self):
+        report = PaignionExplorer(make_dungeon(), max_states=2).explore(goal="vault")
+
+        assert report["states"] == 2
+        assert report["truncated"]
+        assert report["goal_path"] is None
+
+    def test_parallel_exploration(self):
+        game_data = make_dungeon()
+
+        report = PaignionExplorer(game_data).explore(goal="vault")
+        parallel_report = PaignionExplorer(game_data, jobs=2).explore(goal="vault")
+        assert parallel_report == report
+
+    def test_invalid_options(self):
+        with pytest.raises(PaignionException, match=r"Unknown exploration strategy"):
+            PaignionExplorer(make_dungeon(), strategy="random")
+
+        with pytest.raises(PaignionException, match=r"breadth-first"):
+            PaignionExplorer(make_dungeon(), strategy="dfs", jobs=2)
+
+        with pytest.raises(PaignionException, match=r"Unknown goal room `nowhere`"):
+            PaignionExplorer(make_dungeon()).explore(goal="nowhere")
@@ -4,12 +4,25 @@ import sys
 import os
 import glob
 
-from paignion.definitions import __version__
+from paignion.definitions import __version__, ROOM_INDEX_FILE
 from paignion.tools import color_message
 from paignion.exceptions import PaignionException
 from paignion.__main__ import paignion_build
 from argparse import Namespace
 
+# The modules that the CLI should not import on start-up
+STARTUP_UNNEEDED_MODULES = [
+    "yaml",
+    "markdown",
+    "pymdownx",
+    "http.server",
+    "socketserver",
+    "subprocess",
+]
+# The maximum time (in microseconds) taken by the imports of the CLI on start-up, only
+# checked if set in the environment (wall-clock times are too noisy on shared runners)
+STARTUP_IMPORT_TIME_BUDGET = os.environ.get("PAIGNION_STARTUP_IMPORT_TIME_BUDGET")
+
 
 class TestHighLevelCLI:
     def test_version(self):
@@ -20,6 +33,27 @@ class TestHighLevelCLI:
 
         assert res.stdout.decode("utf-8")[:-1] == __version__
 
+    def test_startup_imports(self):
+        import_times = []
+        for _ in range(3 if STARTUP_IMPORT_TIME_BUDGET else 1):
+            res = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", "import paignion.__main__"],
+                stderr=subprocess.PIPE,
+            )
+            # Lines look like `import time: <self> | <cumulative> | <module>`
+            imports = {
+                line.split("|")[2].strip(): int(line.split("|")[1])
+                for line in res.stderr.decode("utf-8").splitlines()[1:]
+                if line.startswith("import time:")
+            }
+            import_times.append(imports["paignion.__main__"])
+
+        for module in STARTUP_UNNEEDED_MODULES:
+            assert module not in imports
+
+        if STARTUP_IMPORT_TIME_BUDGET:
+            assert min(import_times) < int(STARTUP_IMPORT_TIME_BUDGET)
+
     def test_no_arguments(self):
         res = subprocess.run(
             [sys.executable, "-m", "paignion"],
@@ -201,3 +235,24 @@ class TestHighLevelCLI:
 
         # Clean up
         subprocess.run(["rm", "-r", "tests/default_game/"])
+
+    def test_build_fail_split_data_format(self, demo_project):
+        project_dir = demo_project()
+
+        # Split builds always write the game data to a separate JSON file
+        with pytest.raises(PaignionException, match=r"can not be used in split builds"):
+            paignion_build(
+                Namespace(project_dir=project_dir, split=True, data_format="literal")
+            )
+        assert not os.path.exists(os.path.join(project_dir, "build"))
+
+    def test_build_without_room_index(self, demo_project):
+        project_dir = demo_project()
+        index_file = os.path.join(project_dir, ROOM_INDEX_FILE)
+
+        paignion_build(Namespace(project_dir=project_dir, no_room_index=True))
+        assert os.path.isfile(os.path.join(project_dir, "build", "index.html"))
+        assert not os.path.exists(index_file)
+
+        paignion_build(Namespace(project_dir=project_dir))
+        assert os.path.isfile(index_file)
@@ -0,0 +1,70 @@
+import pytest
+import glob
+import os
+from argparse import Namespace
+
+from paignion import hooks
+from paignion.__main__ import paignion_build
+from paignion.action_compiler import compile_cached_action
+from paignion.definitions import HOOK_EVENTS
+from paignion.exceptions import PaignionException
+from paignion.tools import markdownify
+
+
+class TestHooks:
+    def test_listeners(self):
+        events = []
+
+        def listener(event, data):
+            events.append((event, data))
+
+        hooks.add_listener("phase_started", listener)
+        hooks.emit("phase_started", phase="parse")
+        hooks.emit("phase_finished", phase="parse", duration=1.0)
+        hooks.remove_listener("phase_started", listener)
+        hooks.emit("phase_started", phase="render")
+
+        assert events == [("phase_started", {"phase": "parse"})]
+        assert hooks.listeners["phase_started"] == []
+
+        with pytest.raises(PaignionException, match=r"Unknown event `room_built`"):
+            hooks.add_listener("room_built", listener)
+
+    def test_build_events(self, demo_project):
+        project_dir = demo_project()
+        # Start from empty caches, so that everything is rendered & compiled again
+        markdownify.cache_clear()
+        compile_cached_action.cache_clear()
+
+        events = []
+        with hooks.listening(lambda event, data: events.append((event, data))):
+            paignion_build(Namespace(project_dir=project_dir))
+        assert all(listeners == [] for listeners in hooks.listeners.values())
+
+        # Every event carries its documented data
+        for event, data in events:
+            assert set(data) == set(HOOK_EVENTS[event])
+
+        event_names = [event for event, _ in events]
+        assert event_names[0] == "build_started"
+        assert event_names[-1] == "build_finished"
+        assert event_names.count("room_parsed") == len(
+            glob.glob(os.path.join(project_dir, "rooms", "*.md"))
+        )
+        assert "markdown_rendered" in event_names
+        assert "action_compiled" in event_names
+
+        phases = [
+            (event, data["phase"])
+            for event, data in events
+            if event in ("phase_started", "phase_finished")
+        ]
+        assert phases[:2] == [
+            ("phase_started", "parse"),
+            ("phase_finished", "parse"),
+        ]
+        assert phases[-1] == ("phase_finished", "write")
+
+        _, build_finished = events[-1]
+        with open(os.path.join(project_dir, "build", "index.html"), "rb") as f:
+            assert build_finished["size"] == len(f.read())
@@ -1,4 +1,5 @@
 import pytest
+import tracemalloc
 
 from paignion.item import PaignionItem
 from paignion.used_with_item import PaignionUsedWithItem
@@ -157,3 +158,35 @@ class TestItemObject:
         item = PaignionItem(name="test name", description="test description")
 
         assert str(item) == EXPECTED_DEFAULT_ITEM_DUMP
+
+    def test_memory_footprint(self):
+        class UnslottedItem(object):
+            # The same attributes as PaignionItem, stored in a per-instance __dict__
+            def __init__(self, name, description, amount=1, visible=True):
+                self.name = name
+                self.description = description
+                self.amount = amount
+                self.visible = visible
+                self.effect = None
+                self.used_with = []
+
+        def measure(item_class, count=100000):
+            tracemalloc.start()
+            items = [
+                item_class(name="coin", description="A coin.", amount=i + 1)
+                for i in range(count)
+            ]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert len(items) == count
+            return size / count
+
+        item = PaignionItem(name="coin", description="A coin.")
+        assert not hasattr(item, "__dict__")
+
+        slotted_size = measure(PaignionItem)
+        unslotted_size = measure(UnslottedItem)
+        assert hasattr(UnslottedItem(name="coin", description="A coin."), "__dict__")
+        # Items (along with their attributes) should take at least 10% less memory
+        # without a __dict__
+        assert slotted_size < unslotted_size * 0.9
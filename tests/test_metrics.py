@@ -0,0 +1,222 @@
+import pytest
+import json
+import os
+import tracemalloc
+from argparse import Namespace
+
+from paignion import room_graph
+from paignion.__main__ import paignion_build
+from paignion.exceptions import PaignionException
+from paignion.metrics import (
+    BuildMetrics,
+    MemoryProfile,
+    compare_metrics,
+    game_data_counts,
+    load_metrics,
+    output_sizes,
+)
+
+
+def build_metrics(project_dir, **options):
+    metrics_file = os.path.join(project_dir, "metrics.json")
+    paignion_build(
+        Namespace(project_dir=project_dir, metrics_json=metrics_file, **options)
+    )
+
+    return load_metrics(metrics_file)
+
+
+class TestMetrics:
+    def test_game_data_counts(self):
+        game_data = {
+            "origin": {
+                "items": {
+                    "tangible": [
+                        {"used_with": [{"item": "door", "actions": []}]},
+                        {"used_with": []},
+                    ],
+                    "intangible": [{"used_with": []}],
+                },
+                "exits": {},
+            },
+            "hall": {"items": {"tangible": [], "intangible": []}, "exits": {}},
+        }
+
+        assert game_data_counts(game_data) == {
+            "rooms": 2,
+            "tangible_items": 2,
+            "intangible_items": 1,
+            "used_with_items": 1,
+            "actions": 0,
+        }
+
+    def test_output_sizes(self):
+        sections = {
+            "main_css": "a" * 10,
+            "paignion_js": "b" * 20,
+            "game_data_html": "c" * 5,
+            "game_data_js": "",
+        }
+        assert output_sizes({"index.html": "x" * 50}, sections) == {
+            "total": 50,
+            "files": {"index.html": 50},
+            "sections": {
+                "main_css": 10,
+                "paignion_js": 20,
+                "game_data": 5,
+                "template": 15,
+            },
+        }
+
+        # The files of split builds are the sections themselves
+        build_files = {
+            "index.html": "x" * 7,
+            "main.css": "a" * 10,
+            "paignion.js": "b" * 20,
+            "game-data.json": "é",
+        }
+        assert output_sizes(build_files)["sections"] == {
+            "main_css": 10,
+            "paignion_js": 20,
+            "game_data": 2,
+            "template": 7,
+        }
+
+    def test_build_metrics(self, demo_project):
+        project_dir = demo_project()
+        metrics = build_metrics(project_dir)
+
+        assert metrics["counts"]["rooms"] > 0
+        assert metrics["counts"]["actions"] > 0
+        assert list(metrics["phases"]) == [
+            "parse",
+            "analyze",
+            "engine",
+            "render",
+            "write",
+        ]
+        assert metrics["total_time"] >= sum(metrics["phases"].values())
+        with open(os.path.join(project_dir, "build", "index.html"), "rb") as f:
+            assert metrics["output"]["total"] == len(f.read())
+        assert set(metrics["caches"]) == {"markdown", "actions"}
+
+        # Building the same project again hits the caches
+        metrics = build_metrics(project_dir, minify=True)
+        assert metrics["caches"]["markdown"]["hit_rate"] == 1.0
+        assert metrics["caches"]["markdown"]["misses"] == 0
+
+    def test_compare_metrics(self):
+        old_metrics = {
+            "version": 1,
+            "counts": {"rooms": 4},
+            "phases": {"parse": 1.0, "render": 0.001},
+            "output": {"total": 100},
+            "peak_rss": 1000,
+        }
+        new_metrics = {
+            "version": 1,
+            "counts": {"rooms": 8},
+            "phases": {"parse": 1.05, "render": 0.005},
+            "output": {"total": 120},
+            "peak_rss": 900,
+        }
+
+        comparison = {
+            metric: (change, regression)
+            for metric, _, _, change, regression in compare_metrics(
+                old_metrics, new_metrics, threshold=0.1
+            )
+        }
+        # Counts describe the game, not the cost of its build
+        assert "counts.rooms" not in comparison
+        assert comparison["output.total"] == (pytest.approx(0.2), True)
+        assert comparison["phases.parse"] == (pytest.approx(0.05), False)
+        assert comparison["peak_rss"] == (pytest.approx(-0.1), False)
+        # Differences of times too small to be measured are not regressions
+        assert comparison["phases.render"] == (pytest.approx(4.0), False)
+
+    def test_load_metrics(self, tmp_path):
+        with pytest.raises(PaignionException, match=r"Could not read metrics file"):
+            load_metrics(str(tmp_path / "missing.json"))
+
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps({"version": 0}))
+        with pytest.raises(PaignionException, match=r"Unsupported metrics file"):
+            load_metrics(str(metrics_file))
+
+    def test_phases(self):
+        metrics = BuildMetrics()
+        with metrics.phase("parse"):
+            pass
+        with metrics.phase("parse"):
+            pass
+
+        assert list(metrics.phases) == ["parse"]
+        assert metrics.phases["parse"] >= 0
+
+    def test_memory_profile(self):
+        memory_profile = MemoryProfile(top_sites=3)
+        with memory_profile.phase("retain"):
+            retained = [str(i) for i in range(10000)]
+        with memory_profile.phase("release"):
+            released = [str(i) for i in range(10000)]
+            del released
+        memory_profile.stop()
+
+        assert not tracemalloc.is_tracing()
+        assert memory_profile.phases["retain"]["retained"] > 10000
+        assert (
+            memory_profile.phases["retain"]["peak"]
+            >= memory_profile.phases["retain"]["retained"]
+        )
+        site, size, count = memory_profile.phases["retain"]["top_sites"][0]
+        assert site.startswith(__file__)
+        assert count >= 10000
+        assert len(memory_profile.phases["retain"]["top_sites"]) <= 3
+        assert (
+            memory_profile.phases["release"]["peak"]
+            > memory_profile.phases["release"]["retained"]
+        )
+        assert len(retained) == 10000
+
+        # Failed phases stop the tracing
+        with pytest.raises(ValueError):
+            with memory_profile.phase("fail"):
+                raise ValueError()
+        assert not tracemalloc.is_tracing()
+
+        # Disabled profiles do not trace anything
+        memory_profile = MemoryProfile(enabled=False)
+        with memory_profile.phase("parse"):
+            assert not tracemalloc.is_tracing()
+        assert memory_profile.phases == {}
+
+    def test_build_memory_profile(self, demo_project, capsys, monkeypatch):
+        project_dir = demo_project()
+        paignion_build(Namespace(project_dir=project_dir, profile_memory=True))
+
+        output = capsys.readouterr().out
+        for phase in ["parse", "dump", "encode", "template"]:
+            assert f"Memory of phase `{phase}`: peak " in output
+        assert not tracemalloc.is_tracing()
+
+        # Tracing stops even if the build fails between the profiled phases
+        def tree_shake(game_data, room_graph=None):
+            raise PaignionException("Analysis failed")
+
+        monkeypatch.setattr(room_graph, "tree_shake", tree_shake)
+        with pytest.raises(PaignionException, match=r"Analysis failed"):
+            paignion_build(Namespace(project_dir=project_dir, profile_memory=True))
+        assert not tracemalloc.is_tracing()
+
+    def test_memory_profile_without_peak(self, monkeypatch):
+        # Before Python 3.9, the peak of a phase can not be measured
+        monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+        memory_profile = MemoryProfile()
+        with memory_profile.phase("retain"):
+            retained = [str(i) for i in range(1000)]
+        memory_profile.stop()
+
+        assert memory_profile.phases["retain"]["peak"] is None
+        assert memory_profile.phases["retain"]["retained"] > 1000
+        assert len(retained) == 1000
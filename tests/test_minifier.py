@@ -0,0 +1,79 @@
+import pytest
+
+from paignion.minifier import minify_js, minify_css, minify_html
+
+
+class TestMinifier:
+    def test_minify_js_comments_and_whitespace(self):
+        code = """\
+// A line comment
+let a = 1;  /* a block comment */
+function  f (x, y)
+{
+    return x + y;
+}
+"""
+        assert minify_js(code) == "let a=1;function f(x,y)\n{return x+y;}"
+
+    def test_minify_js_strings(self):
+        # Strings must be kept intact, even if they look like comments
+        code = "let s = \"// not a comment\";  let t = '/* nor */  this';"
+        assert minify_js(code) == "let s=\"// not a comment\";let t='/* nor */  this';"
+
+        code = 'let u = `  template ${ x }  `; let v = "escaped \\" // quote";'
+        assert (
+            minify_js(code)
+            == 'let u=`  template ${ x }  `;let v="escaped \\" // quote";'
+        )
+
+    def test_minify_js_regex(self):
+        code = "let r = / +\\/[/]/g; let d = a / b / c;"
+        assert minify_js(code) == "let r=/ +\\/[/]/g;let d=a/b/c;"
+
+        # A regex can follow a keyword, but not an identifier or a property
+        code = 'function f(x) {\n  return /"/.test(x)\n}\nlet u = "http://x"'
+        assert minify_js(code) == 'function f(x){return/"/.test(x)}\nlet u="http://x"'
+        code = "if (typeof /a/ === t) throw /b/\nlet d = undo / 2 / a.return / 3"
+        assert minify_js(code) == "if(typeof/a/===t)throw/b/\nlet d=undo/2/a.return/3"
+
+    def test_minify_js_unsplittable_operators(self):
+        assert minify_js("a = b + +c - -d") == "a=b+ +c- -d"
+        assert minify_js("x = a++ + b") == "x=a++ +b"
+
+    def test_minify_js_semicolon_insertion(self):
+        # Newlines that statements depend on must be kept
+        code = """\
+let a = []
+let b = 2
+function g ()
+{
+    return
+}
+"""
+        assert minify_js(code) == "let a=[]\nlet b=2\nfunction g()\n{return}"
+
+        # A multi-line comment counts as a newline
+        assert minify_js("let a = 1 /*\n*/ let b = 2") == "let a=1\nlet b=2"
+
+    def test_minify_css(self):
+        code = """\
+/* Comment */
+a :hover, b > c {
+    color: white;
+    content: "two  spaces";
+}
+"""
+        assert minify_css(code) == 'a :hover,b>c{color:white;content:"two  spaces"}'
+
+    def test_minify_html(self):
+        html = "<p>this is\nthe <em>same</em> <strong>paragraph</strong></p>\n<p>b</p>"
+        assert (
+            minify_html(html)
+            == "<p>this is the <em>same</em> <strong>paragraph</strong></p><p>b</p>"
+        )
+
+        # Preformatted text should not be touched
+        html = "<ul>\n<li>a</li>\n</ul>\n<pre><code>a\n    b\n</code></pre>\n"
+        assert (
+            minify_html(html) == "<ul><li>a</li></ul><pre><code>a\n    b\n</code></pre>"
+        )
@@ -0,0 +1,94 @@
+import pytest
+import glob
+import os
+import tarfile
+import zipfile
+from argparse import Namespace
+
+from paignion.__main__ import paignion_build
+from paignion.exceptions import PaignionException
+from paignion.packed import (
+    is_packed_project,
+    packed_project_name,
+    room_name_from_member,
+    read_packed_project,
+)
+from paignion.parser import PaignionParser
+
+DEMO_ROOMS_DIR = "examples/complete_demo/rooms"
+
+
+def demo_rooms():
+    rooms = {}
+    for room_file in sorted(glob.glob(os.path.join(DEMO_ROOMS_DIR, "*.md"))):
+        with open(room_file, "r") as f:
+            rooms[os.path.splitext(os.path.basename(room_file))[0]] = f.read()
+
+    return rooms
+
+
+class TestPacked:
+    def test_room_name_from_member(self):
+        assert room_name_from_member("rooms/origin.md") == "origin"
+        assert room_name_from_member("./game/rooms/forest/well.md") == "forest/well"
+        assert room_name_from_member("rooms/notes.txt") is None
+        assert room_name_from_member("origin.md") is None
+        assert room_name_from_member("rooms/.drafts/cellar.md") is None
+
+    def test_packed_document(self, tmp_path):
+        packed_document = tmp_path / "game.md"
+        packed_document.write_text(
+            "".join(
+                f"=== {room_name} ===\n{room_data}"
+                for room_name, room_data in demo_rooms().items()
+            )
+        )
+
+        assert is_packed_project(str(packed_document))
+        assert dict(read_packed_project(str(packed_document))) == demo_rooms()
+
+        packed_document.write_text("origin\n" + packed_document.read_text())
+        with pytest.raises(PaignionException, match=r"Text found before"):
+            list(read_packed_project(str(packed_document)))
+
+    def test_packed_project_name(self):
+        assert packed_project_name("games/my_game.tar.gz") == "my_game"
+        assert packed_project_name("my.game.zip") == "my.game"
+        assert packed_project_name("/tmp/game.md") == "game"
+
+    @pytest.mark.parametrize("archive_name", ["game.zip", "game.tar", "game.tar.gz"])
+    def test_packed_archive(self, tmp_path, archive_name):
+        archive_path = str(tmp_path / archive_name)
+        if archive_name.endswith(".zip"):
+            with zipfile.ZipFile(archive_path, "w") as archive:
+                for room_name, room_data in demo_rooms().items():
+                    archive.writestr(f"game/rooms/{room_name}.md", room_data)
+                archive.writestr("game/README.md", "Not a room")
+        else:
+            mode = "w:gz" if archive_name.endswith(".gz") else "w"
+            with tarfile.open(archive_path, mode) as archive:
+                archive.add(DEMO_ROOMS_DIR, arcname="rooms")
+
+        assert is_packed_project(archive_path)
+        assert dict(read_packed_project(archive_path)) == demo_rooms()
+
+        # The packed project builds into the same game as the project directory
+        expected_game_data = PaignionParser().parse_room_files(
+            sorted(glob.glob(os.path.join(DEMO_ROOMS_DIR, "*.md")))
+        )
+        game_data = dict(PaignionParser().iter_rooms(read_packed_project(archive_path)))
+        assert game_data == expected_game_data
+
+        paignion_build(Namespace(project_dir=archive_path))
+        assert os.path.isfile(tmp_path / "game-build" / "index.html")
+
+    def test_invalid_packed_projects(self, tmp_path):
+        archive_path = tmp_path / "game.zip"
+        archive_path.write_text("Not an archive")
+        with pytest.raises(PaignionException, match=r"Invalid archive"):
+            list(read_packed_project(str(archive_path)))
+
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("rooms/kitchen.md", demo_rooms()["kitchen"])
+        with pytest.raises(PaignionException, match=r"Origin room not found"):
+            paignion_build(Namespace(project_dir=str(archive_path)))
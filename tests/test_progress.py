@@ -0,0 +1,67 @@
+import glob
+import os
+from argparse import Namespace
+
+from paignion.__main__ import paignion_build
+from paignion.progress import BuildProgress
+
+
+class TestProgress:
+    def test_log_progress(self, capsys):
+        progress = BuildProgress(terminal=False, interval=0)
+        progress.listener("rooms_found", {"count": 4})
+        progress.listener("phase_started", {"phase": "parse"})
+        for room in ["origin", "hall", "kitchen", "cellar"]:
+            progress.listener("room_parsed", {"room": room, "size": 10, "duration": 0})
+        progress.listener("phase_finished", {"phase": "parse", "duration": 2.0})
+        progress.listener("phase_started", {"phase": "render"})
+        progress.listener("phase_finished", {"phase": "render", "duration": 0.5})
+        progress.close()
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 6
+        assert "Parsing rooms: 1/4 (25%)" in lines[0]
+        assert "rooms/s, ETA " in lines[0]
+        assert lines[0].endswith("`origin`\033[0m")
+        assert "Parsing rooms: 4/4 (100%)" in lines[3]
+        assert "Parsed 4 room(s) in 2.000s, 2 rooms/s" in lines[4]
+        assert "Phase `render` done in 0.500s" in lines[5]
+
+    def test_terminal_progress(self, capsys):
+        progress = BuildProgress(terminal=True, interval=0)
+        progress.listener("phase_started", {"phase": "write"})
+        progress.listener(
+            "file_written", {"file": "index.html", "size": 1000, "duration": 0}
+        )
+        progress.close()
+
+        # Progress lines are updated in place, and ended once done
+        output = capsys.readouterr().out
+        assert "Writing files: 1 (1000 bytes" in output
+        assert output.endswith("\r\n")
+
+        # Updates are throttled, and quick phases are only reported once done
+        progress = BuildProgress(terminal=True, interval=60)
+        progress.listener("phase_started", {"phase": "parse"})
+        for _ in range(1000):
+            progress.listener("room_parsed", {"room": "hall", "size": 1, "duration": 0})
+        progress.listener("phase_finished", {"phase": "parse", "duration": 1.0})
+        progress.close()
+
+        output = capsys.readouterr().out
+        assert "Parsing rooms" not in output
+        assert "Parsed 1000 room(s)" in output
+
+    def test_build_progress(self, demo_project, capsys):
+        project_dir = demo_project()
+        paignion_build(Namespace(project_dir=project_dir, progress="always"))
+
+        output = capsys.readouterr().out
+        room_count = len(glob.glob(os.path.join(project_dir, "rooms", "*.md")))
+        assert f"Parsed {room_count} room(s)" in output
+        assert "Phase `render` done" in output
+        assert "Wrote 1 file(s)" in output
+
+        # Progress is not reported when the output is not a terminal
+        paignion_build(Namespace(project_dir=project_dir))
+        assert len(capsys.readouterr().out.splitlines()) == 2
@@ -0,0 +1,101 @@
+import pytest
+import glob
+import os
+import shutil
+import tarfile
+from argparse import Namespace
+
+from paignion.__main__ import paignion_build, parse_project
+from paignion.api import build_index_html
+from paignion.batch import build_projects
+from paignion.exceptions import PaignionException
+from paignion.reproducible import diff_build_files, read_project_rooms
+
+DEMO_DIR = "examples/complete_demo"
+
+
+def demo_rooms():
+    rooms = []
+    for room_file in sorted(glob.glob(os.path.join(DEMO_DIR, "rooms", "*.md"))):
+        with open(room_file, "r") as f:
+            rooms.append((os.path.splitext(os.path.basename(room_file))[0], f.read()))
+
+    return rooms
+
+
+def read_build(project_dir):
+    build_files = {}
+    for build_file in sorted(glob.glob(os.path.join(project_dir, "build", "*"))):
+        with open(build_file, "rb") as f:
+            build_files[os.path.basename(build_file)] = f.read()
+
+    return build_files
+
+
+class TestReproducible:
+    def test_room_order(self, tmp_path):
+        # The order in which the rooms are given does not change the build
+        assert build_index_html(demo_rooms()[::-1], fast_travel=True) == (
+            build_index_html(demo_rooms(), fast_travel=True)
+        )
+        assert [room_name for room_name, _ in read_project_rooms(DEMO_DIR)] == [
+            room_name for room_name, _ in demo_rooms()[::-1]
+        ]
+
+        # Nor does the order of the members of packed archives
+        for archive_name in ["a.tar", "b.tar"]:
+            with tarfile.open(tmp_path / archive_name, "w") as archive:
+                room_files = sorted(
+                    glob.glob(os.path.join(DEMO_DIR, "rooms", "*.md")),
+                    reverse=archive_name == "b.tar",
+                )
+                for room_file in room_files:
+                    archive.add(
+                        room_file, arcname=f"rooms/{os.path.basename(room_file)}"
+                    )
+        game_data = parse_project(str(tmp_path / "a.tar"))
+        other_game_data = parse_project(str(tmp_path / "b.tar"))
+        assert list(game_data) == list(other_game_data) == sorted(game_data)
+
+    def test_diff_build_files(self):
+        assert diff_build_files({"index.html": "abc"}, {"index.html": "abc"}) == []
+        assert diff_build_files(
+            {"index.html": "abcdef", "main.css": ""},
+            {"index.html": "abcxef", "paignion.js": ""},
+        ) == [
+            "`index.html` differs at character 3: 'abcdef' != 'abcxef'",
+            "`main.css` is only in the first build",
+            "`paignion.js` is only in the second build",
+        ]
+
+    def test_verify_reproducible(self, demo_project, capsys):
+        project_dir = demo_project()
+
+        for split in [False, True]:
+            paignion_build(
+                Namespace(
+                    project_dir=project_dir,
+                    verify_reproducible=True,
+                    fast_travel=True,
+                    minify=True,
+                    split=split,
+                )
+            )
+            assert "Build verified as reproducible" in capsys.readouterr().out
+
+        # Rooms can not be rebuilt from a missing project
+        shutil.rmtree(os.path.join(project_dir, "rooms"))
+        with pytest.raises(PaignionException):
+            paignion_build(Namespace(project_dir=project_dir, verify_reproducible=True))
+
+    def test_parallel_builds(self, demo_project):
+        project_dirs = [demo_project(name) for name in ["first", "second"]]
+
+        # Builds do not depend on the number of jobs nor on the state of the caches
+        list(build_projects(project_dirs, {"minify": True}, jobs=1))
+        first_builds = [read_build(project_dir) for project_dir in project_dirs]
+        list(build_projects(project_dirs, {"minify": True}, jobs=2))
+        assert [read_build(project_dir) for project_dir in project_dirs] == (
+            first_builds
+        )
+        assert first_builds[0] == first_builds[1]
@@ -0,0 +1,225 @@
+import pytest
+
+from paignion.room_graph import RoomGraph, reachable_rooms, tree_shake, compute_routes
+from paignion.room import PaignionRoom
+from paignion.item import PaignionItem
+from paignion.used_with_item import PaignionUsedWithItem
+
+
+def make_game_data(*rooms):
+    game_data = {}
+    for room in rooms:
+        game_data.update(room.dump())
+    return game_data
+
+
+class TestRoomGraph:
+    def test_static_exits(self):
+        game_data = make_game_data(
+            PaignionRoom(name="origin", description="o", north="kitchen"),
+            PaignionRoom(name="kitchen", description="k", down="cellar"),
+            PaignionRoom(name="cellar", description="c"),
+            PaignionRoom(name="draft", description="d", south="origin"),
+        )
+
+        assert reachable_rooms(game_data) == {"origin", "kitchen", "cellar"}
+
+        shaken_game_data, removed_rooms = tree_shake(game_data)
+        assert sorted(shaken_game_data) == ["cellar", "kitchen", "origin"]
+        assert removed_rooms == ["draft"]
+
+        # The original game data should not have been modified
+        assert "draft" in game_data
+
+    def test_exits_to_nonexistent_rooms(self):
+        game_data = make_game_data(
+            PaignionRoom(name="origin", description="o", west="nowhere"),
+        )
+
+        assert reachable_rooms(game_data) == {"origin"}
+
+    def test_dynamic_exits(self):
+        door = PaignionItem(
+            name="door",
+            description="A door.",
+            used_with=[
+                PaignionUsedWithItem(
+                    name="key",
+                    effect_message="Unlocked.",
+                    actions=[
+                        'set(west, "hidden room", origin)',
+                        'add(m"The door is _open_.", description, journal)',
+                    ],
+                )
+            ],
+        )
+        game_data = make_game_data(
+            PaignionRoom(name="origin", description="o", intangible_items=[door]),
+            PaignionRoom(name="hidden room", description="h"),
+            PaignionRoom(name="journal", description="j"),
+            PaignionRoom(name="draft", description="d"),
+        )
+
+        # Rooms opened by actions are reachable
+        assert reachable_rooms(game_data) == {"origin", "hidden room"}
+
+        # Rooms that are targeted by actions are not reachable, but must be kept
+        shaken_game_data, removed_rooms = tree_shake(game_data)
+        assert sorted(shaken_game_data) == ["hidden room", "journal", "origin"]
+        assert removed_rooms == ["draft"]
+
+    def test_action_targets_items_of_unreachable_rooms(self):
+        button = PaignionItem(
+            name="button",
+            description="A button.",
+            used_with=[
+                PaignionUsedWithItem(
+                    name="hand",
+                    effect_message="Pressed.",
+                    actions=['add(m"It is _lit_.", description, lamp)'],
+                )
+            ],
+        )
+        lamp = PaignionItem(name="lamp", description="A lamp.")
+        game_data = make_game_data(
+            PaignionRoom(name="origin", description="o", intangible_items=[button]),
+            PaignionRoom(name="lighthouse", description="l", intangible_items=[lamp]),
+            PaignionRoom(name="draft", description="d"),
+        )
+
+        # The room owning the item targeted by the action must be kept
+        shaken_game_data, removed_rooms = tree_shake(game_data)
+        assert sorted(shaken_game_data) == ["lighthouse", "origin"]
+        assert removed_rooms == ["draft"]
+
+    def test_dynamic_exits_from_unreachable_rooms(self):
+        lever = PaignionItem(
+            name="lever",
+            description="A lever.",
+            used_with=[
+                PaignionUsedWithItem(
+                    name="hand",
+                    effect_message="Pulled.",
+                    actions=['set(up, "attic", draft)'],
+                )
+            ],
+        )
+        game_data = make_game_data(
+            PaignionRoom(name="origin", description="o"),
+            PaignionRoom(name="draft", description="d", intangible_items=[lever]),
+            PaignionRoom(name="attic", description="a"),
+        )
+
+        # Exits opened in unreachable rooms do not count
+        assert tree_shake(game_data)[1] == ["attic", "draft"]
+
+    def test_room_graph(self):
+        lever = PaignionItem(
+            name="lever",
+            description="A lever.",
+            used_with=[
+                PaignionUsedWithItem(
+                    name="hand",
+                    effect_message="Pulled.",
+                    actions=['set(up, "tower", hall)', 'set(down, "crypt", hall)'],
+                )
+            ],
+        )
+        game_data = make_game_data(
+            PaignionRoom(name="origin", description="o", north="hall"),
+            PaignionRoom(
+                name="hall",
+                description="h",
+                south="origin",
+                east="pit",
+                intangible_items=[lever],
+            ),
+            PaignionRoom(name="pit", description="p", west="nowhere"),
+            PaignionRoom(name="tower", description="t", north="roof"),
+            PaignionRoom(name="roof", description="r", south="tower"),
+            PaignionRoom(name="draft", description="d", north="origin"),
+        )
+
+        room_graph = RoomGraph(game_data)
+        assert room_graph.room_names == [
+            "origin",
+            "hall",
+            "pit",
+            "tower",
+            "roof",
+            "draft",
+        ]
+        # Exits are stored in CSR format (origin -> hall, hall -> pit, origin, tower,
+        # tower -> roof, roof -> tower, draft -> origin)
+        assert list(room_graph.offsets) == [0, 1, 4, 4, 5, 6, 7]
+        assert list(room_graph.targets) == [1, 2, 0, 3, 4, 3, 0]
+
+        component, component_count = room_graph.strongly_connected_components()
+        assert component_count == 4
+        assert component[0] == component[1]
+        assert component[3] == component[4]
+        # Exits only lead to components with a lower number
+        assert component[2] < component[0] < component[5]
+        assert component[3] < component[0]
+
+        report = room_graph.analyze()
+        assert report["rooms"] == 6
+        assert report["exits"] == 7
+        assert report["reachable"] == 5
+        assert report["components"] == 4
+        assert report["unreachable_rooms"] == ["draft"]
+        assert report["traps"] == [["pit"], ["roof", "tower"]]
+        assert report["dangling_exits"] == [
+            ("hall", "down", "crypt"),
+            ("pit", "west", "nowhere"),
+        ]
+
+    def test_room_graph_deep_map(self):
+        # A long corridor should not hit the recursion limit
+        rooms = [
+            PaignionRoom(
+                name="origin" if i == 0 else f"room {i}",
+                description="r",
+                east=f"room {i + 1}" if i < 9999 else None,
+                west=("origin" if i == 1 else f"room {i - 1}") if i > 0 else None,
+            )
+            for i in range(10000)
+        ]
+        report = RoomGraph(make_game_data(*rooms)).analyze()
+
+        assert report["reachable"] == 10000
+        assert report["components"] == 1
+        assert report["traps"] == []
+
+    def test_compute_routes(self):
+        game_data = make_game_data(
+            PaignionRoom(name="origin", description="o", north="hall", east="pit"),
+            PaignionRoom(name="hall", description="h", south="origin", up="tower"),
+            PaignionRoom(name="tower", description="t", down="hall"),
+            PaignionRoom(name="pit", description="p"),
+        )
+
+        routed_game_data, kind, size = compute_routes(game_data)
+        assert kind == "table"
+        assert size > 0
+        assert [room["route_id"] for room in routed_game_data.values()] == [0, 1, 2, 3]
+        # From the origin: stay, go north (0), go north then up, go east (1)
+        assert routed_game_data["origin"]["next_hops"] == "-001"
+        assert routed_game_data["tower"]["next_hops"] == "55-5"
+        assert routed_game_data["pit"]["next_hops"] == "----"
+        assert "next_hops" not in game_data["origin"]
+
+        routed_game_data, kind, size = compute_routes(
+            game_data, max_table_rooms=2, landmark_count=2
+        )
+        assert kind == "landmarks"
+        # The first landmark is the origin room, the second one the farthest room
+        origin = routed_game_data["origin"]
+        tower = routed_game_data["tower"]
+        assert origin["landmark_hops"] == "*0"
+        assert origin["landmark_parents"] == [0, 1]
+        assert tower["landmark_hops"] == "5*"
+        assert tower["landmark_parents"] == [1, 2]
+        assert tower["home_landmark"] == 1
+        assert routed_game_data["pit"]["landmark_hops"] == "--"
+        assert routed_game_data["pit"]["landmark_parents"] == [0, 0]
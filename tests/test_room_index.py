@@ -0,0 +1,95 @@
+import pytest
+import os
+
+from paignion.parser import PaignionParser
+from paignion.room_index import scan_rooms_dir, load_room_index, save_room_index
+
+ROOM_DATA = "---\n---\ndescription\n"
+
+
+def make_rooms_dir(tmp_path):
+    rooms_dir = tmp_path / "rooms"
+    (rooms_dir / "forest" / "clearing").mkdir(parents=True)
+    (rooms_dir / ".hidden").mkdir()
+    for room_file in [
+        "origin.md",
+        "notes.txt",
+        "forest/edge.md",
+        "forest/clearing/well.md",
+        ".hidden/secret.md",
+    ]:
+        (rooms_dir / room_file).write_text(ROOM_DATA)
+
+    return str(rooms_dir)
+
+
+def age_directories(rooms_dir):
+    # Directories modified just before a scan are always listed again by the next one
+    for directory, _, _ in os.walk(rooms_dir):
+        os.utime(directory, ns=(0, 10**9))
+
+
+class TestRoomIndex:
+    def test_recursive_scan(self, tmp_path):
+        rooms_dir = make_rooms_dir(tmp_path)
+        # Symbolic links to directories are not followed
+        os.symlink(rooms_dir, os.path.join(rooms_dir, "forest", "loop"))
+        room_files, index = scan_rooms_dir(rooms_dir)
+
+        assert room_files == sorted(
+            os.path.join(rooms_dir, room_file)
+            for room_file in ["origin.md", "forest/edge.md", "forest/clearing/well.md"]
+        )
+        assert sorted(index["directories"]) == ["", "forest", "forest/clearing"]
+        assert index["directories"]["forest"]["files"] == ["edge.md"]
+
+        # Room names are derived from the paths relative to the rooms directory
+        game_data = PaignionParser().parse_room_files(room_files, rooms_dir=rooms_dir)
+        assert sorted(game_data) == ["forest/clearing/well", "forest/edge", "origin"]
+
+    def test_unchanged_directories_are_skipped(self, tmp_path):
+        rooms_dir = make_rooms_dir(tmp_path)
+        age_directories(rooms_dir)
+        _, index = scan_rooms_dir(rooms_dir)
+
+        # The entries of unchanged directories are reused without listing them
+        index["directories"]["forest"]["files"].append("ghost.md")
+        room_files, new_index = scan_rooms_dir(rooms_dir, index)
+        assert os.path.join(rooms_dir, "forest", "ghost.md") in room_files
+        assert new_index["directories"] == index["directories"]
+
+        # Changed directories are listed again
+        (tmp_path / "rooms" / "forest" / "path.md").write_text(ROOM_DATA)
+        os.utime(os.path.join(rooms_dir, "forest"), ns=(0, 1))
+        room_files, new_index = scan_rooms_dir(rooms_dir, index)
+        assert os.path.join(rooms_dir, "forest", "ghost.md") not in room_files
+        assert os.path.join(rooms_dir, "forest", "path.md") in room_files
+        assert new_index["directories"]["forest"]["mtime"] == 1
+
+    def test_recently_modified_directories_are_listed(self, tmp_path):
+        rooms_dir = make_rooms_dir(tmp_path)
+        _, index = scan_rooms_dir(rooms_dir)
+
+        # A room added in the same tick as the scan does not change the modification
+        # time of its directory on file systems with coarse modification times
+        (tmp_path / "rooms" / "forest" / "path.md").write_text(ROOM_DATA)
+        mtime = index["directories"]["forest"]["mtime"]
+        os.utime(os.path.join(rooms_dir, "forest"), ns=(mtime, mtime))
+        room_files, _ = scan_rooms_dir(rooms_dir, index)
+        assert os.path.join(rooms_dir, "forest", "path.md") in room_files
+
+    def test_persisted_index(self, tmp_path):
+        rooms_dir = make_rooms_dir(tmp_path)
+        index_file = str(tmp_path / ".paignion" / "room_index.json")
+        _, index = scan_rooms_dir(rooms_dir)
+
+        assert load_room_index(index_file) is None
+        save_room_index(index_file, index)
+        assert load_room_index(index_file) == index
+
+        # Unusable indexes are ignored
+        with open(index_file, "w") as f:
+            f.write("{")
+        assert load_room_index(index_file) is None
+        save_room_index(index_file, {**index, "version": -1})
+        assert load_room_index(index_file) is None
@@ -248,3 +248,56 @@ class TestRoomParser:
                 room_data=room_data,
                 room_name="missing_intangible_used_with_item_effect_message",
             )
+
+    def test_without_markdown_rendering(self):
+        parser = PaignionParser(render_markdown=False)
+
+        with open(os.path.join(ROOMS_OK_DIR, "full_items_room.md"), "r") as f:
+            room = parser.parse_room_data(room_data=f.read(), room_name="room")
+
+        assert "<p>" not in json.dumps(room)
+
+    def test_missing_yaml_header(self):
+        parser = PaignionParser()
+
+        with pytest.raises(
+            PaignionException, match=r"YAML header not found in room `no_header`"
+        ):
+            parser.parse_room_data(room_data="description", room_name="no_header")
+
+    def test_iter_room_files(self):
+        parser = PaignionParser()
+        room_files = sorted(
+            os.path.join(ROOMS_OK_DIR, room_file)
+            for room_file in os.listdir(ROOMS_OK_DIR)
+            if room_file.endswith(".md")
+        )
+
+        rooms = list(parser.iter_room_files(room_files))
+
+        assert [room_name for room_name, _ in rooms] == [
+            os.path.splitext(os.path.basename(room_file))[0] for room_file in room_files
+        ]
+        assert list(parser.iter_room_files(room_files, read_ahead=2)) == rooms
+        assert parser.parse_room_files(room_files, read_ahead=2) == dict(rooms)
+
+    def test_iter_room_files_stopped_early(self):
+        parser = PaignionParser()
+        room_files = [os.path.join(ROOMS_OK_DIR, "minimal_room.md")] * 10
+
+        rooms = parser.iter_room_files(room_files, read_ahead=1)
+        assert next(rooms)[0] == "minimal_room"
+        # Closing the generator stops the reading thread
+        rooms.close()
+
+    def test_iter_room_files_missing_file(self):
+        parser = PaignionParser()
+        room_files = [
+            os.path.join(ROOMS_OK_DIR, "minimal_room.md"),
+            os.path.join(ROOMS_OK_DIR, "missing_room.md"),
+        ]
+
+        rooms = parser.iter_room_files(room_files, read_ahead=4)
+        assert next(rooms)[0] == "minimal_room"
+        with pytest.raises(FileNotFoundError):
+            next(rooms)
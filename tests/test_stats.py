@@ -0,0 +1,85 @@
+import gzip
+import json
+from argparse import Namespace
+
+from paignion.__main__ import paignion_stats
+from paignion.stats import RoomStats, format_stats_table, room_size_stats
+
+DEMO_DIR = "examples/complete_demo"
+
+
+def make_room(used_with_count, description="A room."):
+    return {
+        "description": description,
+        "items": {
+            "tangible": [
+                {"used_with": [{"item": "key", "actions": ""}] * used_with_count}
+            ],
+            "intangible": [],
+        },
+        "exits": {},
+    }
+
+
+class TestStats:
+    def test_room_size_stats(self):
+        room = make_room(2)
+        room_json = json.dumps(room).encode("utf-8")
+
+        assert room_size_stats(room) == {
+            "actions": 0,
+            "used_with": 2,
+            "size": len(room_json),
+            "gzip_size": len(gzip.compress(room_json)),
+        }
+
+    def test_room_stats(self):
+        room_stats = RoomStats()
+        # Markdown rendered while parsing a room is counted for that room
+        room_stats.listener("markdown_rendered", {"duration": 0.5})
+        room_stats.listener("markdown_rendered", {"duration": 0.25})
+        room_stats.listener("room_parsed", {"room": "origin", "duration": 1.0})
+        room_stats.listener("room_parsed", {"room": "hall", "duration": 2.0})
+
+        game_data = {
+            "origin": make_room(0, "A very long description. " * 10),
+            "hall": make_room(3),
+        }
+        rooms, totals = room_stats.report(game_data)
+        assert [stats["room"] for stats in rooms] == ["origin", "hall"]
+        assert rooms[0]["parse_time"] == 1.0
+        assert rooms[0]["markdown_time"] == 0.75
+        assert rooms[1]["markdown_time"] == 0
+        assert totals["parse_time"] == 3.0
+        assert totals["used_with"] == 3
+        assert totals["size"] == rooms[0]["size"] + rooms[1]["size"]
+
+        rooms, _ = room_stats.report(game_data, sort_by="used_with", top=1)
+        assert [stats["room"] for stats in rooms] == ["hall"]
+
+        lines = format_stats_table(rooms, totals)
+        assert len(lines) == 3
+        assert lines[0].split() == [
+            "room",
+            "bytes",
+            "gzip",
+            "bytes",
+            "parse",
+            "ms",
+            "markdown",
+            "ms",
+            "actions",
+            "used_with",
+        ]
+        assert lines[1].split()[3] == "2000.000"
+        assert lines[2].startswith("total")
+        assert len(set(len(line) for line in lines)) == 1
+
+    def test_stats_command(self, capsys):
+        paignion_stats(Namespace(project_dir=DEMO_DIR, sort="actions", top=2))
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 5
+        assert lines[1].split()[0] in ("origin", "kitchen")
+        assert lines[3].startswith("total")
+        assert "room(s), 2 shown (sorted by actions)" in lines[4]